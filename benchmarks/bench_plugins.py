@@ -0,0 +1,245 @@
+"""
+Benchmark: plugin and orchestrator throughput on synthetic recordings
+
+Generates camera, radar and fused recordings with benchmarks/recording_generator.py
+(cached in --data-dir) for every --frames x --objects combination, then times:
+    plugin        - each KPI plugin alone via PluginRegistry.execute_plugin,
+                    including its own decode of the recording (best of --repeat)
+    scan          - all plugins of a kind sharing one scan via execute_phase_plugins,
+                    the per-frame path of the incremental plugins (best of --repeat)
+    orchestrator  - TestOrchestrator.run over one scenario per recording, with
+                    the plugins of each kind sharing a scan
+No result cache is used. With --baseline, entries whose frames/s dropped by
+more than --tolerance against a previous --json output are reported and the
+exit code is 1.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_plugins.py --frames 1K 100K 1M --objects 1 8 --json bench.json
+    PYTHONPATH=. python benchmarks/bench_plugins.py --frames 1M --json new.json --baseline bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+from benchmarks.recording_generator import KINDS, ensure_recording, parse_count
+from core.models import PluginPhase, TestContext, TestMode
+from core.plugin_registry import PluginRegistry
+from core.test_orchestrator import TestOrchestrator
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+PLUGINS = {
+    "camera": [
+        {"name": "LatencyKPIPlugin", "config": {"latency_threshold": 50, "latency_field": "latency_ms"}},
+        {"name": "ErrorRateKPIPlugin", "config": {"error_rate_threshold": 0.1, "error_flag_field": "error_rate_percent"}},
+        {"name": "DataDropRateKPIPlugin", "config": {"drop_rate_threshold": 0.005, "expected_interval": 100}},
+    ],
+    "radar": [
+        {"name": "RadarSignalQualityScorePlugin", "config": {"min_avg_signal_strength": 0.8}},
+        {"name": "LatencyKPIPlugin", "config": {"latency_threshold": 50, "latency_field": "latency_ms"}},
+        {"name": "DataDropRateKPIPlugin", "config": {"drop_rate_threshold": 0.005, "expected_interval": 100}},
+    ],
+    "fused": [
+        {"name": "DataAlignmentJitterKPIPlugin", "config": {"data_alignment_jitter_threshold": 5}},
+        {"name": "DecisionConsistencyScorePlugin", "config": {"consistency_threshold": 0.95}},
+        {"name": "LatencyKPIPlugin", "config": {"latency_threshold": 50, "latency_field": "fusion_latency_ms"}},
+        {"name": "FusionRedundancyScorePlugin", "config": {"min_redundancy_score": 0.5}},
+        {"name": "SpatialCorrelationConsistencyPlugin", "config": {"spatial_correlation_threshold": 0.9}},
+    ],
+}
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def bench_plugins(registry: PluginRegistry, recording: Path, kind: str, frames: int, objects: int,
+                  repeat: int) -> List[Dict[str, Any]]:
+    context = TestContext(scenario_name=recording.stem, data_path=recording, logger=logging.getLogger("Benchmark"),
+                          mode=TestMode.SIL)
+    size = recording.stat().st_size
+    results = []
+    for plugin_config in PLUGINS[kind]:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = registry.execute_plugin(PluginPhase.POST_RUN, plugin_config["name"], context,
+                                             plugin_config["config"])
+            wall_s = time.perf_counter() - start
+            if best is None or wall_s < best[0]:
+                best = (wall_s, result)
+        wall_s, result = best
+        results.append({
+            "benchmark": "plugin",
+            "name": plugin_config["name"],
+            "kind": kind,
+            "frames": frames,
+            "objects": objects,
+            "bytes": size,
+            "wall_s": wall_s,
+            "cpu_s": result.profile.cpu_ms / 1000 if result.profile else None,
+            "peak_rss_delta_mb": result.profile.peak_rss_delta_mb if result.profile else None,
+            "frames_per_s": frames / wall_s,
+            "mb_per_s": size / wall_s / 1e6,
+            "success": result.success,
+        })
+    return results
+
+
+def bench_shared_scan(registry: PluginRegistry, recording: Path, kind: str, frames: int, objects: int,
+                      repeat: int) -> Dict[str, Any]:
+    context = TestContext(scenario_name=recording.stem, data_path=recording, logger=logging.getLogger("Benchmark"),
+                          mode=TestMode.SIL)
+    size = recording.stat().st_size
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS[kind])
+        wall_s = time.perf_counter() - start
+        if best is None or wall_s < best:
+            best = wall_s
+    return {
+        "benchmark": "scan",
+        "name": "execute_phase_plugins",
+        "kind": kind,
+        "frames": frames,
+        "objects": objects,
+        "bytes": size,
+        "wall_s": best,
+        "frames_per_s": frames / best,
+        "mb_per_s": size / best / 1e6,
+        "success": all(result.success for result in results),
+    }
+
+
+@contextmanager
+def working_directory(path: Path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def bench_orchestrator(recordings: List[Tuple[str, int, int, Path]], work_dir: Path) -> Dict[str, Any]:
+    """Time TestOrchestrator.run over one scenario per recording; reports go to work_dir"""
+    config_path = work_dir / "benchmark.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "name": "benchmark",
+        "mode": "SIL",
+        "temp_dir": str(work_dir / "tmp"),
+        "scenarios": [
+            {"name": recording.stem, "datapath": str(recording), "plugins": PLUGINS[kind]}
+            for kind, _, _, recording in recordings
+        ],
+    }))
+    frames = sum(recording_frames for _, recording_frames, _, _ in recordings)
+    size = sum(recording.stat().st_size for _, _, _, recording in recordings)
+    with working_directory(work_dir):
+        orchestrator = TestOrchestrator(str(config_path), plugins_dir=ROOT_DIR / "plugins", use_cache=False)
+        start = time.perf_counter()
+        orchestrator.run()
+        wall_s = time.perf_counter() - start
+    return {
+        "benchmark": "orchestrator",
+        "name": "TestOrchestrator.run",
+        "kind": "+".join(sorted({kind for kind, _, _, _ in recordings})),
+        "frames": frames,
+        "objects": None,
+        "bytes": size,
+        "wall_s": wall_s,
+        "frames_per_s": frames / wall_s,
+        "mb_per_s": size / wall_s / 1e6,
+        "scenarios": len(recordings),
+    }
+
+
+def run(frame_counts: List[int], object_counts: List[int], kinds: List[str], data_dir: Path,
+        repeat: int) -> Dict[str, Any]:
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    results = []
+    try:
+        recordings = []
+        for frames in frame_counts:
+            for objects in object_counts:
+                for kind in kinds:
+                    recording = ensure_recording(data_dir, kind, frames, objects)
+                    recordings.append((kind, frames, objects, recording))
+                    results.extend(bench_plugins(registry, recording, kind, frames, objects, repeat))
+                    results.append(bench_shared_scan(registry, recording, kind, frames, objects, repeat))
+    finally:
+        registry.teardown_plugins()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        results.append(bench_orchestrator(recordings, Path(work_dir)))
+    return {"environment": environment(), "results": results}
+
+
+def regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Entries present in both runs whose frames/s fell by more than tolerance (a fraction)"""
+    def key(entry):
+        return entry["benchmark"], entry["name"], entry["kind"], entry["frames"], entry["objects"]
+
+    previous = {key(entry): entry for entry in baseline.get("results", [])}
+    found = []
+    for entry in current["results"]:
+        old = previous.get(key(entry))
+        if old and entry["frames_per_s"] < old["frames_per_s"] * (1 - tolerance):
+            found.append(f"{entry['name']} {entry['kind']} {entry['frames']} frames x {entry['objects']} objects: "
+                         f"{old['frames_per_s']:.0f} -> {entry['frames_per_s']:.0f} frames/s")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", nargs="+", type=parse_count, default=[1_000, 100_000],
+                        help="Recording sizes, e.g. 1K 100K 10M")
+    parser.add_argument("--objects", nargs="+", type=int, default=[1], help="Objects per frame")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--data-dir", type=Path, default=ROOT_DIR / "tmp" / "benchmarks",
+                        help="Where generated recordings are kept between runs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per plugin; the fastest is reported")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON output of a previous run to compare frames/s against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed frames/s drop against --baseline")
+    args = parser.parse_args()
+
+    report = run(args.frames, args.objects, args.kinds, args.data_dir, args.repeat)
+    print(f"{'benchmark':13} {'name':38} {'kind':19} {'frames':>9} {'objects':>7} {'wall s':>8} {'frames/s':>11} {'MB/s':>7}")
+    for r in report["results"]:
+        print(f"{r['benchmark']:13} {r['name']:38} {r['kind']:19} {r['frames']:9} {r['objects'] or '':>7} "
+              f"{r['wall_s']:8.3f} {r['frames_per_s']:11.0f} {r['mb_per_s']:7.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if found else 0)
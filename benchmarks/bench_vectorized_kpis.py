@@ -0,0 +1,187 @@
+"""
+Benchmark: the scalar KPI plugins on their frame and columnar paths
+
+For --frames frames of synthetic values, times each of LatencyKPIPlugin,
+ErrorRateKPIPlugin, RadarSignalQualityScorePlugin and DataDropRateKPIPlugin:
+    frames      - begin(), on_frame() for every frame, finalize(): the per-frame
+                  path of a scan (JSON decoding excluded)
+    columnar    - begin(), evaluate_columns() on a frame store holding the same
+                  values: the NumPy path (store build excluded)
+and checks that both paths report the same metrics (the standard deviation,
+combined over batches of a different size, may differ in the last digits).
+The NumPy reductions of core.kpi_arrays are also timed against the builtins
+they replaced:
+    legacy      - builtins over the Python list collected by on_frame()
+    numpy       - the same reduction on an array read from the frame store
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_vectorized_kpis.py --frames 10000000
+"""
+import argparse
+import json
+import logging
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+import numpy as np
+
+from core.frame_store import STORE_VERSION, FrameStore
+from core.kpi_arrays import array_max, array_mean, count_dropped_frames
+from core.models import PluginPhase, TestContext, TestMode
+from core.plugin_registry import PluginRegistry
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def legacy_max_avg(values):
+    return max(values), sum(values) / len(values)
+
+
+def numpy_max_avg(values):
+    return array_max(values), array_mean(values)
+
+
+def legacy_drops(timestamps, expected_interval):
+    timestamps = sorted(timestamps)
+    drops = 0
+    for i in range(1, len(timestamps)):
+        gap = timestamps[i] - timestamps[i - 1]
+        if gap > expected_interval:
+            drops += (gap // expected_interval) - 1
+    return drops
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def same_metrics(actual: Any, expected: Any) -> bool:
+    if isinstance(expected, dict):
+        return actual.keys() == expected.keys() and all(same_metrics(actual[k], expected[k]) for k in expected)
+    if isinstance(expected, float) and isinstance(actual, float):
+        return math.isclose(actual, expected, rel_tol=1e-12)
+    return actual == expected
+
+
+def write_store(directory: Path, columns: Dict[str, np.ndarray], lists: Dict[str, np.ndarray]) -> FrameStore:
+    """A frame store of complete (unmasked) columns, as FrameStore.open would build from a recording"""
+    directory.mkdir(parents=True, exist_ok=True)
+    meta = {"version": STORE_VERSION, "frames": len(next(iter(columns.values()))), "malformed_lines": 0,
+            "non_object_frames": 0, "columns": {}, "lists": {}, "mixed_columns": [], "irregular_lists": []}
+    for index, (name, values) in enumerate(columns.items()):
+        np.save(directory / f"column_{index}.npy", values)
+        meta["columns"][name] = {"file": f"column_{index}.npy", "mask": None}
+    for index, (name, offsets) in enumerate(lists.items()):
+        np.save(directory / f"list_{index}.npy", offsets)
+        meta["lists"][name] = {"file": f"list_{index}.npy"}
+    with open(directory / "meta.json", "w") as f:
+        json.dump(meta, f)
+    return FrameStore(directory, meta)
+
+
+def bench_plugin(registry: PluginRegistry, context: TestContext, name: str, config: Dict[str, Any],
+                 frames: Callable[[], Iterator[Dict[str, Any]]], store: FrameStore, frame_count: int):
+    instance, error = registry.acquire_instance(PluginPhase.POST_RUN, name, config)
+    if error:
+        raise RuntimeError(error.message)
+    try:
+        start = time.perf_counter()
+        instance.begin(context)
+        for entry in frames():
+            instance.on_frame(entry)
+        expected = instance.finalize(context)
+        frames_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        instance.begin(context)
+        actual = instance.evaluate_columns(store, context)
+        columnar_s = time.perf_counter() - start
+    finally:
+        registry.release_instances([instance])
+
+    assert (actual.success, actual.message) == (expected.success, expected.message), name
+    assert same_metrics(actual.metrics, expected.metrics), name
+    return {
+        "benchmark": "plugin",
+        "name": name,
+        "frames": frame_count,
+        "legacy_s": frames_s,
+        "numpy_s": columnar_s,
+        "speedup": frames_s / columnar_s,
+    }
+
+
+def run(frames: int, seed: int):
+    rng = np.random.default_rng(seed)
+    latency = rng.normal(40.0, 5.0, frames)
+    error_rate = rng.uniform(0.0, 0.001, frames)
+    signal = rng.uniform(0.6, 1.0, frames)
+    # 100 ms frame period with ~0.1% dropped frames
+    timestamps = np.cumsum(np.where(rng.random(frames) < 0.001, 200, 100))
+
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = write_store(Path(work_dir) / "store", {
+            "latency_ms": latency, "error_rate_percent": error_rate, "timestamp": timestamps,
+            "points.signal_strength": signal,
+        }, {"points": np.arange(frames + 1, dtype=np.int64)})
+        context = TestContext(scenario_name="synthetic", data_path=Path(work_dir) / "synthetic.jsonl",
+                              logger=logging.getLogger("Benchmark"), mode=TestMode.SIL)
+        plugins = [
+            ("LatencyKPIPlugin", {"latency_statistic": "p95"},
+             lambda: ({"latency_ms": value} for value in latency.tolist())),
+            ("ErrorRateKPIPlugin", {},
+             lambda: ({"error_rate_percent": value} for value in error_rate.tolist())),
+            ("RadarSignalQualityScorePlugin", {},
+             lambda: ({"points": [{"signal_strength": value}]} for value in signal.tolist())),
+            ("DataDropRateKPIPlugin", {"expected_interval": 100},
+             lambda: ({"timestamp": value} for value in timestamps.tolist())),
+        ]
+        try:
+            for name, config, entries in plugins:
+                results.append(bench_plugin(registry, context, name, config, entries, store, frames))
+        finally:
+            store = None  # release the memory maps before the directory goes
+            registry.teardown_plugins()
+
+    reductions = [
+        ("max/avg (Latency, ErrorRate, Radar)", legacy_max_avg, numpy_max_avg, latency, ()),
+        ("gaps (DataDropRate)", legacy_drops, count_dropped_frames, timestamps, (100,)),
+    ]
+    for name, legacy, vectorized, array, extra in reductions:
+        legacy_s, expected = timed(legacy, array.tolist(), *extra)
+        numpy_s, actual = timed(vectorized, array, *extra)
+        assert actual == expected, name
+        results.append({
+            "benchmark": "reduction",
+            "name": name,
+            "frames": frames,
+            "legacy_s": legacy_s,
+            "numpy_s": numpy_s,
+            "speedup": legacy_s / numpy_s,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.frames, args.seed)
+    print(f"{'benchmark':10} {'name':37} {'frames/legacy s':>15} {'columnar/numpy s':>16} {'speedup':>8}")
+    for r in results:
+        print(f"{r['benchmark']:10} {r['name']:37} {r['legacy_s']:15.3f} {r['numpy_s']:16.3f} {r['speedup']:7.1f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
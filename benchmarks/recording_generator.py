@@ -0,0 +1,176 @@
+"""
+Deterministic synthetic recordings for benchmarks
+
+Writes camera, radar or fused JSONL recordings with the schemas of the fixtures
+in tests/plugins/post_run:
+    camera - latency_ms, error_rate_percent, frame_id, objects[].bbox_3d
+    radar  - latency_ms, error_rate_percent, points[] with signal_strength
+    fused  - fusion_latency_ms, data_alignment_jitter_ms, fused_objects[] with
+             class, source_classes, camera_bbox_3d, radar_points, fused_confidence
+
+The same (kind, frames, objects per frame, seed) always produces the same bytes.
+Frames are generated in chunks of NumPy draws, so 10M frames need little memory.
+
+Usage:
+    PYTHONPATH=. python benchmarks/recording_generator.py fused 1M tmp/fused_1M.jsonl --objects 4
+"""
+import argparse
+from pathlib import Path
+from typing import Iterator, List
+
+import numpy as np
+
+KINDS = ("camera", "radar", "fused")
+CLASSES = np.array(["car", "pedestrian", "truck", "bicycle", "train"])
+CHUNK_FRAMES = 50_000
+BBOX_SIZE = 2.0  # edge of the square camera_bbox_3d, as in the fixtures
+RADAR_OFFSETS = ((0.5, 0.5), (1.0, 1.5), (1.5, 0.5))  # radar points inside the bbox, relative to its corner
+
+
+def parse_count(text: str) -> int:
+    """'1000', '10K' or '1M' as an int"""
+    text = str(text).strip().upper()
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def recording_name(kind: str, frames: int, objects: int, seed: int) -> str:
+    return f"{kind}_{frames}f_{objects}o_{seed}s.jsonl"
+
+
+def generate_recording(path: Path, kind: str, frames: int, objects: int = 1, seed: int = 0,
+                       interval_ms: int = 100, drop_probability: float = 0.001) -> Path:
+    """
+    Write `frames` frames with `objects` objects each to path (an existing file is overwritten).
+    Timestamps advance by interval_ms, skipping a frame with drop_probability.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown recording kind: {kind}")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    lines = {"camera": _camera_lines, "radar": _radar_lines, "fused": _fused_lines}[kind]
+    next_timestamp = 1000
+    with open(path, "w") as f:
+        for start in range(0, frames, CHUNK_FRAMES):
+            count = min(CHUNK_FRAMES, frames - start)
+            steps = np.where(rng.random(count) < drop_probability, 2 * interval_ms, interval_ms)
+            timestamps = next_timestamp + np.concatenate(([0], np.cumsum(steps[:-1])))
+            next_timestamp = int(timestamps[-1] + steps[-1])
+            f.writelines(lines(rng, timestamps, objects))
+    return path
+
+
+def ensure_recording(data_dir: Path, kind: str, frames: int, objects: int = 1, seed: int = 0) -> Path:
+    """The recording for these parameters under data_dir, generated on first use"""
+    path = Path(data_dir) / recording_name(kind, frames, objects, seed)
+    if not path.exists():
+        partial = path.with_suffix(".partial")
+        generate_recording(partial, kind, frames, objects, seed)
+        partial.replace(path)
+    return path
+
+
+def _bbox(x: float, y: float, z: float) -> str:
+    return (f'[{{"x": {x:.2f}, "y": {y:.2f}, "z": {z:.2f}}}, {{"x": {x + BBOX_SIZE:.2f}, "y": {y:.2f}, "z": {z:.2f}}}, '
+            f'{{"x": {x + BBOX_SIZE:.2f}, "y": {y + BBOX_SIZE:.2f}, "z": {z:.2f}}}, '
+            f'{{"x": {x:.2f}, "y": {y + BBOX_SIZE:.2f}, "z": {z:.2f}}}]')
+
+
+def _radar_points(x: float, y: float, z: float, strengths, dopplers, object_class: str, outlier: bool) -> List[str]:
+    points = []
+    for (dx, dy), strength, doppler in zip(RADAR_OFFSETS, strengths, dopplers):
+        if outlier:
+            dx += BBOX_SIZE  # outside the camera bbox: lowers the spatial correlation score
+        points.append(f'{{"x": {x + dx:.2f}, "y": {y + dy:.2f}, "z": {z:.2f}, "signal_strength": {strength:.2f}, '
+                      f'"doppler_velocity": {doppler:.2f}, "object_class": "{object_class}"}}')
+    return points
+
+
+def _object_draws(rng: np.random.Generator, count: int, objects: int):
+    shape = (count, objects)
+    return {
+        "class_index": rng.integers(0, len(CLASSES), shape),
+        "x": rng.uniform(0.0, 50.0, shape),
+        "y": rng.uniform(-5.0, 5.0, shape),
+        "z": rng.uniform(0.0, 3.0, shape),
+        "strength": rng.uniform(0.6, 1.0, shape + (len(RADAR_OFFSETS),)),
+        "doppler": rng.normal(0.0, 1.5, shape + (len(RADAR_OFFSETS),)),
+    }
+
+
+def _camera_lines(rng: np.random.Generator, timestamps: np.ndarray, objects: int) -> Iterator[str]:
+    count = len(timestamps)
+    latency = np.clip(rng.normal(40.0, 4.0, count), 1.0, None)
+    error_rate = rng.uniform(0.0, 0.001, count)
+    draws = _object_draws(rng, count, objects)
+    classes = CLASSES[draws["class_index"]]
+    for i, timestamp in enumerate(timestamps.tolist()):
+        frame_objects = ", ".join(
+            f'{{"class": "{classes[i, j]}", "bbox_3d": {_bbox(draws["x"][i, j], draws["y"][i, j], draws["z"][i, j])}}}'
+            for j in range(objects)
+        )
+        yield (f'{{"timestamp": {timestamp}, "latency_ms": {latency[i]:.2f}, "error_rate_percent": {error_rate[i]:.4f}, '
+               f'"frame_id": "frame_{timestamp}.jpg", "objects": [{frame_objects}]}}\n')
+
+
+def _radar_lines(rng: np.random.Generator, timestamps: np.ndarray, objects: int) -> Iterator[str]:
+    count = len(timestamps)
+    latency = np.clip(rng.normal(38.0, 5.0, count), 1.0, None)
+    error_rate = rng.uniform(0.0, 0.001, count)
+    draws = _object_draws(rng, count, objects)
+    classes = CLASSES[draws["class_index"]]
+    for i, timestamp in enumerate(timestamps.tolist()):
+        points = ", ".join(
+            point
+            for j in range(objects)
+            for point in _radar_points(draws["x"][i, j], draws["y"][i, j], draws["z"][i, j],
+                                       draws["strength"][i, j], draws["doppler"][i, j], classes[i, j], False)
+        )
+        yield (f'{{"timestamp": {timestamp}, "latency_ms": {latency[i]:.2f}, "error_rate_percent": {error_rate[i]:.4f}, '
+               f'"points": [{points}]}}\n')
+
+
+def _fused_lines(rng: np.random.Generator, timestamps: np.ndarray, objects: int) -> Iterator[str]:
+    count = len(timestamps)
+    shape = (count, objects)
+    latency = np.clip(rng.normal(45.0, 8.0, count), 1.0, None).astype(np.int64)
+    jitter = rng.poisson(2.0, count)
+    draws = _object_draws(rng, count, objects)
+    classes = CLASSES[draws["class_index"]]
+    confidence = rng.uniform(0.7, 1.0, shape)
+    camera_only = rng.random(shape) < 0.1  # not detected by radar: lowers redundancy
+    disagree = rng.random(shape) < 0.03  # radar reports another class: lowers decision consistency
+    radar_classes = CLASSES[np.where(disagree, (draws["class_index"] + 1) % len(CLASSES), draws["class_index"])]
+    outlier = rng.random(shape) < 0.05
+    for i, timestamp in enumerate(timestamps.tolist()):
+        fused_objects = []
+        for j in range(objects):
+            object_class = classes[i, j]
+            x, y, z = draws["x"][i, j], draws["y"][i, j], draws["z"][i, j]
+            if camera_only[i, j]:
+                source_classes = f'{{"camera": "{object_class}"}}'
+                radar_points = "[]"
+            else:
+                source_classes = f'{{"camera": "{object_class}", "radar": "{radar_classes[i, j]}"}}'
+                radar_points = "[" + ", ".join(_radar_points(x, y, z, draws["strength"][i, j], draws["doppler"][i, j],
+                                                             radar_classes[i, j], outlier[i, j])) + "]"
+            fused_objects.append(
+                f'{{"class": "{object_class}", "source_classes": {source_classes}, '
+                f'"camera_bbox_3d": {_bbox(x, y, z)}, "radar_points": {radar_points}, '
+                f'"fused_confidence": {confidence[i, j]:.2f}}}'
+            )
+        yield (f'{{"timestamp": {timestamp}, "fusion_latency_ms": {latency[i]}, '
+               f'"data_alignment_jitter_ms": {jitter[i]}, "fused_objects": [{", ".join(fused_objects)}]}}\n')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("frames", type=parse_count, help="Number of frames, e.g. 1000, 10K or 10M")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--objects", type=int, default=1, help="Objects per frame")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_recording(args.output, args.kind, args.frames, args.objects, args.seed)
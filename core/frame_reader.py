@@ -0,0 +1,84 @@
+"""
+Frame reader for JSONL recordings
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from core.frame_sources import follow_lines
+from core.json_decoder import create_decoder
+
+
+@dataclass
+class FollowMode:
+    """How FrameReader tails a recording the SUT is still writing (the scenario's `follow` block)"""
+    end_marker: Optional[str] = None  # line that ends the recording, e.g. '{"end_of_recording": true}'
+    idle_timeout: float = 10.0  # seconds without new data after which the recording is complete
+    poll_interval: float = 0.05  # seconds between checks for new data
+
+    @classmethod
+    def from_config(cls, value: Any) -> Optional["FollowMode"]:
+        """None for a missing or false `follow`, defaults for `follow: true`"""
+        if not value:
+            return None
+        if value is True:
+            return cls()
+        try:
+            return cls(**value)
+        except TypeError as e:
+            raise ValueError(f"Invalid follow settings {value}: {e}") from e
+
+
+class FrameReader:
+    """
+    Reads a JSONL recording and decodes every line exactly once.
+
+    Iterating yields (line, entry, error) tuples: entry is the decoded frame,
+    or None together with the decode error for a malformed line.
+
+    start/end restrict the scan to the lines beginning in that byte range;
+    start must be the beginning of a line (see core.sharded_reader.shard_ranges).
+    fields and backend select the decoder (see core.json_decoder.create_decoder):
+    with fields, frames may hold only those (dotted) paths.
+
+    With follow, the recording may still be growing: frames are yielded as
+    complete lines arrive, until follow.end_marker or follow.idle_timeout
+    seconds without new data (end is ignored). A recording that does not appear
+    within idle_timeout raises FileNotFoundError.
+    """
+
+    def __init__(self, data_path: Path, start: int = 0, end: Optional[int] = None,
+                 fields: Optional[Iterable[str]] = None, backend: str = "auto",
+                 follow: Optional[FollowMode] = None):
+        self.data_path = Path(data_path)
+        self.start = start
+        self.end = end
+        self.follow = follow
+        self.decoder = create_decoder(backend, fields)
+        self.frames_read = 0
+        self.bytes_read = 0
+
+    def __iter__(self) -> Iterator[Tuple[bytes, Optional[Any], Optional[ValueError]]]:
+        lines = self._follow() if self.follow else self._lines()
+        for line in lines:
+            self.bytes_read += len(line)
+            try:
+                entry = self.decoder.decode(line)
+            except ValueError as e:
+                yield line, None, e
+                continue
+            self.frames_read += 1
+            yield line, entry, None
+
+    def _lines(self) -> Iterator[bytes]:
+        with open(self.data_path, 'rb') as f:
+            f.seek(self.start)
+            for line in f:
+                if self.end is not None and self.start + self.bytes_read >= self.end:
+                    break
+                yield line
+
+    def _follow(self) -> Iterator[bytes]:
+        """Lines of a growing file; a partial last line is only yielded once the recording is complete"""
+        return follow_lines(self.data_path, self.start, self.follow.end_marker, self.follow.idle_timeout,
+                            self.follow.poll_interval)
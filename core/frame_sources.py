@@ -0,0 +1,191 @@
+"""
+Sources of JSONL lines written while the SUT runs, for the live phase
+
+Every source is an async iterator of complete lines (bytes, newline included
+as far as the writer sent one). The `source` block of a scenario's `live`
+section selects one:
+
+    type: tail     - follow a file as it is written (default path: the scenario datapath)
+                     until end_marker or idle_timeout seconds without new data; the
+                     source fails if the file does not appear within idle_timeout
+    type: socket   - connect to address 'host:port' or 'unix:/path' and read until EOF
+    type: pipe     - read a named pipe (created if missing) until the writer closes it
+    type: replay   - replay the scenario datapath at frames_per_s (SIL stand-in for a SUT)
+"""
+import asyncio
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+SOURCE_TYPES = ("tail", "socket", "pipe", "replay")
+READ_CHUNK_BYTES = 1024 * 1024
+STREAM_LIMIT_BYTES = 64 * 1024 * 1024  # longest line a socket or pipe source accepts
+
+
+class LineBuffer:
+    """Splits chunks of a growing stream into complete lines, keeping a trailing partial line"""
+
+    def __init__(self):
+        self.partial = b""
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        lines = (self.partial + chunk).split(b"\n")
+        self.partial = lines.pop()
+        return [line + b"\n" for line in lines]
+
+    def flush(self) -> List[bytes]:
+        """The unterminated last line, once the stream has ended"""
+        rest, self.partial = self.partial, b""
+        return [rest] if rest.strip() else []
+
+
+def is_end_marker(line: bytes, end_marker: Optional[str]) -> bool:
+    return end_marker is not None and line.strip() == end_marker.encode()
+
+
+def growing_lines(path: Path, start: int = 0, end_marker: Optional[str] = None,
+                  idle_timeout: float = 10.0) -> Iterator[Optional[bytes]]:
+    """
+    Lines of path from byte offset start as they are appended, and None whenever
+    there is no new data yet: the caller waits (blocking or async) before resuming.
+    Ends at a line equal to end_marker (not yielded) or after idle_timeout seconds
+    without new data; a partial last line is yielded at the end. Raises
+    FileNotFoundError when the file did not appear within idle_timeout.
+    """
+    path = Path(path)
+    last_data = time.monotonic()
+    while not path.exists():
+        if time.monotonic() - last_data > idle_timeout:
+            raise FileNotFoundError(f"Recording did not appear within {idle_timeout}s: {path}")
+        yield None
+
+    buffer = LineBuffer()
+    with open(path, "rb") as f:
+        f.seek(start)
+        while True:
+            chunk = f.read(READ_CHUNK_BYTES)
+            if not chunk:
+                if time.monotonic() - last_data > idle_timeout:
+                    break
+                yield None
+                continue
+            last_data = time.monotonic()
+            for line in buffer.feed(chunk):
+                if is_end_marker(line, end_marker):
+                    return
+                yield line
+    yield from buffer.flush()
+
+
+def follow_lines(path: Path, start: int = 0, end_marker: Optional[str] = None, idle_timeout: float = 10.0,
+                 poll_interval: float = 0.05) -> Iterator[bytes]:
+    """growing_lines() for a blocking reader, checking for new data every poll_interval seconds"""
+    for line in growing_lines(path, start, end_marker, idle_timeout):
+        if line is None:
+            time.sleep(poll_interval)
+        else:
+            yield line
+
+
+async def tail_lines(path: Path, end_marker: Optional[str] = None, idle_timeout: float = 10.0,
+                     poll_interval: float = 0.05) -> AsyncIterator[bytes]:
+    """growing_lines() for the live phase, yielding to the event loop while waiting for new data"""
+    for line in growing_lines(path, 0, end_marker, idle_timeout):
+        if line is None:
+            await asyncio.sleep(poll_interval)
+        else:
+            yield line
+
+
+async def stream_lines(reader: asyncio.StreamReader, end_marker: Optional[str] = None) -> AsyncIterator[bytes]:
+    """Lines of a stream until EOF or end_marker"""
+    while True:
+        line = await reader.readline()
+        if not line or is_end_marker(line, end_marker):
+            return
+        if line.strip():
+            yield line
+
+
+async def socket_lines(address: str, end_marker: Optional[str] = None,
+                       connect_timeout: float = 10.0) -> AsyncIterator[bytes]:
+    """
+    Lines read from a TCP ('host:port') or Unix ('unix:/path') socket. The SUT may
+    still be starting: connecting is retried for connect_timeout seconds.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            if address.startswith("unix:"):
+                reader, writer = await asyncio.open_unix_connection(address[len("unix:"):], limit=STREAM_LIMIT_BYTES)
+            else:
+                host, _, port = address.rpartition(":")
+                reader, writer = await asyncio.open_connection(host or "localhost", int(port),
+                                                               limit=STREAM_LIMIT_BYTES)
+            break
+        except (ConnectionError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+    try:
+        async for line in stream_lines(reader, end_marker):
+            yield line
+    finally:
+        writer.close()
+
+
+async def pipe_lines(path: Path, end_marker: Optional[str] = None) -> AsyncIterator[bytes]:
+    """Lines read from a named pipe; the pipe is created if the SUT has not done so yet"""
+    path = Path(path)
+    if not path.exists():
+        os.mkfifo(path)
+    elif not stat.S_ISFIFO(path.stat().st_mode):
+        raise ValueError(f"Not a named pipe: {path}")
+
+    loop = asyncio.get_running_loop()
+    # Opening a pipe for reading blocks until a writer opens it
+    pipe = await loop.run_in_executor(None, open, path, "rb", 0)
+    reader = asyncio.StreamReader(limit=STREAM_LIMIT_BYTES)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    try:
+        async for line in stream_lines(reader, end_marker):
+            yield line
+    finally:
+        transport.close()
+
+
+async def replay_lines(path: Path, frames_per_s: Optional[float] = None) -> AsyncIterator[bytes]:
+    """Lines of a finished recording, paced at frames_per_s (unpaced when None)"""
+    start = time.monotonic()
+    with open(path, "rb") as f:
+        for count, line in enumerate(f):
+            if frames_per_s:
+                delay = start + count / frames_per_s - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % 1000 == 0:
+                await asyncio.sleep(0)  # let the plugins keep up
+            yield line
+
+
+def open_source(spec: Dict[str, Any], data_path: Path) -> AsyncIterator[bytes]:
+    """The line source described by a live `source` block; raises ValueError for an unknown type"""
+    source_type = spec.get("type", "tail")  # tail, socket, pipe, replay
+    end_marker = spec.get("end_marker")  # e.g. '{"end_of_recording": true}'
+    if source_type == "tail":
+        return tail_lines(Path(spec.get("path", data_path)), end_marker,
+                          idle_timeout=spec.get("idle_timeout", 10.0),  # seconds without new data
+                          poll_interval=spec.get("poll_interval", 0.05))
+    if source_type == "socket":
+        if "address" not in spec:
+            raise ValueError("Socket source needs an address ('host:port' or 'unix:/path')")
+        return socket_lines(spec["address"], end_marker, connect_timeout=spec.get("connect_timeout", 10.0))
+    if source_type == "pipe":
+        if "path" not in spec:
+            raise ValueError("Pipe source needs a path")
+        return pipe_lines(Path(spec["path"]), end_marker)
+    if source_type == "replay":
+        return replay_lines(Path(spec.get("path", data_path)), spec.get("frames_per_s"))
+    raise ValueError(f"Unknown live source type: {source_type} (expected one of {', '.join(SOURCE_TYPES)})")
@@ -0,0 +1,443 @@
+"""
+Columnar frame store for JSONL recordings
+
+A recording is converted once into one NumPy array per field and cached on
+disk, keyed by the content hash of the recording. Later runs memory-map the
+arrays instead of decoding JSON again.
+
+Column naming follows the frame layout:
+    timestamp                         - top-level scalar, one row per frame
+    fused_objects                     - list offsets, len(parent rows) + 1
+    fused_objects.source_classes.camera - nested dict flattened into its level
+    fused_objects.camera_bbox_3d.x    - scalar of a nested list item
+
+Numeric fields are stored as int64 (all values integral) or float64, booleans
+as bool, strings as int32 codes into a vocabulary. Rows without a value are
+marked in a validity mask. Fields mixing kinds are not stored, and lists
+holding anything but objects are flagged irregular; reading either raises
+ColumnUnavailable so callers can fall back to a scan.
+
+The build spills every field to disk in bounded chunks and assembles the
+arrays through memory maps, so its memory grows with the number of fields,
+not with the length of the recording.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.frame_reader import FrameReader
+
+STORE_VERSION = 3
+_HASH_CHUNK = 1 << 20
+_SPILL_ROWS = 1 << 14  # values a field buffers before they are appended to its spill files
+
+logger = logging.getLogger("FrameStore")
+
+
+class ColumnUnavailable(KeyError):
+    """Raised when a field cannot be served from the columnar store (e.g. mixed types)"""
+
+
+def content_digest(data_path: Path, cache_dir: Path) -> str:
+    """
+    Return the sha256 of a file's content.
+
+    Digests are remembered in cache_dir/digests.json together with size and
+    mtime, so an unchanged file is not re-hashed on every run.
+    """
+    data_path = Path(data_path)
+    stat = data_path.stat()
+    index_path = Path(cache_dir) / "digests.json"
+    key = str(data_path.resolve())
+
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    entry = index.get(key)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return entry["digest"]
+
+    sha = hashlib.sha256()
+    with open(data_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+
+    index[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": digest}
+    atomic_write_json(index_path, index)
+    return digest
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class FrameStore:
+    """Read-only, memory-mapped columnar view of one recording"""
+
+    def __init__(self, directory: Path, meta: Dict[str, Any]):
+        self.directory = Path(directory)
+        self.meta = meta
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, data_path: Path, cache_dir: Path) -> "FrameStore":
+        """Load the cached store for data_path, building it on the first run"""
+        cache_dir = Path(cache_dir) / "frame_store"
+        digest = content_digest(data_path, cache_dir)
+        store_dir = cache_dir / digest
+        meta_path = store_dir / "meta.json"
+
+        if meta_path.exists():
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            if meta.get("version") == STORE_VERSION:
+                logger.debug(f"Using cached frame store for {data_path}: {store_dir}")
+                return cls(store_dir, meta)
+            shutil.rmtree(store_dir, ignore_errors=True)
+
+        logger.info(f"Building frame store for {data_path}")
+        _build_store(Path(data_path), store_dir, digest)
+        with open(meta_path, "r") as f:
+            return cls(store_dir, json.load(f))
+
+    @property
+    def frame_count(self) -> int:
+        return self.meta["frames"]
+
+    @property
+    def malformed_lines(self) -> int:
+        return self.meta["malformed_lines"]
+
+    @property
+    def non_object_frames(self) -> int:
+        return self.meta["non_object_frames"]
+
+    def columns(self) -> List[str]:
+        return sorted(self.meta["columns"])
+
+    def has_column(self, name: str) -> bool:
+        return name in self.meta["columns"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of a field, one per row of its level (invalid rows hold a filler)"""
+        info = self._column_info(name)
+        if info is None:
+            return np.empty(0)
+        return self._load(info["file"])
+
+    def valid(self, name: str) -> np.ndarray:
+        """Boolean mask of the rows that actually carry a value for the field"""
+        info = self._column_info(name)
+        if info is None:
+            return np.zeros(0, dtype=bool)
+        if info.get("mask") is None:
+            return np.ones(len(self._load(info["file"])), dtype=bool)
+        return self._load(info["mask"])
+
+    def values(self, name: str) -> np.ndarray:
+        """Only the present values of a numeric field, in frame order"""
+        info = self._column_info(name)
+        if info is None:
+            return np.empty(0)
+        if "vocabulary" in info:
+            raise ColumnUnavailable(name)
+        data = self._load(info["file"])
+        if info.get("mask") is None:
+            return data
+        return data[self._load(info["mask"])]
+
+    def vocabulary(self, name: str) -> List[str]:
+        info = self._column_info(name)
+        return list(info.get("vocabulary", [])) if info else []
+
+    def offsets(self, list_name: str) -> np.ndarray:
+        """Offsets of a list field: items of parent row i are offsets[i]:offsets[i + 1]"""
+        info = self.meta["lists"].get(list_name)
+        if info is None:
+            raise ColumnUnavailable(list_name)
+        return self._load(info["file"])
+
+    def _column_info(self, name: str) -> Optional[Dict[str, Any]]:
+        if name in self.meta["mixed_columns"]:
+            raise ColumnUnavailable(name)
+        if any(name == level or name.startswith(level + ".") for level in self.meta["irregular_lists"]):
+            raise ColumnUnavailable(name)
+        return self.meta["columns"].get(name)
+
+    def _load(self, file_name: str) -> np.ndarray:
+        if file_name not in self._arrays:
+            self._arrays[file_name] = np.load(self.directory / file_name, mmap_mode="r")
+        return self._arrays[file_name]
+
+
+class _SpilledField:
+    """Row-indexed values of one field, appended to two raw files in chunks of _SPILL_ROWS"""
+
+    def __init__(self, rows_path: Path, values_path: Path):
+        self.rows_path = rows_path
+        self.values_path = values_path
+        self.rows = array("q")
+        self.values: List[Any] = []
+        self.chunks: List[Tuple[int, np.dtype]] = []  # (count, values dtype) in file order
+
+    def add(self, row: int, value: Any, dtype: np.dtype) -> None:
+        self.rows.append(row)
+        self.values.append(value)
+        if len(self.rows) >= _SPILL_ROWS:
+            self.spill(dtype)
+
+    def spill(self, dtype: np.dtype) -> None:
+        if not self.rows:
+            return
+        with open(self.rows_path, "ab") as f:
+            f.write(self.rows.tobytes())
+        with open(self.values_path, "ab") as f:
+            f.write(np.array(self.values, dtype=dtype).tobytes())
+        self.chunks.append((len(self.rows), np.dtype(dtype)))
+        self.rows = array("q")
+        self.values = []
+
+    def read(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(rows, values) arrays chunk by chunk, in the order they were added"""
+        with open(self.rows_path, "rb") as rows_file, open(self.values_path, "rb") as values_file:
+            for count, dtype in self.chunks:
+                yield np.fromfile(rows_file, dtype=np.int64, count=count), np.fromfile(values_file, dtype=dtype, count=count)
+
+    def discard(self) -> None:
+        self.rows = array("q")
+        self.values = []
+        self.chunks = []
+        for path in (self.rows_path, self.values_path):
+            if path.exists():
+                path.unlink()
+
+
+class _ColumnBuilder:
+    """
+    Flattens frames level by level, spilling every field to disk as it goes.
+
+    Memory stays bounded by the number of fields, not the recording: each field
+    holds at most _SPILL_ROWS values before they are appended to its files under
+    spill_dir. String values are spilled as codes in order of first appearance.
+    """
+
+    def __init__(self, spill_dir: Path):
+        self.spill_dir = spill_dir
+        self.level_rows: Dict[str, int] = {"": 0}
+        self.level_parent: Dict[str, str] = {}
+        self.list_lengths: Dict[str, _SpilledField] = {}
+        self.values: Dict[str, _SpilledField] = {}
+        self.column_level: Dict[str, str] = {}
+        self.kinds: Dict[str, str] = {}
+        self.integral: Dict[str, bool] = {}
+        self.codes: Dict[str, Dict[str, int]] = {}
+        self.irregular_lists = set()
+
+    def add_frame(self, entry: Dict[str, Any]) -> None:
+        row = self.level_rows[""]
+        self.level_rows[""] = row + 1
+        self._ingest(entry, "", "", row)
+
+    def _ingest(self, obj: Dict[str, Any], level: str, prefix: str, row: int) -> None:
+        for key, value in obj.items():
+            name = prefix + key
+            if isinstance(value, dict):
+                self._ingest(value, level, name + ".", row)
+            elif isinstance(value, list):
+                self._ingest_list(value, level, name, row)
+            elif value is not None:
+                self._set(name, level, row, value)
+
+    def _ingest_list(self, items: List[Any], parent: str, level: str, parent_row: int) -> None:
+        self.level_parent.setdefault(level, parent)
+        if level not in self.list_lengths:
+            self.list_lengths[level] = self._field(f"list_{len(self.list_lengths)}")
+        self.list_lengths[level].add(parent_row, len(items), np.int64)
+
+        if level in self.kinds:
+            self.irregular_lists.add(level)
+
+        start = self.level_rows.get(level, 0)
+        self.level_rows[level] = start + len(items)
+        for i, item in enumerate(items):
+            if isinstance(item, dict):
+                self._ingest(item, level, level + ".", start + i)
+            else:
+                self.irregular_lists.add(level)
+
+    def _set(self, name: str, level: str, row: int, value: Any) -> None:
+        if name in self.level_parent:
+            self.irregular_lists.add(name)
+        # bool before int: isinstance(True, int) holds
+        kind = ("bool" if isinstance(value, bool) else "str" if isinstance(value, str)
+                else "num" if isinstance(value, (int, float)) else "other")
+        known = self.kinds.get(name)
+        if known is None:
+            self.kinds[name] = known = kind
+            self.column_level[name] = level
+            self.values[name] = self._field(f"col_{len(self.values)}")
+        elif known != kind or self.column_level[name] != level:
+            if known != "mixed":
+                self.kinds[name] = "mixed"
+                self.values[name].discard()
+            return
+
+        if kind == "num":
+            integral = type(value) is int
+            self.integral[name] = self.integral.get(name, True) and integral
+            self.values[name].add(row, value, np.int64 if self.integral[name] else np.float64)
+        elif kind == "str":
+            codes = self.codes.setdefault(name, {})
+            self.values[name].add(row, codes.setdefault(value, len(codes)), np.int32)
+        elif kind == "bool":
+            self.values[name].add(row, value, np.bool_)
+
+    def _field(self, stem: str) -> _SpilledField:
+        return _SpilledField(self.spill_dir / f"{stem}.rows", self.spill_dir / f"{stem}.values")
+
+    def flush(self) -> None:
+        for field in self.list_lengths.values():
+            field.spill(np.int64)
+        for name, field in self.values.items():
+            kind = self.kinds[name]
+            if kind == "num":
+                field.spill(np.int64 if self.integral[name] else np.float64)
+            elif kind == "str":
+                field.spill(np.int32)
+            elif kind == "bool":
+                field.spill(np.bool_)
+
+
+def _write_offsets(field: _SpilledField, parent_rows: int, path: Path) -> None:
+    offsets = np.lib.format.open_memmap(path, mode="w+", dtype=np.int64, shape=(parent_rows + 1,))
+    offsets[:] = 0
+    for rows, lengths in field.read():
+        offsets[rows + 1] = lengths
+    total = 0
+    for begin in range(0, parent_rows + 1, _SPILL_ROWS):
+        block = np.cumsum(offsets[begin:begin + _SPILL_ROWS]) + total
+        offsets[begin:begin + _SPILL_ROWS] = block
+        total = int(block[-1])
+    offsets.flush()
+    del offsets
+
+
+def _write_column(field: _SpilledField, kind: str, integral: bool, rows: int, path: Path, mask_path: Path,
+                  remap: Optional[np.ndarray] = None) -> bool:
+    """Scatter the spilled chunks into a memory-mapped column; return whether every row is valid"""
+    dtype, filler = {
+        "str": (np.int32, -1),
+        "bool": (np.bool_, False),
+        "num": (np.int64, 0) if integral else (np.float64, np.nan),
+    }[kind]
+    data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(rows,))
+    mask = np.lib.format.open_memmap(mask_path, mode="w+", dtype=bool, shape=(rows,))
+    data[:] = filler
+    mask[:] = False
+    for chunk_rows, values in field.read():
+        data[chunk_rows] = remap[values] if remap is not None else values
+        mask[chunk_rows] = True
+    complete = bool(mask.all())
+    data.flush()
+    mask.flush()
+    del data, mask
+    if complete:
+        mask_path.unlink()
+    return complete
+
+
+def _build_store(data_path: Path, store_dir: Path, digest: str) -> None:
+    store_dir.parent.mkdir(parents=True, exist_ok=True)
+    build_dir = Path(tempfile.mkdtemp(dir=store_dir.parent, prefix=".build-"))
+    try:
+        spill_dir = build_dir / "spill"
+        spill_dir.mkdir()
+        builder = _ColumnBuilder(spill_dir)
+        malformed_lines = 0
+        non_object_frames = 0
+        for _, entry, error in FrameReader(data_path):
+            if error is not None:
+                malformed_lines += 1
+            elif not isinstance(entry, dict):
+                non_object_frames += 1
+            else:
+                builder.add_frame(entry)
+        builder.flush()
+
+        stat = data_path.stat()
+        meta: Dict[str, Any] = {
+            "version": STORE_VERSION,
+            "source": str(data_path),
+            "digest": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "frames": builder.level_rows[""],
+            "malformed_lines": malformed_lines,
+            "non_object_frames": non_object_frames,
+            "columns": {},
+            "lists": {},
+            "mixed_columns": [],
+            "irregular_lists": sorted(builder.irregular_lists),
+        }
+
+        for i, (level, lengths) in enumerate(sorted(builder.list_lengths.items())):
+            file_name = f"list_{i:04d}.npy"
+            _write_offsets(lengths, builder.level_rows[builder.level_parent[level]], build_dir / file_name)
+            meta["lists"][level] = {"file": file_name, "parent": builder.level_parent[level]}
+
+        for i, name in enumerate(sorted(builder.values)):
+            kind = builder.kinds[name]
+            if kind not in ("num", "str", "bool"):
+                meta["mixed_columns"].append(name)
+                continue
+
+            info: Dict[str, Any] = {"level": builder.column_level[name], "file": f"col_{i:04d}.npy", "mask": None}
+            remap = None
+            if kind == "str":
+                # Codes were handed out in order of appearance; the stored vocabulary is sorted
+                codes = builder.codes[name]
+                vocabulary = sorted(codes)
+                remap = np.empty(len(codes), dtype=np.int32)
+                for code, value in enumerate(vocabulary):
+                    remap[codes[value]] = code
+                info["vocabulary"] = vocabulary
+
+            mask_file = f"mask_{i:04d}.npy"
+            rows = builder.level_rows[builder.column_level[name]]
+            if not _write_column(builder.values[name], kind, builder.integral.get(name, False), rows,
+                                 build_dir / info["file"], build_dir / mask_file, remap):
+                info["mask"] = mask_file
+            meta["columns"][name] = info
+
+        shutil.rmtree(spill_dir)
+        with open(build_dir / "meta.json", "w") as f:
+            json.dump(meta, f)
+
+        try:
+            os.replace(build_dir, store_dir)
+        except OSError:
+            # Another process finished the same store first
+            if not (store_dir / "meta.json").exists():
+                raise
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
@@ -0,0 +1,149 @@
+"""
+Pool of long-lived worker processes with per-task limits
+
+Each task runs in a worker process while the caller watches it: a task that
+exceeds its wall-clock timeout, whose worker grows beyond an RSS cap, or whose
+caller gives up on it (see run's cancel) gets the worker killed, and a fresh
+worker replaces it on the next task. Workers that finished their task stay warm
+for the next one, so one runaway task costs a single process restart instead of
+the whole run.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+import psutil
+
+POLL_INTERVAL_S = 0.05  # how often a running task's RSS and deadline are checked
+
+logger = logging.getLogger("IsolatedWorkerPool")
+
+
+@dataclass
+class TaskOutcome:
+    """What happened to one task: status is ok, error, timeout, memory, cancelled or crashed"""
+    status: str
+    value: Any = None  # return value for ok, error text for error
+    elapsed_s: float = 0.0
+    peak_rss_bytes: int = 0  # sampled every POLL_INTERVAL_S
+
+
+def _worker_main(connection, initializer: Optional[Callable], initargs: Tuple) -> None:
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        fn, args = task
+        try:
+            reply = ('ok', fn(*args))
+        except Exception as e:
+            reply = ('error', f"{type(e).__name__}: {e}")
+        connection.send(reply)
+
+
+class _Worker:
+    def __init__(self, context, initializer: Optional[Callable], initargs: Tuple):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_connection, initializer, initargs),
+                                       daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.ps = psutil.Process(self.process.pid)
+
+    def rss(self) -> int:
+        return self.ps.memory_info().rss
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def stop(self) -> None:
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.connection.close()
+
+
+class IsolatedWorkerPool:
+    """
+    Runs fn(*args) in worker processes started with initializer(*initargs).
+    run() is thread-safe; call it from up to max_workers threads to run tasks in parallel.
+    """
+
+    def __init__(self, max_workers: int = 1, initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.max_workers = max(1, max_workers)
+        self.initializer = initializer
+        self.initargs = initargs
+        self._context = multiprocessing.get_context()
+        self._idle: List[_Worker] = []
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None,
+            max_rss_bytes: Optional[int] = None, cancel: Optional[threading.Event] = None) -> TaskOutcome:
+        """Run fn(*args) in a worker; setting cancel abandons the task and kills its worker"""
+        with self._slots:
+            if cancel is not None and cancel.is_set():
+                return TaskOutcome('cancelled')
+            with self._lock:
+                worker = self._idle.pop() if self._idle else None
+            if worker is None or not worker.process.is_alive():
+                worker = _Worker(self._context, self.initializer, self.initargs)
+
+            try:
+                outcome = self._watch(worker, fn, args, timeout, max_rss_bytes, cancel)
+            except BaseException:
+                worker.kill()  # e.g. a scenario deadline: the task's state is unknown
+                raise
+            if outcome.status in ('ok', 'error'):
+                with self._lock:
+                    self._idle.append(worker)
+            else:
+                logger.warning(f"Recycling worker {worker.process.pid} after {outcome.status}")
+                worker.kill()  # the next task starts a fresh worker
+            return outcome
+
+    def _watch(self, worker: _Worker, fn: Callable, args: Tuple, timeout: Optional[float],
+               max_rss_bytes: Optional[int], cancel: Optional[threading.Event]) -> TaskOutcome:
+        start = time.perf_counter()
+        peak_rss = 0
+        try:
+            worker.connection.send((fn, args))
+            while True:
+                peak_rss = max(peak_rss, worker.rss())
+                elapsed = time.perf_counter() - start
+                if max_rss_bytes is not None and peak_rss > max_rss_bytes:
+                    return TaskOutcome('memory', elapsed_s=elapsed, peak_rss_bytes=peak_rss)
+                if timeout is not None and elapsed >= timeout:
+                    return TaskOutcome('timeout', elapsed_s=elapsed, peak_rss_bytes=peak_rss)
+                if cancel is not None and cancel.is_set():
+                    return TaskOutcome('cancelled', elapsed_s=elapsed, peak_rss_bytes=peak_rss)
+                wait = POLL_INTERVAL_S if timeout is None else min(POLL_INTERVAL_S, timeout - elapsed)
+                if worker.connection.poll(wait):
+                    status, value = worker.connection.recv()
+                    return TaskOutcome(status, value, time.perf_counter() - start, peak_rss)
+        except (EOFError, OSError, psutil.NoSuchProcess) as e:
+            worker.process.join(timeout=1)
+            reason = f"worker exited with code {worker.process.exitcode}" if worker.process.exitcode is not None else str(e)
+            return TaskOutcome('crashed', reason, time.perf_counter() - start, peak_rss)
+
+    def shutdown(self) -> None:
+        """Stop idle workers; their initializer's finalizers (e.g. plugin teardown) run on exit"""
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.stop()
@@ -0,0 +1,132 @@
+"""
+JSON decoder backends for JSONL recordings
+
+FrameReader decodes every line through a FrameDecoder:
+    json      - stdlib json.loads, always available
+    orjson    - orjson.loads, several times faster on wide records
+    simdjson  - pysimdjson; parses lazily, so with a field projection only the
+                fields the plugins declared are turned into Python objects
+
+'auto' picks simdjson when a projection is requested, then orjson, then json,
+depending on what is installed. A line a fast backend rejects is decoded again
+with the stdlib, so malformed lines fail with the same ValueError and inputs
+only the stdlib accepts (NaN, big integers, lone surrogates) still decode.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # optional dependency
+    simdjson = None
+
+BACKENDS = ("auto", "json", "orjson", "simdjson")
+
+
+class FrameDecoder:
+    """Decodes one JSONL line (bytes) into a frame"""
+
+    name = "json"
+
+    def decode(self, line: bytes) -> Any:
+        return json.loads(line)
+
+
+class OrjsonDecoder(FrameDecoder):
+    name = "orjson"
+
+    def decode(self, line: bytes) -> Any:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            return json.loads(line)
+
+
+class SimdjsonDecoder(FrameDecoder):
+    """
+    Decodes with a reusable simdjson parser. With `fields` (dotted paths such as
+    'latency_ms' or 'fused_objects.source_classes') only those members are
+    converted; list elements keep their position so counts stay correct.
+    """
+    name = "simdjson"
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        self.parser = simdjson.Parser()
+        self.projection = field_trie(fields) if fields is not None else None
+
+    def decode(self, line: bytes) -> Any:
+        try:
+            document = self.parser.parse(line)
+            if self.projection is None:
+                return _to_python(document)
+            return _project(document, self.projection)
+        except ValueError:
+            return json.loads(line)
+
+
+def field_trie(fields: Iterable[str]) -> Dict[str, Dict]:
+    """{'a.b', 'a.c', 'd'} -> {'a': {'b': {}, 'c': {}}, 'd': {}}; an empty node keeps everything below it"""
+    trie: Dict[str, Dict] = {}
+    for field in sorted(fields, key=lambda f: f.count(".")):
+        node = trie
+        parts = field.split(".")
+        for i, part in enumerate(parts):
+            if part in node and not node[part]:
+                break  # a shorter path already keeps the whole member
+            node = node.setdefault(part, {})
+            if i == len(parts) - 1:
+                node.clear()
+    return trie
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _project(value: Any, trie: Dict[str, Dict]) -> Any:
+    if not trie:
+        return _to_python(value)
+    if isinstance(value, simdjson.Object):
+        return {key: _project(value[key], trie[key]) for key in trie if key in value}
+    if isinstance(value, simdjson.Array):
+        return [_project(item, trie) for item in value]
+    return value
+
+
+def available_backends() -> List[str]:
+    return [name for name, module in (("simdjson", simdjson), ("orjson", orjson), ("json", json)) if module]
+
+
+def create_decoder(backend: str = "auto", fields: Optional[Iterable[str]] = None) -> FrameDecoder:
+    """
+    Decoder for `backend` ('auto', 'json', 'orjson' or 'simdjson'). fields is the
+    projection hint: None means callers need complete frames.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if backend == "auto":
+        if simdjson is not None and fields is not None:
+            backend = "simdjson"
+        elif orjson is not None:
+            backend = "orjson"
+        else:
+            backend = "json"
+
+    if backend == "orjson":
+        if orjson is None:
+            raise ValueError("JSON backend not installed: orjson")
+        return OrjsonDecoder()
+    if backend == "simdjson":
+        if simdjson is None:
+            raise ValueError("JSON backend not installed: simdjson")
+        return SimdjsonDecoder(fields)
+    return FrameDecoder()
@@ -0,0 +1,57 @@
+"""
+NumPy helpers shared by the KPI plugins
+
+The reductions reproduce the plain-Python results the plugins reported
+before (max() and a left-to-right sum()), so metrics stay identical whether
+values come from a scan or from the columnar frame store.
+"""
+from typing import Sequence, Union
+
+import numpy as np
+
+_SUM_CHUNK = 1 << 20
+
+Number = Union[int, float]
+
+
+def to_array(values: Union[Sequence[Number], np.ndarray]) -> np.ndarray:
+    """int64 array when every value is integral, float64 otherwise"""
+    array = np.asarray(values)
+    if array.dtype.kind not in "iufb":
+        array = array.astype(np.float64)
+    return array
+
+
+def array_max(values: np.ndarray) -> Number:
+    return values.max().item()
+
+
+def sequential_sum(values: np.ndarray, start: Number = 0) -> Number:
+    """Left-to-right sum, bit-identical to builtin sum(values, start)"""
+    if values.dtype.kind in "iub" and isinstance(start, int):
+        return start + values.sum().item()
+
+    # np.sum uses pairwise summation; a chunked cumsum keeps the sequential order
+    total = float(start)
+    for offset in range(0, len(values), _SUM_CHUNK):
+        chunk = np.asarray(values[offset:offset + _SUM_CHUNK], dtype=np.float64)
+        total = np.cumsum(np.concatenate(([total], chunk)))[-1].item()
+    return total
+
+
+def array_mean(values: np.ndarray) -> float:
+    return sequential_sum(values) / len(values)
+
+
+def count_dropped_frames(timestamps: np.ndarray, expected_interval: Number) -> Number:
+    """
+    Number of frames missing from a recording: every gap between consecutive
+    (sorted) timestamps longer than expected_interval hides gap // interval - 1 frames.
+    """
+    if len(timestamps) < 2:
+        return 0
+    gaps = np.diff(np.sort(timestamps))
+    gaps = gaps[gaps > expected_interval]
+    if not len(gaps):
+        return 0
+    return (gaps // expected_interval - 1).sum().item()
@@ -0,0 +1,271 @@
+"""
+Live phase: evaluate KPIs while the SUT runs
+
+The `live` section of a scenario names a line source (see core.frame_sources)
+and the plugins fed from it:
+
+    live:
+      source: {type: tail, idle_timeout: 5, end_marker: '{"end_of_recording": true}'}
+      queue_size: 1024          # lines buffered between the source and the plugins
+      rolling_interval: 1.0     # seconds between rolling verdicts
+      max_duration: 600         # seconds; the phase ends (without failing) after that
+      plugins:
+        - name: LatencyKPIPlugin
+          config: {latency_threshold: 50, latency_field: fusion_latency_ms}
+          abort_on_failure: true  # a failed rolling verdict aborts the scenario
+          min_frames: 100         # frames before the verdict may abort
+
+Plugins come from plugins/live/ (LivePlugin) or are incremental post-run
+plugins. One task reads the source into a bounded asyncio.Queue, so a source
+that outpaces the plugins is paused instead of buffering without limit
+(sockets and pipes then push back on the writer). Another task decodes each
+line once and hands the frame to every plugin. Every rolling_interval the
+rolling verdicts are logged, and a failure of a plugin marked abort_on_failure
+stops the feed; the post-run phase is then skipped. Verdicts are due on time
+even while the source is idle, and each of them gives the monitors a turn,
+however full the queue.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.frame_sources import open_source
+from core.json_decoder import create_decoder
+from core.live_plugin import LivePlugin
+from core.models import KPIThreshold, PluginPhase, PluginProfile, PluginResult, TestContext
+from core.plugin_registry import BasePlugin, PluginRegistry, required_fields
+
+LIVE_SUFFIX = " (live)"  # live results share the matrix with post-run results of the same plugin
+MIN_WAIT_S = 0.001  # shortest wait for a line, so rolling_interval 0 does not spin while the source is idle
+
+
+@dataclass
+class LivePhaseOutcome:
+    results: List[PluginResult] = field(default_factory=list)
+    frames: int = 0
+    aborted_by: Optional[str] = None  # plugin whose rolling verdict aborted the phase
+    abort_reason: str = ""
+
+    @property
+    def aborted(self) -> bool:
+        return self.aborted_by is not None
+
+
+def rolling_verdict(instance: BasePlugin) -> Optional[bool]:
+    """Pass/fail of everything the plugin consumed so far, None while it cannot be judged"""
+    if isinstance(instance, LivePlugin):
+        return instance.verdict()
+    if instance.is_sweepable():
+        value = instance.judged_statistic()
+        if value is None:
+            return None
+        return bool(KPIThreshold(instance.threshold_keys[0], instance.threshold,
+                                 instance.threshold_operator).check(value))
+    return None
+
+
+class _LivePlugin:
+    """Per-scenario state of one configured live plugin"""
+
+    def __init__(self, plugin_config: Dict[str, Any], instance: BasePlugin):
+        self.name = plugin_config.get('name')
+        self.instance = instance
+        self.abort_on_failure = plugin_config.get('abort_on_failure', False)
+        self.min_frames = plugin_config.get('min_frames', 0)
+        self.result: Optional[PluginResult] = None  # set once the plugin has failed
+        self.elapsed = 0.0
+        self.verdict: Optional[bool] = None
+        self.verdicts: List[Tuple[int, float, Optional[bool]]] = []  # (frames, seconds, verdict) at every change
+
+
+def run_live_phase(registry: PluginRegistry, context: TestContext, live_config: Dict[str, Any]) -> LivePhaseOutcome:
+    """Feed the configured live source to the live plugins until it ends, max_duration passes or a hard failure"""
+    plugin_configs = live_config.get('plugins', [])
+    acquired: List[BasePlugin] = []
+    plugins: List[_LivePlugin] = []
+    results: List[Optional[PluginResult]] = [None] * len(plugin_configs)
+    try:
+        for index, plugin_config in enumerate(plugin_configs):
+            plugin_name = plugin_config.get('name')
+            phase = PluginPhase.LIVE if registry.get_plugin(PluginPhase.LIVE, plugin_name) else PluginPhase.POST_RUN
+            instance, error = registry.acquire_instance(phase, plugin_name, plugin_config.get('config', {}))
+            if error:
+                results[index] = error
+                continue
+            acquired.append(instance)
+            if not isinstance(instance, LivePlugin) and not instance.is_incremental():
+                results[index] = PluginResult(success=False, message=f"Plugin cannot run live: {plugin_name}",
+                                              plugin_name=plugin_name)
+                continue
+            plugins.append(_LivePlugin(plugin_config, instance))
+
+        runner = _LiveRunner(context, live_config, plugins)
+        outcome = asyncio.run(runner.run())
+        live_results = iter(outcome.results)
+        outcome.results = [result or next(live_results) for result in results]
+        for result in outcome.results:
+            result.plugin_name += LIVE_SUFFIX
+        return outcome
+    finally:
+        registry.release_instances(acquired)
+
+
+class _LiveRunner:
+    def __init__(self, context: TestContext, live_config: Dict[str, Any], plugins: List[_LivePlugin]):
+        self.context = context
+        self.logger = context.logger
+        self.source_spec = live_config.get('source', {})
+        self.queue_size = live_config.get('queue_size', 1024)  # lines between source and plugins
+        self.rolling_interval = live_config.get('rolling_interval', 1.0)  # seconds
+        self.max_duration = live_config.get('max_duration')  # seconds, None for no limit
+        self.plugins = plugins
+        self.frames = 0
+        self.bytes_read = 0
+        self.start = 0.0
+        self.aborted_by: Optional[_LivePlugin] = None
+
+    async def run(self) -> LivePhaseOutcome:
+        self.start = time.perf_counter()
+        for plugin in self.plugins:
+            tick = time.perf_counter()
+            try:
+                plugin.instance.begin(self.context)
+            except Exception as e:
+                plugin.result = PluginResult(success=False, message=str(e), error=True)
+            plugin.elapsed += time.perf_counter() - tick
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        reader = asyncio.ensure_future(self._read(queue))
+        monitors = [asyncio.ensure_future(self._monitor(plugin)) for plugin in self._active()]
+        try:
+            await asyncio.wait_for(self._consume(queue, reader), self.max_duration)
+        except asyncio.TimeoutError:
+            self.logger.info(f"Live phase of {self.context.scenario_name} reached max_duration "
+                             f"of {self.max_duration}s")
+        finally:
+            for task in [reader] + monitors:
+                task.cancel()
+            await asyncio.gather(reader, *monitors, return_exceptions=True)
+
+        source_error = None if reader.cancelled() else reader.exception()
+        self._update_verdicts()
+        outcome = LivePhaseOutcome(frames=self.frames)
+        if self.aborted_by is not None:
+            outcome.aborted_by = self.aborted_by.name
+            outcome.abort_reason = f"Live phase aborted by {self.aborted_by.name} after {self.frames} frames"
+        outcome.results = [self._finalize(plugin, source_error) for plugin in self.plugins]
+        return outcome
+
+    def _active(self) -> List[_LivePlugin]:
+        return [plugin for plugin in self.plugins if plugin.result is None]
+
+    async def _read(self, queue: asyncio.Queue) -> None:
+        """Put every line of the source on the queue, then None; put() blocks while the queue is full"""
+        try:
+            async for line in open_source(self.source_spec, self.context.data_path):
+                await queue.put(line)
+        finally:
+            # Even a failing source ends the feed; its exception is reported by run()
+            if not queue.full():
+                queue.put_nowait(None)
+
+    async def _consume(self, queue: asyncio.Queue, reader: asyncio.Future) -> None:
+        active = self._active()
+        decoder = create_decoder(self.context.json_backend, required_fields(plugin.instance for plugin in active))
+        next_verdict = time.perf_counter() + self.rolling_interval
+        while active:
+            now = time.perf_counter()
+            if now >= next_verdict:
+                next_verdict = now + self.rolling_interval
+                if self._update_verdicts(abort=True):
+                    return
+                await asyncio.sleep(0)  # give monitors their turn, however full the queue
+
+            if queue.empty():
+                if reader.done():
+                    return
+                try:
+                    # A stalled source must not hold up the verdicts: wait for a line until the next one is due
+                    line = await asyncio.wait_for(queue.get(), max(next_verdict - time.perf_counter(), MIN_WAIT_S))
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                line = queue.get_nowait()
+            if line is None:
+                return
+            self.bytes_read += len(line)
+            try:
+                entry, error = decoder.decode(line), None
+                self.frames += 1
+            except ValueError as e:
+                entry, error = None, e
+
+            tick = time.perf_counter()
+            for plugin in active:
+                try:
+                    if error is None:
+                        plugin.instance.on_frame(entry)
+                    else:
+                        plugin.instance.on_malformed_line(line, error)
+                except Exception as e:
+                    plugin.result = PluginResult(success=False, message=str(e), error=True)
+                now = time.perf_counter()
+                plugin.elapsed += now - tick
+                tick = now
+            if any(plugin.result is not None for plugin in active):
+                active = self._active()
+
+    def _update_verdicts(self, abort: bool = False) -> bool:
+        """Record the rolling verdicts; with abort, True when a failure aborts the phase"""
+        seconds = round(time.perf_counter() - self.start, 3)
+        for plugin in self._active():
+            try:
+                verdict = rolling_verdict(plugin.instance)
+            except Exception as e:
+                self.logger.warning(f"Rolling verdict of {plugin.name} failed: {e}")
+                continue
+            if verdict != plugin.verdict:
+                plugin.verdict = verdict
+                plugin.verdicts.append((self.frames, seconds, verdict))
+                state = {True: "passing", False: "FAILING", None: "not judged"}[verdict]
+                self.logger.info(f"Live {plugin.name} is {state} after {self.frames} frames "
+                                 f"({self.context.scenario_name})")
+            if abort and verdict is False and plugin.abort_on_failure and self.frames >= plugin.min_frames:
+                self.logger.error(f"Live {plugin.name} failed in {self.context.scenario_name}: aborting the scenario")
+                self.aborted_by = plugin
+                return True
+        return False
+
+    async def _monitor(self, plugin: _LivePlugin) -> None:
+        if not isinstance(plugin.instance, LivePlugin):
+            return
+        try:
+            await plugin.instance.monitor(self.context)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Live monitor of {plugin.name} failed: {e}")
+            plugin.result = PluginResult(success=False, message=str(e), error=True)
+
+    def _finalize(self, plugin: _LivePlugin, source_error: Optional[BaseException]) -> PluginResult:
+        tick = time.perf_counter()
+        result = plugin.result
+        if result is None and source_error is not None:
+            result = PluginResult(success=False, message=f"Live source failed: {source_error}", error=True)
+        if result is None:
+            try:
+                result = plugin.instance.finalize(self.context)
+            except Exception as e:
+                result = PluginResult(success=False, message=str(e), error=True)
+        plugin.elapsed += time.perf_counter() - tick
+        result.plugin_name = plugin.name
+        result.duration_ms = plugin.elapsed * 1000
+        result.metrics['live'] = {
+            'frames': self.frames,
+            'aborted': self.aborted_by is not None,
+            'rolling': [list(change) for change in plugin.verdicts],
+        }
+        result.profile = PluginProfile(wall_ms=result.duration_ms, cpu_ms=result.duration_ms, frames=self.frames,
+                                       bytes_read=self.bytes_read, mode='live')
+        return result
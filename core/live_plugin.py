@@ -0,0 +1,52 @@
+# core/live_plugin.py
+
+from typing import Any, Dict, Optional, Set
+
+from core.models import PluginResult, TestContext
+from core.plugin_registry import BasePlugin
+
+
+class LivePlugin(BasePlugin):
+    """
+    Base class for plugins of the live phase (see core.live_phase).
+
+    While the SUT runs, every frame it writes is handed to on_frame() and
+    verdict() is polled for a rolling pass/fail; finalize() gives the result
+    once the feed ends or the phase is aborted. monitor() runs alongside the
+    feed for plugins that sample something other than frames.
+
+    Incremental post-run plugins (begin/on_frame/finalize) can run live as
+    well; their rolling verdict is their judged_statistic() against the threshold.
+    """
+
+    def __init__(self, config=None):
+        super().__init__(config)
+
+    def begin(self, context: TestContext) -> None:
+        """Reset per-scenario state before the first frame"""
+
+    def required_fields(self) -> Optional[Set[str]]:
+        """Dotted paths of the frame fields on_frame() reads; None means complete frames"""
+        return None
+
+    def on_frame(self, entry: Dict[str, Any]) -> None:
+        """Consume one decoded frame"""
+
+    def on_malformed_line(self, line: bytes, error: ValueError) -> None:
+        """Handle a line that could not be decoded; fails the plugin by default"""
+        raise error
+
+    async def monitor(self, context: TestContext) -> None:
+        """Runs for the whole live phase and is cancelled when it ends"""
+
+    def verdict(self) -> Optional[bool]:
+        """Rolling pass/fail of everything seen so far; None while there is nothing to judge"""
+        return None
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        """Evaluate the KPI at the end of the live phase"""
+        raise NotImplementedError("Live plugin must implement 'finalize'")
+
+    def is_incremental(self) -> bool:
+        # Live plugins consume frames from the live phase, never from a post-run scan
+        return False
@@ -27,6 +27,33 @@ class PluginStatus(str, Enum):
     WARNING = "warning"
     NOT_APPLICABLE = "not_applicable"
 
+@dataclass
+class PluginProfile:
+    """
+    Resources used to produce one PluginResult. mode tells how it was produced:
+    execute, columns, scan, shards, aggregate_cache, result_cache, isolated or live.
+    In a (sharded) shared scan, frames, bytes_read and peak_rss_delta_mb belong to
+    the whole scan, and cpu_ms is the plugin's own wall time scaled by the scan's
+    CPU utilization, so the shared decode is not attributed to any single KPI.
+    """
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_rss_delta_mb: float = 0.0  # growth of the process's peak RSS
+    frames: Optional[int] = None  # None when the plugin reads the recording itself
+    bytes_read: int = 0
+    mode: str = "execute"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'wall_ms': self.wall_ms,
+            'cpu_ms': self.cpu_ms,
+            'peak_rss_delta_mb': self.peak_rss_delta_mb,
+            'frames': self.frames,
+            'bytes_read': self.bytes_read,
+            'mode': self.mode
+        }
+
+
 @dataclass
 class PluginResult:
     """Result from plugin execution"""
@@ -36,6 +63,8 @@ class PluginResult:
     duration_ms: float = 0.0
     timestamp: float = field(default_factory=time.time)
     plugin_name: str = ""
+    profile: Optional[PluginProfile] = None  # set by PluginRegistry
+    error: bool = False  # produced by an exception, crash or timeout rather than by the plugin's verdict
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -45,9 +74,18 @@ class PluginResult:
             'metrics': self.metrics,
             'duration_ms': self.duration_ms,
             'timestamp': self.timestamp,
-            'plugin_name': self.plugin_name
+            'plugin_name': self.plugin_name,
+            'profile': self.profile.to_dict() if self.profile else None,
+            'error': self.error
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PluginResult":
+        data = dict(data)
+        if data.get('profile'):
+            data['profile'] = PluginProfile(**data['profile'])
+        return cls(**data)
+
 
 @dataclass
 class TestContext:
@@ -56,14 +94,31 @@ class TestContext:
     scenario_name: str
     data_path: Path
     # output_dir: Path
-    # temp_dir: Path
     logger: logging.Logger
     mode: TestMode
+    temp_dir: Path = Path("./tmp")
+    use_frame_store: bool = False
+    json_backend: str = "auto"  # see core.json_decoder
+    follow: Any = None  # core.frame_reader.FollowMode: data_path is still being written
 
     # Runtime state
     metrics: Dict[str, Any] = field(default_factory=dict)
     plugin_results: Dict[str, List[PluginResult]] = field(default_factory=dict)
     system_modules: List[str] = field(default_factory=list)
+    _frame_store: Any = field(default=None, repr=False, compare=False)
+
+    def __getstate__(self):
+        # Memory maps are reopened on demand in the receiving process
+        state = self.__dict__.copy()
+        state['_frame_store'] = None
+        return state
+
+    def get_frame_store(self):
+        """Columnar view of data_path, cached under temp_dir (see core.frame_store)"""
+        if self._frame_store is None:
+            from core.frame_store import FrameStore
+            self._frame_store = FrameStore.open(self.data_path, self.temp_dir)
+        return self._frame_store
 
     def add_metric(self, name: str, value: Any) -> None:
         self.metrics[name] = value
@@ -105,6 +160,10 @@ class ScenarioConfig:
     name: str
     datapath: Path
     plugins: List[Dict[str, Any]] = field(default_factory=list)
+    concurrency: Dict[str, Any] = field(default_factory=dict)  # executor: thread|process|isolated, max_workers: N
+    live: Dict[str, Any] = field(default_factory=dict)  # source, plugins, ..., see core.live_phase
+    follow: Any = None  # true or {end_marker, idle_timeout}: post_run tails datapath while it is written
+    modules: Optional[List[str]] = None  # SUT modules the scenario needs, None for all of sut_modules
 
 
 @dataclass
@@ -118,11 +177,18 @@ class TestConfiguration:
     live_plugins: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     post_run_plugins: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
-    sut_modules: List[str] = field(default_factory=list)
+    sut_modules: List[Any] = field(default_factory=list)  # service names or specs, see core.module_launcher
     log_config: Dict[str, Any] = field(default_factory=dict)
 
     output_dir: Path = Path("./reports")
     temp_dir: Path = Path("./tmp")
+    use_frame_store: bool = False
+    json_backend: str = "auto"  # auto, json, orjson, simdjson
+    result_cache_size_mb: float = 256  # plugin result cache under temp_dir, see core.result_cache
+    scenario_timeout: Optional[float] = None  # seconds, per scenario
+    dashboard_interval: float = 30  # seconds between dashboard refreshes while scenarios complete
+    sweep: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # plugin -> {threshold key: values}, see core.threshold_sweep
+    pipeline: Dict[str, int] = field(default_factory=dict)  # stage -> concurrent scenarios, see core.test_orchestrator
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TestConfiguration":
@@ -134,16 +200,54 @@ class TestConfiguration:
             scenarios.append(ScenarioConfig(
                 name=scenario_data.get("name", "Unnamed"),
                 datapath=Path(scenario_data.get("datapath")),
-                plugins=plugins
+                plugins=plugins,
+                concurrency=scenario_data.get("concurrency", {}),
+                live=scenario_data.get("live") or {},
+                follow=scenario_data.get("follow"),
+                modules=scenario_data.get("modules")
             ))
 
         return cls(
             scenarios=scenarios,
             name=config_data.get("name", "Unnamed Test Run"),
-            mode=TestMode(config_data.get("mode", "SIL"))
+            mode=TestMode(config_data.get("mode", "SIL")),
+            temp_dir=Path(config_data.get("temp_dir", "./tmp")),
+            use_frame_store=config_data.get("frame_store", False),
+            json_backend=config_data.get("json_backend", "auto"),
+            result_cache_size_mb=config_data.get("result_cache_size_mb", 256),
+            scenario_timeout=config_data.get("scenario_timeout"),
+            dashboard_interval=config_data.get("dashboard_interval", 30),
+            sut_modules=config_data.get("sut_modules") or [],
+            sweep=config_data.get("sweep") or {},
+            pipeline=config_data.get("pipeline") or {}
         )
 
 
+@dataclass
+class SweepSurface:
+    """Pass/fail of one KPI in one scenario over a range of thresholds (see core.threshold_sweep)"""
+    scenario_name: str
+    plugin_name: str
+    threshold_key: str
+    settings: Dict[str, Any] = field(default_factory=dict)  # values of the other swept keys
+    thresholds: List[Any] = field(default_factory=list)
+    passed: List[bool] = field(default_factory=list)  # one per threshold, empty if the KPI could not be judged
+    statistic: Optional[float] = None  # the value compared with every threshold
+    message: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'scenario_name': self.scenario_name,
+            'plugin_name': self.plugin_name,
+            'threshold_key': self.threshold_key,
+            'settings': self.settings,
+            'thresholds': self.thresholds,
+            'passed': self.passed,
+            'statistic': self.statistic,
+            'message': self.message
+        }
+
+
 @dataclass
 class TestSummary:
     """Test execution summary"""
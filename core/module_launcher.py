@@ -1,36 +1,330 @@
-import subprocess
+"""
+Launch, health-check and tear down the SUT modules of a run
+
+The `sut_modules` section of the test YAML lists the modules; a scenario's
+`modules` list names the ones it needs (all of them by default):
+
+    sut_modules:
+      - name: fusion_node                 # docker compose service (backend: compose, the default)
+        ready: {port: 5555}               # or {file: /tmp/fusion.ready} or {log: "Listening on"}
+        ready_timeout: 60
+      - name: replay_driver
+        backend: process                  # a local command, e.g. for SIL or tests
+        command: [python, tools/replay_driver.py]
+        ready: {log: "driver ready"}
+        reuse: false                      # restarted for every scenario
+
+ModuleLauncher.ensure() starts the missing modules concurrently and polls their
+readiness probes. Modules that are already running and healthy are reused
+(warm) by the next scenario instead of being restarted. shutdown() stops all
+of them concurrently. Startup latency (start until ready) is recorded per launch.
+"""
 import logging
 import os
+import re
+import socket
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger("ModuleLauncher")
 
 DOCKER_COMPOSE_PATH = "./docker/docker-compose.sut.yaml"  # You can adjust this path
 PROJECT_NAME = "sut_modules"
+BACKENDS = ("compose", "process")
+PROBES = ("port", "file", "log")
+# Seconds between readiness probes; every probe of a compose service runs `docker compose ps`
+POLL_INTERVALS = {"compose": 1.0, "process": 0.1}
 
-def launch_modules(modules: list):
-    """
-    Launches specified SUT modules via Docker Compose.
-    Each module should match a service name defined in docker-compose.sut.yaml.
-    """
-    logger.info(f"Launching SUT modules via Docker Compose: {modules}")
-    try:
-        cmd = ["docker", "compose", "-f", DOCKER_COMPOSE_PATH, "--project-name", PROJECT_NAME, "up", "-d"] + modules
-        subprocess.check_call(cmd)
-        logger.info(f"Modules launched: {', '.join(modules)}")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to launch modules: {e}")
-        raise
-
-
-def stop_modules(modules: list):
-    """
-    Stops the specified modules via Docker Compose.
-    """
-    logger.info(f"Stopping SUT modules: {modules}")
-    try:
-        cmd = ["docker", "compose", "-f", DOCKER_COMPOSE_PATH, "--project-name", PROJECT_NAME, "stop"] + modules
-        subprocess.check_call(cmd)
-        logger.info("Modules stopped successfully.")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to stop modules: {e}")
 
+class ModuleLaunchError(RuntimeError):
+    """One or more SUT modules could not be started or did not become ready"""
+
+
+@dataclass
+class ModuleSpec:
+    name: str
+    backend: str = "compose"  # compose or process
+    service: Optional[str] = None  # compose service, defaults to name
+    command: List[str] = field(default_factory=list)  # process backend
+    cwd: Optional[str] = None
+    env: Dict[str, str] = field(default_factory=dict)
+    ready: Dict[str, Any] = field(default_factory=dict)  # {port: N, host: ...} | {file: path} | {log: regex}
+    ready_timeout: float = 60.0  # seconds from start until the probe must pass
+    poll_interval: Optional[float] = None  # seconds between probes, see POLL_INTERVALS
+    stop_timeout: float = 10.0  # seconds before a module that ignores SIGTERM is killed
+    reuse: bool = True  # keep the module running for the next scenario
+
+    @classmethod
+    def from_config(cls, value: Any) -> "ModuleSpec":
+        """A `sut_modules` entry: a compose service name or a mapping; raises ValueError if invalid"""
+        if isinstance(value, str):
+            return cls(name=value)
+        try:
+            spec = cls(**value)
+        except TypeError as e:
+            raise ValueError(f"Invalid SUT module {value}: {e}") from e
+        if spec.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend of SUT module {spec.name}: {spec.backend}")
+        if spec.backend == "process" and not spec.command:
+            raise ValueError(f"SUT module {spec.name} needs a command")
+        unknown = set(spec.ready) - set(PROBES) - {"host"}
+        if unknown:
+            raise ValueError(f"Unknown readiness probe of SUT module {spec.name}: {', '.join(sorted(unknown))}")
+        return spec
+
+
+@dataclass
+class ModuleLaunch:
+    """One ensure() of a module for a scenario"""
+    name: str
+    startup_s: float  # start until ready; 0 for a reused module
+    reused: bool = False
+
+
+class ModuleHandle:
+    """A running instance of a module, created per start by the backend"""
+
+    def __init__(self, spec: ModuleSpec, log_dir: Path):
+        self.spec = spec
+        self.log_path = Path(log_dir) / f"{spec.name}.log"
+        self.log_offset = 0
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def alive(self) -> bool:
+        raise NotImplementedError
+
+    def open_log(self):
+        """Append to the module log; the log probe only looks at what this instance writes"""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        log = open(self.log_path, "ab")
+        self.log_offset = log.tell()
+        return log
+
+    def log_text(self) -> str:
+        """Output of this instance so far, for the log probe"""
+        with open(self.log_path, "rb") as f:
+            f.seek(self.log_offset)
+            return f.read().decode(errors="replace")
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+
+class ProcessModule(ModuleHandle):
+    """A local command; its output goes to <log_dir>/<name>.log"""
+
+    def __init__(self, spec: ModuleSpec, log_dir: Path):
+        super().__init__(spec, log_dir)
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        with self.open_log() as log:
+            self.process = subprocess.Popen(self.spec.command, cwd=self.spec.cwd, stdout=log,
+                                            stderr=subprocess.STDOUT, env=_environment(self.spec.env))
+
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self) -> None:
+        if not self.alive():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(self.spec.stop_timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Module {self.spec.name} ignored SIGTERM, killing it")
+            self.process.kill()
+            self.process.wait()
+
+
+class ComposeModule(ModuleHandle):
+    """A docker compose service of compose_file; its logs are followed into <log_dir>/<name>.log"""
+
+    def __init__(self, spec: ModuleSpec, log_dir: Path, compose_file: str, project: str):
+        super().__init__(spec, log_dir)
+        self.service = spec.service or spec.name
+        self.base = ["docker", "compose", "-f", compose_file, "--project-name", project]
+        self.follower: Optional[subprocess.Popen] = None
+
+    def start(self) -> None:
+        started_at = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+        subprocess.run(self.base + ["up", "-d", self.service], check=True, capture_output=True)
+        # One follower per start, so the log probe reads a file instead of asking docker every poll
+        with self.open_log() as log:
+            self.follower = subprocess.Popen(self.base + ["logs", "--follow", "--no-color", "--since", started_at,
+                                                          self.service], stdout=log, stderr=subprocess.STDOUT)
+
+    def alive(self) -> bool:
+        output = subprocess.run(self.base + ["ps", "--status", "running", "-q", self.service],
+                                capture_output=True, text=True)
+        return output.returncode == 0 and bool(output.stdout.strip())
+
+    def stop(self) -> None:
+        try:
+            subprocess.run(self.base + ["stop", "-t", str(int(self.spec.stop_timeout)), self.service],
+                           check=True, capture_output=True)
+        finally:
+            if self.follower is not None and self.follower.poll() is None:
+                self.follower.terminate()
+                self.follower.wait()
+
+
+def _environment(extra: Dict[str, str]) -> Optional[Dict[str, str]]:
+    if not extra:
+        return None
+    return {**os.environ, **{key: str(value) for key, value in extra.items()}}
+
+
+def probe_ready(handle: ModuleHandle) -> bool:
+    """Whether every configured probe passes; a module without probes is ready once started"""
+    ready = handle.spec.ready
+    if "port" in ready:
+        try:
+            with socket.create_connection((ready.get("host", "localhost"), int(ready["port"])), timeout=0.5):
+                pass
+        except OSError:
+            return False
+    if "file" in ready and not Path(ready["file"]).exists():
+        return False
+    if "log" in ready and not re.search(ready["log"], handle.log_text()):
+        return False
+    return True
+
+
+class ModuleLauncher:
+    def __init__(self, specs: List[ModuleSpec], log_dir: Path = Path("reports/modules"),
+                 compose_file: str = DOCKER_COMPOSE_PATH, project: str = PROJECT_NAME):
+        self.specs = {spec.name: spec for spec in specs}
+        self.log_dir = Path(log_dir)
+        self.compose_file = compose_file
+        self.project = project
+        self.running: Dict[str, ModuleHandle] = {}
+        self.launches: List[ModuleLaunch] = []
+
+    @classmethod
+    def from_config(cls, modules: List[Any], **kwargs) -> "ModuleLauncher":
+        specs = [ModuleSpec.from_config(module) for module in modules]
+        names = [spec.name for spec in specs]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate SUT modules: {', '.join(duplicates)}")
+        return cls(specs, **kwargs)
+
+    def _handle(self, spec: ModuleSpec) -> ModuleHandle:
+        if spec.backend == "process":
+            return ProcessModule(spec, self.log_dir)
+        return ComposeModule(spec, self.log_dir, self.compose_file, self.project)
+
+    def ensure(self, names: Optional[List[str]] = None) -> Dict[str, ModuleLaunch]:
+        """
+        Make the named modules (all by default) running and ready, in parallel.
+        Healthy running modules are reused; modules with reuse: false and dead
+        ones are (re)started. Raises ModuleLaunchError naming every module that
+        failed; the others are left running.
+        """
+        names = list(self.specs) if names is None else names
+        unknown = [name for name in names if name not in self.specs]
+        if unknown:
+            raise ModuleLaunchError(f"Unknown SUT modules: {', '.join(unknown)}")
+
+        launches: Dict[str, ModuleLaunch] = {}
+        pending = []
+        for name in names:
+            handle = self.running.get(name)
+            if handle is not None and self.specs[name].reuse and handle.alive():
+                launches[name] = ModuleLaunch(name, 0.0, reused=True)
+            else:
+                if handle is not None and not handle.alive():
+                    logger.warning(f"Module {name} is no longer running, restarting it")
+                pending.append(name)
+
+        if pending:
+            self.stop(pending)
+            with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="ModuleLauncher") as pool:
+                outcomes = list(pool.map(self._start, pending))
+            errors = []
+            for name, outcome in zip(pending, outcomes):
+                if isinstance(outcome, Exception):
+                    errors.append(str(outcome))
+                else:
+                    launches[name] = outcome
+            if errors:
+                raise ModuleLaunchError("; ".join(errors))
+
+        self.launches.extend(launches[name] for name in names)
+        return {name: launches[name] for name in names}
+
+    def _start(self, name: str):
+        """ModuleLaunch of a started, ready module, or the exception that prevented it"""
+        spec = self.specs[name]
+        handle = self._handle(spec)
+        if "file" in spec.ready:
+            Path(spec.ready["file"]).unlink(missing_ok=True)  # a file left by an earlier run proves nothing
+        poll_interval = spec.poll_interval or POLL_INTERVALS[spec.backend]
+        start = time.perf_counter()
+        try:
+            handle.start()
+            self.running[name] = handle
+            while not probe_ready(handle):
+                if not handle.alive():
+                    raise ModuleLaunchError(f"Module {name} exited before it was ready")
+                if time.perf_counter() - start > spec.ready_timeout:
+                    raise ModuleLaunchError(f"Module {name} not ready after {spec.ready_timeout:g}s")
+                time.sleep(poll_interval)
+        except Exception as e:
+            logger.error(f"Failed to launch module {name}: {e}")
+            self.running.pop(name, None)
+            _stop(handle)
+            return e
+        startup_s = time.perf_counter() - start
+        logger.info(f"Module {name} ready in {startup_s:.2f}s")
+        return ModuleLaunch(name, startup_s)
+
+    def release(self, names: List[str]) -> None:
+        """End of a scenario: stop the modules that are not reused"""
+        self.stop([name for name in names if not self.specs[name].reuse])
+
+    def stop(self, names: List[str]) -> None:
+        """Stop the named running modules in parallel"""
+        handles = [(name, self.running.pop(name)) for name in names if name in self.running]
+        if not handles:
+            return
+        with ThreadPoolExecutor(max_workers=len(handles), thread_name_prefix="ModuleLauncher") as pool:
+            for (name, _), error in zip(handles, pool.map(_stop, [handle for _, handle in handles])):
+                if error is not None:
+                    logger.error(f"Failed to stop module {name}: {error}")
+
+    def shutdown(self) -> None:
+        """Stop every running module"""
+        if self.running:
+            logger.info(f"Stopping SUT modules: {', '.join(self.running)}")
+        self.stop(list(self.running))
+
+    def startup_summary(self) -> Dict[str, Dict[str, float]]:
+        """Per module: cold starts, warm reuses and the mean/max startup seconds of the cold starts"""
+        summary: Dict[str, Dict[str, float]] = {}
+        for name in self.specs:
+            cold = [launch.startup_s for launch in self.launches if launch.name == name and not launch.reused]
+            reused = sum(1 for launch in self.launches if launch.name == name and launch.reused)
+            if cold or reused:
+                summary[name] = {
+                    "starts": len(cold),
+                    "reused": reused,
+                    "mean_startup_s": sum(cold) / len(cold) if cold else 0.0,
+                    "max_startup_s": max(cold, default=0.0),
+                }
+        return summary
+
+
+def _stop(handle: ModuleHandle) -> Optional[Exception]:
+    try:
+        handle.stop()
+        return None
+    except Exception as e:
+        return e
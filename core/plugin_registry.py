@@ -2,15 +2,53 @@
 
 """
 Plugin registry for dynamic plugin discovery and loading
+
+Discovery only parses plugin files (see scan_plugin_classes) and remembers the
+result per file in an index keyed on mtime and size, so startup does not import
+any plugin; a module is imported when a scenario first uses one of its plugins.
+
+Installed packages contribute plugins through entry points in the group
+'oltf.<phase>' (e.g. 'oltf.post_run'), named after the plugin:
+
+    [project.entry-points."oltf.post_run"]
+    LaneKeepingKPIPlugin = "acme_kpis.lane_keeping:LaneKeepingKPIPlugin"
+
+They are listed in a manifest cached until a sys.path directory changes (see
+entry_point_manifest) and imported on first use as well.
 """
 
+import ast
+import cProfile
+import dataclasses
+import hashlib
+import importlib
+import importlib.metadata
 import importlib.util
 import inspect
+import json
 import logging
+import multiprocessing.util
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Type
+from typing import Callable, Dict, Iterable, List, Any, Optional, Set, Tuple, Type
+
+from core.frame_reader import FrameReader
+from core.frame_store import atomic_write_json
+from core.isolated_pool import IsolatedWorkerPool, TaskOutcome
+from core.models import PluginPhase, PluginProfile, TestContext, PluginResult
+from core.profiling import ResourceProbe, profile_path
+from core.result_cache import AggregateCache, ResultCache, source_digest
+from core.sharded_reader import MergeUnavailable, shard_ranges
+
 
-from core.models import PluginPhase, TestContext, PluginResult
+DEFAULT_MIN_SHARD_BYTES = 64 * 1024 * 1024  # smaller recordings are not worth shipping to a worker per shard
+PLUGIN_INDEX_VERSION = 1
+ENTRY_POINT_MANIFEST_VERSION = 1
+FRAMEWORK_ROOT = Path(__file__).resolve().parents[1]
 
 
 class BasePlugin:
@@ -23,17 +61,44 @@ class BasePlugin:
     def validate_config(self, config: Dict[str, Any]) -> bool:
         return True
 
+    def setup(self) -> None:
+        """
+        Called once before the instance runs its first scenario. The registry keeps
+        instances per (plugin, config) for the whole run, so expensive per-config work
+        (lookup tables, calibration, ground-truth indexes) belongs here, not in execute().
+        """
+
+    def teardown(self) -> None:
+        """Called once at the end of the run (PluginRegistry.teardown_plugins)"""
+
     def execute(self, context: TestContext) -> PluginResult:
         raise NotImplementedError("Plugin must implement 'execute'")
 
+    def is_incremental(self) -> bool:
+        """Whether the plugin can be fed frames from a shared scan (see PostRunPlugin)"""
+        return False
+
+    def is_columnar(self) -> bool:
+        """Whether the plugin can be evaluated from a FrameStore (see PostRunPlugin)"""
+        return False
+
+    def is_shardable(self) -> bool:
+        """Whether shard partials of the plugin can be merged (see PostRunPlugin)"""
+        return False
+
+    def is_sweepable(self) -> bool:
+        """Whether merged partials can be judged against many thresholds at once (see PostRunPlugin)"""
+        return False
+
 
 class PluginInfo:
     """Information about a discovered plugin"""
 
-    def __init__(self, name: str, module_path: Path, phase: PluginPhase):
+    def __init__(self, name: str, module_path: Path, phase: PluginPhase, class_name: Optional[str] = None):
         self.name = name
         self.module_path = module_path
         self.phase = phase
+        self.class_name = class_name  # the class the registry knows this plugin by, if indexed
         self.module = None
         self.plugin_class: Optional[Type[BasePlugin]] = None
         self.functions = {}
@@ -60,10 +125,20 @@ class PluginInfo:
             return False
 
     def _discover_plugin_interface(self):
-        for name, obj in inspect.getmembers(self.module):
-            if inspect.isclass(obj) and issubclass(obj, BasePlugin) and obj != BasePlugin:
-                self.plugin_class = obj
-                return
+        indexed = getattr(self.module, self.class_name, None) if self.class_name else None
+        if inspect.isclass(indexed) and issubclass(indexed, BasePlugin):
+            self.plugin_class = indexed
+            return
+
+        candidates = [
+            obj for name, obj in inspect.getmembers(self.module)
+            if inspect.isclass(obj) and issubclass(obj, BasePlugin) and obj != BasePlugin
+        ]
+        # Prefer the class defined in this file over imported bases such as PostRunPlugin
+        own = [obj for obj in candidates if obj.__module__ == self.module.__name__]
+        if own or candidates:
+            self.plugin_class = (own or candidates)[0]
+            return
 
         # Optional legacy support for function-based plugins
         function_names = ['before_run', 'during_run', 'after_run']
@@ -71,29 +146,90 @@ class PluginInfo:
             if hasattr(self.module, func_name):
                 self.functions[func_name] = getattr(self.module, func_name)
 
+    def source_roots(self) -> List[Path]:
+        """Directories outside the plugins dir whose sources the plugin's cached results depend on"""
+        return []
+
+
+class EntryPointPluginInfo(PluginInfo):
+    """A plugin of an installed package, declared by an entry point value 'module:Class'"""
+
+    def __init__(self, name: str, value: str, phase: PluginPhase):
+        module_name, _, class_name = value.partition(':')
+        super().__init__(name=module_name, module_path=None, phase=phase, class_name=class_name.strip() or name)
+        self.value = value
+
+    def load(self) -> bool:
+        try:
+            self.module = importlib.import_module(self.name)
+            self._discover_plugin_interface()
+            self.loaded = True
+            return True
+        except Exception as e:
+            logging.error(f"Failed to load plugin {self.value}: {e}")
+            return False
+
+    def source_roots(self) -> List[Path]:
+        package = sys.modules.get(self.name.split('.')[0])
+        package_file = getattr(package, '__file__', None)
+        return [Path(package_file).resolve().parent] if package_file else []
+
 
 class PluginRegistry:
     """Manages plugin discovery, loading, and execution"""
 
-    def __init__(self, plugins_dir: Path = None):
+    def __init__(self, plugins_dir: Path = None, use_entry_points: bool = True):
         self.plugins_dir = plugins_dir or Path('./plugins')
         self.plugins: Dict[PluginPhase, Dict[str, PluginInfo]] = {
             phase: {} for phase in PluginPhase
         }
         self.logger = logging.getLogger('PluginRegistry')
+        self.use_entry_points = use_entry_points
+        self.manifest_path = default_manifest_path()  # entry point manifest cache
+        # Set-up instances not in use, per (phase, plugin name, config); see acquire_instance
+        self._instance_pool: Dict[Tuple[PluginPhase, str, str], List[BasePlugin]] = {}
+        self._pool_keys: Dict[int, Tuple[PluginPhase, str, str]] = {}
+        self._pool_lock = threading.Lock()
+        self._process_pool: Optional[IsolatedWorkerPool] = None  # started on first use, see _worker_pool
+        self.result_cache: Optional[ResultCache] = None  # set to reuse results of unchanged runs
+        self.aggregate_cache: Optional[AggregateCache] = None  # set to re-judge statistics of unchanged scans
+        self._source_digests: Dict[Tuple[PluginPhase, str], str] = {}
+        self.profile_dir: Optional[Path] = None  # set to write cProfile stats of every plugin execution
+
+    @property
+    def index_path(self) -> Path:
+        return self.plugins_dir / "__pycache__" / "plugin_index.json"
 
     def discover_plugins(self) -> None:
-        if not self.plugins_dir.exists():
-            self.logger.warning(f"Plugins directory not found: {self.plugins_dir}")
-            return
+        if self.plugins_dir.exists():
+            index = self._load_index()
+            files: Dict[str, Dict[str, Any]] = {}
+            for phase in PluginPhase:
+                phase_dir = self.plugins_dir / phase.value
+                if phase_dir.exists():
+                    self._discover_phase_plugins(phase, phase_dir, index, files)
 
-        for phase in PluginPhase:
-            phase_dir = self.plugins_dir / phase.value
-            if phase_dir.exists():
-                self._discover_phase_plugins(phase, phase_dir)
+            if files != index:
+                self._save_index(files)
+        else:
+            self.logger.warning(f"Plugins directory not found: {self.plugins_dir}")
 
+        if self.use_entry_points:
+            self._discover_entry_point_plugins()
         self.logger.info(f"Discovered {self.total_plugin_count()} plugins")
 
+    def _discover_entry_point_plugins(self) -> None:
+        """Register plugins of installed packages; files in plugins_dir take precedence"""
+        manifest = entry_point_manifest(self.manifest_path)
+        for phase in PluginPhase:
+            for plugin_name, value in manifest.get(phase.value, {}).items():
+                if plugin_name in self.plugins[phase]:
+                    self.logger.warning(f"Plugin {plugin_name} from entry point {value} is shadowed by "
+                                        f"{self.plugins[phase][plugin_name].module_path}")
+                    continue
+                self.plugins[phase][plugin_name] = EntryPointPluginInfo(plugin_name, value, phase)
+                self.logger.debug(f"Registered plugin: {plugin_name} ({phase}) from {value}")
+
     # def _discover_phase_plugins(self, phase: PluginPhase, phase_dir: Path) -> None:
     #     for py_file in phase_dir.glob('*.py'):
     #         if py_file.name.startswith('__'):
@@ -101,24 +237,56 @@ class PluginRegistry:
     #         plugin_name = py_file.stem
     #         plugin_info = PluginInfo(plugin_name, py_file, phase)
     #         self.plugins[phase][plugin_name] = plugin_info
-    def _discover_phase_plugins(self, phase: PluginPhase, phase_dir: Path) -> None:
-        for py_file in phase_dir.glob('*.py'):
+    def _discover_phase_plugins(self, phase: PluginPhase, phase_dir: Path,
+                                index: Dict[str, Dict[str, Any]], files: Dict[str, Dict[str, Any]]) -> None:
+        for py_file in sorted(phase_dir.glob('*.py')):
             if py_file.name.startswith('__'):
                 continue
 
-            plugin_info = PluginInfo(name=py_file.stem, module_path=py_file, phase=phase)
-
-            if not plugin_info.load():  # обязательно вызвать, чтобы получить класс
-                self.logger.warning(f"Could not load plugin from file: {py_file}")
+            key = f"{phase.value}/{py_file.name}"
+            entry = self._index_entry(py_file, index.get(key))
+            if entry is None:
+                self.logger.warning(f"Could not index plugin file: {py_file}")
                 continue
+            files[key] = entry
 
-            if plugin_info.plugin_class:
-                class_name = plugin_info.plugin_class.__name__  # ← например 'LatencyKPIPlugin'
-                self.plugins[phase][class_name] = plugin_info
+            if entry["classes"]:
+                class_name = entry["classes"][0]  # ← например 'LatencyKPIPlugin'
+                self.plugins[phase][class_name] = PluginInfo(
+                    name=py_file.stem, module_path=py_file, phase=phase, class_name=class_name)
                 self.logger.debug(f"Registered plugin: {class_name} ({phase})")
             else:
                 self.logger.warning(f"No plugin class found in: {py_file.name}")
 
+    def _index_entry(self, py_file: Path, cached: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Index entry of a plugin file, reusing the cached one while mtime and size are unchanged"""
+        try:
+            stat = py_file.stat()
+            if cached and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+                return cached
+            classes = scan_plugin_classes(py_file.read_text(encoding="utf-8"))
+        except (OSError, SyntaxError, ValueError) as e:
+            self.logger.debug(f"Cannot parse plugin file {py_file}: {e}")
+            return None
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "classes": classes}
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == PLUGIN_INDEX_VERSION:
+                return data["files"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def _save_index(self, files: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            atomic_write_json(self.index_path, {"version": PLUGIN_INDEX_VERSION, "files": files})
+        except OSError as e:
+            # A read-only plugins directory is simply indexed again next time
+            self.logger.debug(f"Could not write plugin index {self.index_path}: {e}")
+
     def load_plugins(self, plugin_names: List[str], phase: PluginPhase) -> List[BasePlugin]:
         instances = []
         for name in plugin_names:
@@ -145,18 +313,109 @@ class PluginRegistry:
     def get_plugin(self, phase: PluginPhase, plugin_name: str) -> Optional[PluginInfo]:
         return self.plugins[phase].get(plugin_name)
 
+    def get_plugin_class(self, phase: PluginPhase, plugin_name: str) -> Optional[Type[BasePlugin]]:
+        """Class of a plugin, importing its module on first use"""
+        plugin_info = self.get_plugin(phase, plugin_name)
+        if not plugin_info or (not plugin_info.loaded and not plugin_info.load()):
+            return None
+        return plugin_info.plugin_class
+
     def execute_plugin(self, phase: PluginPhase, plugin_name: str,
-                       context: TestContext,config: Dict[str, Any] = None) -> PluginResult:
+                       context: TestContext,config: Dict[str, Any] = None,
+                       isolation: Dict[str, Any] = None) -> PluginResult:
+        """
+        Run one plugin. isolation ({'timeout': seconds, 'max_rss_mb': N}) runs it in
+        a pooled worker process instead, see _execute_isolated.
+        """
+        plugin_configs = [{'name': plugin_name, 'config': config or {}}]
+        if isolation is not None:
+            return self._with_result_cache(
+                phase, context, plugin_configs,
+                lambda pending: self._execute_isolated(phase, context, pending, isolation)
+            )[0]
+        return self._with_result_cache(
+            phase, context, plugin_configs,
+            lambda _: [self._execute_plugin_uncached(phase, plugin_name, context, config)]
+        )[0]
+
+    def _execute_plugin_uncached(self, phase: PluginPhase, plugin_name: str,
+                                 context: TestContext, config: Dict[str, Any] = None) -> PluginResult:
+        instance, error = self.acquire_instance(phase, plugin_name, config)
+        if error:
+            return error
+        try:
+            return self._execute_instance(plugin_name, instance, context)
+        finally:
+            self.release_instances([instance])
+
+    def acquire_instance(self, phase: PluginPhase, plugin_name: str,
+                         config: Dict[str, Any] = None) -> Tuple[Optional[BasePlugin], Optional[PluginResult]]:
+        """
+        A set-up plugin instance for this config: an idle one from the pool, or a new
+        validated instance whose setup() has run. Returns (instance, None) or
+        (None, failed result); hand instances back with release_instances().
+        """
+        pool_key = _pool_key(phase, plugin_name, config or {})
+        if pool_key is not None:
+            with self._pool_lock:
+                idle = self._instance_pool.get(pool_key)
+                if idle:
+                    return idle.pop(), None
+
+        instance, error = self._create_instance(phase, plugin_name, config)
+        if error:
+            return None, error
+        try:
+            instance.setup()
+        except Exception as e:
+            self.logger.exception(f"Plugin {plugin_name} setup failed: {e}")
+            return None, PluginResult(
+                success=False,
+                message=f"Plugin setup failed: {str(e)}",
+                plugin_name=plugin_name,
+                error=True
+            )
+        if pool_key is not None:
+            with self._pool_lock:
+                self._pool_keys[id(instance)] = pool_key
+        return instance, None
+
+    def release_instances(self, instances: List[BasePlugin]) -> None:
+        """Return instances from acquire_instance() to the pool for the next scenario"""
+        with self._pool_lock:
+            for instance in instances:
+                pool_key = self._pool_keys.get(id(instance))
+                if pool_key is not None:
+                    self._instance_pool.setdefault(pool_key, []).append(instance)
+
+    def teardown_plugins(self) -> None:
+        """Call teardown() on every pooled instance, including those of worker processes, and empty the pool"""
+        with self._pool_lock:
+            instances = [instance for idle in self._instance_pool.values() for instance in idle]
+            self._instance_pool.clear()
+            self._pool_keys.clear()
+            process_pool, self._process_pool = self._process_pool, None
+        if process_pool is not None:
+            process_pool.shutdown()
+        for instance in instances:
+            try:
+                instance.teardown()
+            except Exception as e:
+                self.logger.error(f"Plugin {type(instance).__name__} teardown failed: {e}")
+
+    def _create_instance(self, phase: PluginPhase, plugin_name: str,
+                         config: Dict[str, Any] = None) -> Tuple[Optional[BasePlugin], Optional[PluginResult]]:
+        """Instantiate and validate a plugin; returns (instance, None) or (None, failed result)"""
         plugin_info = self.get_plugin(phase, plugin_name)
         if not plugin_info:
-            return PluginResult(
+            return None, PluginResult(
                 success=False,
                 message=f"Plugin not found: {plugin_name}",
                 plugin_name=plugin_name
             )
 
         if not plugin_info.loaded and not plugin_info.load():
-            return PluginResult(
+            return None, PluginResult(
                 success=False,
                 message=f"Failed to load plugin: {plugin_name}",
                 plugin_name=plugin_name
@@ -165,33 +424,745 @@ class PluginRegistry:
         try:
             instance = plugin_info.plugin_class(config or {})
             if not instance.validate_config(config or {}):
-                return PluginResult(
+                return None, PluginResult(
                     success=False,
                     message=f"Invalid config for plugin: {plugin_name}",
                     plugin_name=plugin_name
                 )
-
-            result = instance.execute(context)
-            result.plugin_name = plugin_name
-            return result
+            return instance, None
         except Exception as e:
             self.logger.exception(f"Plugin {plugin_name} execution failed: {e}")
-            return PluginResult(
+            return None, PluginResult(
                 success=False,
                 message=f"Exception in plugin: {str(e)}",
-                plugin_name=plugin_name
+                plugin_name=plugin_name,
+                error=True
             )
 
     # def execute_phase_plugins(self, phase: PluginPhase, context: TestContext,
     #                           plugin_configs: Dict[str, Dict[str, Any]] ) -> List[PluginResult]:
     def execute_phase_plugins(self, phase: PluginPhase, context: TestContext,
-                              plugin_configs) -> List[PluginResult]:
+                              plugin_configs, concurrency: Dict[str, Any] = None) -> List[PluginResult]:
+        """
+        Execute all plugins configured for a phase, keeping the configured order.
+
+        Incremental plugins share a single scan of context.data_path: every line
+        is decoded once and the frame is handed to each of them. With
+        context.use_frame_store, columnar plugins are served from the cached
+        FrameStore and skip the scan entirely. Other plugins run their own
+        execute().
+
+        concurrency ({'executor': 'thread' | 'process', 'max_workers': N}) opts
+        into running every plugin independently on a pool instead.
+        concurrency {'executor': 'isolated', 'timeout': seconds, 'max_rss_mb': N}
+        runs every plugin in a long-lived worker process that is killed and
+        replaced when the plugin exceeds either limit (see _execute_isolated).
+        concurrency {'shards': N} instead splits the shared scan of a large
+        recording across N worker processes (see _execute_sharded_scan).
+
+        With self.result_cache set, plugins whose source, config and recording
+        are unchanged since a previous run are answered from the cache. With
+        self.aggregate_cache set, a plugin whose config only changed in its
+        threshold_keys re-judges the cached partial() of its last scan.
+
+        With context.follow, the recording is still being written: the shared
+        scan tails it (see FrameReader), the other plugins run once it is
+        complete, and caches, the frame store and concurrency are not used.
+        """
+        return self._with_result_cache(
+            phase, context, plugin_configs,
+            lambda pending: self._execute_phase_plugins(phase, context, pending, concurrency)
+        )
+
+    def _execute_phase_plugins(self, phase: PluginPhase, context: TestContext,
+                               plugin_configs, concurrency: Dict[str, Any] = None) -> List[PluginResult]:
+        concurrency = concurrency or {}
+        if self.profile_dir is not None:
+            return self._execute_profiled(phase, context, plugin_configs)
+        if context.follow:
+            # A single tailing scan keeps up with the writer; a reader per plugin would not
+            return self._execute_in_process(phase, context, plugin_configs, {})
+        if concurrency.get('executor') == 'isolated':
+            return self._execute_isolated(phase, context, plugin_configs, concurrency)
+        max_workers = int(concurrency.get('max_workers', 1))
+        if max_workers > 1 and len(plugin_configs) > 1:
+            return self._execute_concurrently(phase, context, plugin_configs,
+                                              concurrency.get('executor', 'thread'), max_workers)
+        return self._execute_in_process(phase, context, plugin_configs, concurrency)
+
+    def _execute_profiled(self, phase: PluginPhase, context: TestContext, plugin_configs) -> List[PluginResult]:
+        """
+        Run the plugins one at a time in this process, each under its own cProfile
+        written to self.profile_dir (see core.profiling.profile_path). Every plugin
+        decodes the recording itself, so its stats include the loader's hot path;
+        concurrency settings are ignored.
+        """
         results = []
-        # for name, cfg in plugin_configs.items():
-        for plugin_config in plugin_configs:
-            result = self.execute_plugin(phase, plugin_config.get('name'), context, plugin_config.get('config', {}))
+        for position, plugin_config in enumerate(plugin_configs):
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                result, = self._execute_in_process(phase, context, [plugin_config], {})
+            finally:
+                profiler.disable()
+            path = profile_path(self.profile_dir, context.scenario_name, position, plugin_config.get('name'))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(path))
             results.append(result)
         return results
 
+    def _execute_in_process(self, phase: PluginPhase, context: TestContext,
+                            plugin_configs, concurrency: Dict[str, Any]) -> List[PluginResult]:
+        """Columnar, cached-aggregate, sharded or shared-scan execution in this process"""
+        acquired: List[BasePlugin] = []
+        try:
+            results: List[Optional[PluginResult]] = [None] * len(plugin_configs)
+            incremental = []
+            deferred = []  # plugins reading the whole recording wait until a followed one is complete
+            aggregate_keys: Dict[int, str] = {}
+            # for name, cfg in plugin_configs.items():
+            for index, plugin_config in enumerate(plugin_configs):
+                plugin_name = plugin_config.get('name')
+                instance, error = self.acquire_instance(phase, plugin_name, plugin_config.get('config', {}))
+                if error:
+                    results[index] = error
+                    continue
+                acquired.append(instance)
+                if instance.is_incremental():
+                    aggregate_key = self._aggregate_cache_key(phase, plugin_config, instance, context)
+                    result = self._judge_cached_aggregate(plugin_name, instance, aggregate_key, context) if aggregate_key else None
+                    if result is None and context.use_frame_store and instance.is_columnar() and not context.follow:
+                        probe = ResourceProbe()
+                        result = instance.execute_columns(context)
+                        if result is not None:
+                            result.plugin_name = plugin_name
+                            result.duration_ms = probe.wall_s() * 1000
+                            result.profile = probe.profile('columns')
+                    if result is None:
+                        incremental.append((index, plugin_name, instance))
+                        if aggregate_key:
+                            aggregate_keys[index] = aggregate_key
+                    else:
+                        results[index] = result
+                elif context.follow:
+                    deferred.append((index, plugin_name, instance))
+                else:
+                    results[index] = self._execute_instance(plugin_name, instance, context)
+
+            aggregates: Optional[Dict[int, Any]] = {} if aggregate_keys else None
+            shards = int(concurrency.get('shards', 1))
+            if incremental and shards > 1:
+                sharded, incremental = self._execute_sharded_scan(
+                    phase, context, incremental, shards, int(concurrency.get('min_shard_bytes', DEFAULT_MIN_SHARD_BYTES)),
+                    aggregates)
+                for index, result in sharded.items():
+                    results[index] = result
+            if incremental:
+                for index, result in self._execute_shared_scan(context, incremental, aggregates).items():
+                    results[index] = result
+            for index, plugin_name, instance in deferred:
+                results[index] = self._execute_instance(plugin_name, instance, context)
+
+            for index, aggregate in (aggregates or {}).items():
+                if index in aggregate_keys:
+                    self.aggregate_cache.put(aggregate_keys[index], aggregate)
+            return results
+        finally:
+            self.release_instances(acquired)
+
+    def collect_aggregates(self, phase: PluginPhase, context: TestContext, plugin_configs,
+                           concurrency: Dict[str, Any] = None) -> List[Optional[Any]]:
+        """
+        partial() of each plugin over the whole of context.data_path, in the configured
+        order; None for plugins that are not shardable or failed. Aggregates found in
+        self.aggregate_cache are reused, the others come from one (optionally sharded) scan.
+        """
+        concurrency = concurrency or {}
+        acquired: List[BasePlugin] = []
+        try:
+            aggregates: Dict[int, Any] = {}
+            aggregate_keys: Dict[int, str] = {}
+            pending = []
+            for index, plugin_config in enumerate(plugin_configs):
+                plugin_name = plugin_config.get('name')
+                instance, error = self.acquire_instance(phase, plugin_name, plugin_config.get('config', {}))
+                if error:
+                    continue
+                acquired.append(instance)
+                if not instance.is_shardable():
+                    continue
+                aggregate_key = self._aggregate_cache_key(phase, plugin_config, instance, context)
+                aggregate = self.aggregate_cache.get(aggregate_key) if aggregate_key else None
+                if aggregate is not None:
+                    aggregates[index] = aggregate
+                    continue
+                pending.append((index, plugin_name, instance))
+                if aggregate_key:
+                    aggregate_keys[index] = aggregate_key
+
+            shards = int(concurrency.get('shards', 1))
+            if pending and shards > 1:
+                _, pending = self._execute_sharded_scan(
+                    phase, context, pending, shards, int(concurrency.get('min_shard_bytes', DEFAULT_MIN_SHARD_BYTES)),
+                    aggregates)
+            if pending:
+                self._execute_shared_scan(context, pending, aggregates)
+
+            for index, aggregate_key in aggregate_keys.items():
+                if index in aggregates:
+                    self.aggregate_cache.put(aggregate_key, aggregates[index])
+            return [aggregates.get(index) for index in range(len(plugin_configs))]
+        finally:
+            self.release_instances(acquired)
+
+    def _execute_concurrently(self, phase: PluginPhase, context: TestContext, plugin_configs,
+                              executor: str, max_workers: int) -> List[PluginResult]:
+        """
+        Run each plugin on its own pool task; results keep the configured order.
+        Process tasks run on the run's worker processes (see _worker_pool), so their
+        pooled instances are set up once per worker rather than once per scenario.
+        """
+        if executor == 'process':
+            tasks = [(_execute_plugin_in_worker, (phase, plugin_config.get('name'), context,
+                                                  plugin_config.get('config', {})))
+                     for plugin_config in plugin_configs]
+            outcomes = _run_tasks(self._worker_pool(max_workers), tasks, max_workers)
+            return [self._worker_result(plugin_config.get('name'), outcome, None, None)
+                    for plugin_config, outcome in zip(plugin_configs, outcomes)]
+        if executor != 'thread':
+            raise ValueError(f"Unknown plugin executor: {executor}")
+
+        results = []
+        threads = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                threads.submit(self._execute_plugin_uncached, phase, plugin_config.get('name'), context,
+                               plugin_config.get('config', {}))
+                for plugin_config in plugin_configs
+            ]
+            for plugin_config, future in zip(plugin_configs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    self.logger.error(f"Plugin {plugin_config.get('name')} failed in thread pool: {e}")
+                    results.append(PluginResult(
+                        success=False,
+                        message=f"Exception in plugin: {str(e)}",
+                        plugin_name=plugin_config.get('name'),
+                        error=True
+                    ))
+        except BaseException:
+            # e.g. the scenario deadline: leave a runaway plugin thread behind instead of joining it
+            threads.shutdown(wait=False, cancel_futures=True)
+            raise
+        threads.shutdown()
+        return results
+
+    def _worker_pool(self, max_workers: int) -> IsolatedWorkerPool:
+        """
+        The run's plugin worker processes, restarted with more workers if fewer than
+        max_workers. Isolated plugins, the process executor and sharded scans share
+        them; each worker keeps its registry and set-up instances until teardown_plugins().
+        """
+        with self._pool_lock:
+            if self._process_pool is None or self._process_pool.max_workers < max_workers:
+                previous = self._process_pool
+                self._process_pool = IsolatedWorkerPool(max_workers, initializer=_init_plugin_worker,
+                                                        initargs=(self.plugins_dir,))
+            else:
+                previous = None
+            pool = self._process_pool
+        if previous is not None:
+            previous.shutdown()
+        return pool
+
+    def _execute_isolated(self, phase: PluginPhase, context: TestContext, plugin_configs,
+                          isolation: Dict[str, Any]) -> List[PluginResult]:
+        """
+        Run each plugin in a worker process of the run's pool (see _worker_pool). A plugin running longer than isolation['timeout'] seconds or
+        whose worker's RSS grows beyond isolation['max_rss_mb'] gets its worker
+        killed and a failed result with the measured time and memory in
+        metrics['isolation']; the next plugin gets a fresh worker, the other
+        workers keep their warm registries.
+        """
+        max_workers = int(isolation.get('max_workers', 1))
+        timeout = float(isolation['timeout']) if isolation.get('timeout') else None
+        max_rss_mb = float(isolation['max_rss_mb']) if isolation.get('max_rss_mb') else None
+        tasks = [(_execute_plugin_in_worker, (phase, plugin_config.get('name'), context,
+                                              plugin_config.get('config', {})))
+                 for plugin_config in plugin_configs]
+        outcomes = _run_tasks(self._worker_pool(max_workers), tasks, max_workers, timeout=timeout,
+                              max_rss_bytes=None if max_rss_mb is None else int(max_rss_mb * 1024 * 1024))
+        return [self._worker_result(plugin_config.get('name'), outcome, timeout, max_rss_mb)
+                for plugin_config, outcome in zip(plugin_configs, outcomes)]
+
+    def _worker_result(self, plugin_name: str, outcome: TaskOutcome, timeout: Optional[float],
+                       max_rss_mb: Optional[float]) -> PluginResult:
+        if outcome.status == 'ok':
+            return outcome.value
+        if outcome.status == 'error':
+            message = f"Exception in plugin: {outcome.value}"
+        elif outcome.status == 'timeout':
+            message = f"Plugin exceeded timeout of {timeout:g}s"
+        elif outcome.status == 'memory':
+            message = f"Plugin exceeded memory limit of {max_rss_mb:g} MB"
+        else:
+            message = f"Plugin worker crashed: {outcome.value}"
+        self.logger.error(f"Plugin {plugin_name} failed in worker process: {message}")
+        return PluginResult(
+            success=False,
+            message=message,
+            metrics={'isolation': {
+                'reason': outcome.status,
+                'elapsed_s': round(outcome.elapsed_s, 3),
+                'peak_rss_mb': round(outcome.peak_rss_bytes / (1024 * 1024), 1),
+                'timeout_s': timeout,
+                'max_rss_mb': max_rss_mb,
+            }},
+            duration_ms=outcome.elapsed_s * 1000,
+            plugin_name=plugin_name,
+            profile=PluginProfile(wall_ms=outcome.elapsed_s * 1000, mode='isolated'),
+            error=True
+        )
+
+    def _with_result_cache(self, phase: PluginPhase, context: TestContext, plugin_configs,
+                           execute: Callable[[List[Dict[str, Any]]], List[PluginResult]]) -> List[PluginResult]:
+        """Answer plugin_configs from self.result_cache where possible; execute() runs the rest"""
+        if self.result_cache is None or context.follow:
+            return execute(plugin_configs)
+
+        keys = [self._result_cache_key(phase, plugin_config, context) for plugin_config in plugin_configs]
+        results: List[Optional[PluginResult]] = []
+        for plugin_config, key in zip(plugin_configs, keys):
+            probe = ResourceProbe()
+            result = self.result_cache.get(key) if key else None
+            if result is not None:
+                self.logger.debug(f"Cached result for {plugin_config.get('name')} on {context.scenario_name}")
+                result.duration_ms = probe.wall_s() * 1000
+                result.profile = probe.profile('result_cache', frames=0)
+            results.append(result)
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            fresh = execute([plugin_configs[index] for index in pending])
+            for index, result in zip(pending, fresh):
+                results[index] = result
+                # A failed I/O, import or worker, or a breached isolation limit, says nothing
+                # about the inputs; the next run tries again instead of replaying the error
+                if keys[index] and not result.error:
+                    self.result_cache.put(keys[index], result)
+        return results
+
+    def _result_cache_key(self, phase: PluginPhase, plugin_config: Dict[str, Any],
+                          context: TestContext) -> Optional[str]:
+        """Key of (plugin source, plugin config, recording content), or None if it cannot be cached"""
+        return self._cache_key(self.result_cache, phase, plugin_config.get('name'),
+                               plugin_config.get('config') or {}, context)
+
+    def _aggregate_cache_key(self, phase: PluginPhase, plugin_config: Dict[str, Any], instance: BasePlugin,
+                             context: TestContext) -> Optional[str]:
+        """Like _result_cache_key, without the plugin's threshold_keys in the config"""
+        if self.aggregate_cache is None or not instance.is_shardable() or context.follow:
+            return None
+        config = {
+            key: value for key, value in (plugin_config.get('config') or {}).items()
+            if key not in instance.threshold_keys
+        }
+        return self._cache_key(self.aggregate_cache, phase, plugin_config.get('name'), config, context)
+
+    def _judge_cached_aggregate(self, plugin_name: str, instance: BasePlugin, key: str,
+                                context: TestContext) -> Optional[PluginResult]:
+        """Apply this instance's thresholds to a cached aggregate; None on a cache miss"""
+        probe = ResourceProbe()
+        aggregate = self.aggregate_cache.get(key)
+        if aggregate is None:
+            return None
+
+        self.logger.debug(f"Judging cached aggregate of {plugin_name} on {context.scenario_name}")
+        try:
+            instance.begin(context)
+            instance.merge(aggregate)
+            result = instance.finalize(context)
+        except Exception as e:
+            result = PluginResult(success=False, message=str(e), error=True)
+        result.plugin_name = plugin_name
+        result.duration_ms = probe.wall_s() * 1000
+        result.profile = probe.profile('aggregate_cache', frames=0)
+        return result
+
+    def _cache_key(self, cache: ResultCache, phase: PluginPhase, plugin_name: str, config: Dict[str, Any],
+                   context: TestContext) -> Optional[str]:
+        plugin_info = self.get_plugin(phase, plugin_name)
+        if not plugin_info or (not plugin_info.loaded and not plugin_info.load()) or plugin_info.module is None:
+            return None
+
+        try:
+            if (phase, plugin_name) not in self._source_digests:
+                self._source_digests[(phase, plugin_name)] = source_digest(
+                    [plugin_info.module], [self.plugins_dir, FRAMEWORK_ROOT, *plugin_info.source_roots()])
+            return cache.key(f"{phase.value}.{plugin_name}", self._source_digests[(phase, plugin_name)],
+                             config, context.data_path)
+        except OSError as e:
+            self.logger.debug(f"Not caching {plugin_name} on {context.data_path}: {e}")
+            return None
+
+    def _execute_instance(self, plugin_name: str, instance: BasePlugin, context: TestContext) -> PluginResult:
+        probe = ResourceProbe()
+        try:
+            result = instance.execute(context)
+            result.plugin_name = plugin_name
+        except Exception as e:
+            self.logger.exception(f"Plugin {plugin_name} execution failed: {e}")
+            result = PluginResult(
+                success=False,
+                message=f"Exception in plugin: {str(e)}",
+                plugin_name=plugin_name,
+                error=True
+            )
+        result.duration_ms = probe.wall_s() * 1000
+        result.profile = probe.profile('execute')
+        return result
+
+    def _execute_shared_scan(self, context: TestContext, plugins: List[Tuple[int, str, BasePlugin]],
+                             aggregates: Optional[Dict[int, Any]] = None) -> Dict[int, PluginResult]:
+        """
+        Decode context.data_path once and stream every frame to all incremental plugins.
+        Each plugin's duration_ms covers its own begin/on_frame/finalize calls only,
+        so the shared decode cost is not attributed to any single KPI.
+        With aggregates, the partial() of every shardable plugin that consumed the
+        whole recording is stored there before finalize().
+        """
+        results: Dict[int, PluginResult] = {}
+        elapsed: Dict[int, float] = {}
+        probe = ResourceProbe()
+        active = _begin_plugins(context, plugins, results, elapsed)
+
+        reader = None
+        try:
+            fields = required_fields(instance for _, _, instance in active)
+            reader = FrameReader(context.data_path, fields=fields, backend=context.json_backend, follow=context.follow)
+            active = _feed_frames(reader, active, results, elapsed)
+        except Exception as e:
+            # The recording itself could not be read - every plugin still scanning fails
+            for index, plugin_name, _ in active:
+                results[index] = PluginResult(success=False, message=str(e), plugin_name=plugin_name, error=True)
+            active = []
+
+        for index, plugin_name, instance in active:
+            start = time.perf_counter()
+            if aggregates is not None:
+                _collect_aggregate(instance, index, aggregates)
+            try:
+                result = instance.finalize(context)
+            except Exception as e:
+                result = PluginResult(success=False, message=str(e), error=True)
+            result.plugin_name = plugin_name
+            results[index] = result
+            elapsed[index] += time.perf_counter() - start
+
+        scan = probe.profile('scan', frames=reader.frames_read if reader else 0,
+                             read=reader.bytes_read if reader else 0)
+        utilization = scan.cpu_ms / scan.wall_ms if scan.wall_ms else 1.0
+        for index, result in results.items():
+            result.duration_ms = elapsed[index] * 1000
+            result.profile = dataclasses.replace(scan, wall_ms=result.duration_ms,
+                                                 cpu_ms=result.duration_ms * utilization)
+        return results
+
+    def _execute_sharded_scan(self, phase: PluginPhase, context: TestContext,
+                              plugins: List[Tuple[int, str, BasePlugin]], shards: int, min_shard_bytes: int,
+                              aggregates: Optional[Dict[int, Any]] = None
+                              ) -> Tuple[Dict[int, PluginResult], List[Tuple[int, str, BasePlugin]]]:
+        """
+        Split context.data_path into newline-aligned byte ranges decoded by worker processes.
+        Every worker runs begin()/on_frame() of each shardable plugin over its range and
+        returns partial(); the partials are merged in file order here and finalized.
+
+        Returns (results, plugins left for the serial shared scan): plugins that cannot
+        be sharded and those whose partials raised MergeUnavailable.
+        """
+        shardable = [item for item in plugins if item[2].is_shardable()]
+        remaining = [item for item in plugins if not item[2].is_shardable()]
+        try:
+            ranges = shard_ranges(context.data_path, shards, min_shard_bytes)
+        except OSError:
+            return {}, plugins  # the serial scan reports the unreadable recording
+        if len(ranges) < 2 or not shardable:
+            return {}, plugins
+
+        plugin_configs = [(plugin_name, instance.config) for _, plugin_name, instance in shardable]
+        tasks = [(_scan_shard_in_worker, (phase, context, plugin_configs, byte_range)) for byte_range in ranges]
+        try:
+            # The run's worker processes scan the shards with their warm, already set-up instances
+            outcomes = _run_tasks(self._worker_pool(len(ranges)), tasks, len(ranges))
+            failed = next((outcome for outcome in outcomes if outcome.status != 'ok'), None)
+            if failed is not None:
+                raise RuntimeError(f"shard worker {failed.status}: {failed.value}")
+        except Exception as e:
+            self.logger.warning(f"Sharded scan of {context.data_path} failed, scanning serially: {e}")
+            return {}, plugins
+        shard_outcomes, shard_scans = zip(*(outcome.value for outcome in outcomes))
+
+        results: Dict[int, PluginResult] = {}
+        for position, (index, plugin_name, instance) in enumerate(shardable):
+            outcomes = [outcome[position] for outcome in shard_outcomes]
+            start = time.perf_counter()
+            try:
+                if any(kind == 'unmergeable' for kind, _, _ in outcomes):
+                    raise MergeUnavailable(next(value for kind, value, _ in outcomes if kind == 'unmergeable'))
+                failed = next((value for kind, value, _ in outcomes if kind == 'failed'), None)
+                if failed is not None:
+                    result = failed  # the first failure in file order, as a serial scan would report it
+                else:
+                    instance.begin(context)
+                    for _, partial, _ in outcomes:
+                        instance.merge(partial)
+                    if aggregates is not None:
+                        _collect_aggregate(instance, index, aggregates)
+                    result = instance.finalize(context)
+            except MergeUnavailable as e:
+                self.logger.info(f"Plugin {plugin_name} cannot merge shards of {context.data_path} ({e}), scanning serially")
+                remaining.append((index, plugin_name, instance))
+                continue
+            except Exception as e:
+                result = PluginResult(success=False, message=str(e), error=True)
+            result.plugin_name = plugin_name
+            merge_s = time.perf_counter() - start
+            result.duration_ms = (sum(seconds for _, _, seconds in outcomes) + merge_s) * 1000
+            # each shard's scan CPU is shared out like in _execute_shared_scan
+            cpu_s = merge_s + sum(seconds * (scan.cpu_ms / scan.wall_ms if scan.wall_ms else 1.0)
+                                  for (_, _, seconds), scan in zip(outcomes, shard_scans))
+            result.profile = PluginProfile(
+                wall_ms=result.duration_ms,
+                cpu_ms=cpu_s * 1000,
+                peak_rss_delta_mb=max(scan.peak_rss_delta_mb for scan in shard_scans),
+                frames=sum(scan.frames for scan in shard_scans),
+                bytes_read=sum(scan.bytes_read for scan in shard_scans),
+                mode='shards'
+            )
+            results[index] = result
+        return results, remaining
+
     def total_plugin_count(self) -> int:
         return sum(len(p) for p in self.plugins.values())
+
+
+def _pool_key(phase: PluginPhase, plugin_name: str, config: Dict[str, Any]) -> Optional[Tuple[PluginPhase, str, str]]:
+    """Instance pool key, or None for configs that cannot be compared reliably"""
+    try:
+        return phase, plugin_name, json.dumps(config, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+
+def default_manifest_path() -> Path:
+    """Per-interpreter manifest file under $XDG_CACHE_HOME (default ~/.cache)/oltf"""
+    cache_home = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    environment = hashlib.sha256(sys.prefix.encode()).hexdigest()[:16]
+    return cache_home / "oltf" / f"entry_points-{environment}.json"
+
+
+def entry_point_manifest(cache_path: Optional[Path]) -> Dict[str, Dict[str, str]]:
+    """
+    {phase: {plugin name: 'module:Class'}} of the 'oltf.<phase>' entry points of all
+    installed distributions. Listing them reads the metadata of every installed
+    package, so the result is cached in cache_path until the modification time of
+    a sys.path entry changes, which installing or removing a package does.
+    """
+    stamp = _sys_path_stamp()
+    if cache_path is not None:
+        try:
+            with open(cache_path, "r") as f:
+                cached = json.load(f)
+            if cached.get("version") == ENTRY_POINT_MANIFEST_VERSION and cached.get("stamp") == stamp:
+                return cached["plugins"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    plugins: Dict[str, Dict[str, str]] = {}
+    for phase in PluginPhase:
+        entry_points = importlib.metadata.entry_points(group=f"oltf.{phase.value}")
+        plugins[phase.value] = {entry_point.name: entry_point.value for entry_point in entry_points}
+
+    if cache_path is not None:
+        try:
+            atomic_write_json(cache_path, {"version": ENTRY_POINT_MANIFEST_VERSION, "stamp": stamp, "plugins": plugins})
+        except OSError as e:
+            logging.getLogger('PluginRegistry').debug(f"Could not write entry point manifest {cache_path}: {e}")
+    return plugins
+
+
+def _sys_path_stamp() -> List[List[Any]]:
+    stamp = []
+    for entry in sys.path:
+        try:
+            stamp.append([entry, os.stat(entry or ".").st_mtime_ns])
+        except OSError:
+            stamp.append([entry, None])
+    return stamp
+
+
+def scan_plugin_classes(source: str) -> List[str]:
+    """
+    Names of the top-level classes in a plugin module's source that derive from a
+    class named *Plugin (PostRunPlugin, LatencyKPIPlugin, ...) or from another
+    such class of the same module, sorted like inspect.getmembers() returns them.
+    """
+    plugin_classes: List[str] = []
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            base_name = base.attr if isinstance(base, ast.Attribute) else getattr(base, 'id', '')
+            if base_name.endswith('Plugin') or base_name in plugin_classes:
+                plugin_classes.append(node.name)
+                break
+    return sorted(plugin_classes)
+
+
+# Per-process registry of a plugin pool worker, built once by _init_plugin_worker
+_worker_registry: Optional[PluginRegistry] = None
+
+
+def _init_plugin_worker(plugins_dir: Path) -> None:
+    global _worker_registry
+    _worker_registry = PluginRegistry(plugins_dir)
+    _worker_registry.discover_plugins()
+    # Pool workers exit without running atexit hooks, but multiprocessing finalizers do run
+    multiprocessing.util.Finalize(_worker_registry, _worker_registry.teardown_plugins, exitpriority=10)
+
+
+def _run_tasks(pool: IsolatedWorkerPool, tasks: List[Tuple[Callable, Tuple]], max_workers: int,
+               timeout: Optional[float] = None, max_rss_bytes: Optional[int] = None) -> List[TaskOutcome]:
+    """
+    pool.run() each (fn, args) task, up to max_workers at once; outcomes keep the task order.
+    If the caller is interrupted meanwhile (e.g. by a scenario deadline), tasks not yet
+    started are dropped and the workers of running ones are killed instead of awaited.
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [pool.run(fn, *args, timeout=timeout, max_rss_bytes=max_rss_bytes) for fn, args in tasks]
+
+    cancel = threading.Event()
+    threads = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [threads.submit(pool.run, fn, *args, timeout=timeout, max_rss_bytes=max_rss_bytes, cancel=cancel)
+                   for fn, args in tasks]
+        return [future.result() for future in futures]
+    except BaseException:
+        cancel.set()
+        raise
+    finally:
+        threads.shutdown(wait=not cancel.is_set(), cancel_futures=True)
+
+
+def _execute_plugin_in_worker(phase: PluginPhase, plugin_name: str, context: TestContext,
+                              config: Dict[str, Any]) -> PluginResult:
+    return _worker_registry.execute_plugin(phase, plugin_name, context, config)
+
+
+def _scan_shard_in_worker(phase: PluginPhase, context: TestContext, plugin_configs: List[Tuple[str, Dict[str, Any]]],
+                          byte_range: Tuple[int, int]) -> Tuple[List[Tuple[str, Any, float]], PluginProfile]:
+    """
+    Feed one byte range of context.data_path to fresh plugin instances.
+    Returns one (kind, value, seconds) per plugin: ('partial', partial()),
+    ('failed', PluginResult) or ('unmergeable', reason), and the profile of the shard's scan.
+    """
+    plugins = []
+    results: Dict[int, PluginResult] = {}
+    elapsed: Dict[int, float] = {}
+    for index, (plugin_name, config) in enumerate(plugin_configs):
+        instance, error = _worker_registry.acquire_instance(phase, plugin_name, config)
+        if error:
+            results[index] = error
+            elapsed[index] = 0.0
+        else:
+            plugins.append((index, plugin_name, instance))
+
+    probe = ResourceProbe()
+    try:
+        active = _begin_plugins(context, plugins, results, elapsed)
+        fields = required_fields(instance for _, _, instance in active)
+        reader = FrameReader(context.data_path, *byte_range, fields=fields, backend=context.json_backend)
+        active = _feed_frames(reader, active, results, elapsed)
+
+        outcomes = []
+        for index in range(len(plugin_configs)):
+            if index in results:
+                outcomes.append(('failed', results[index], elapsed[index]))
+                continue
+            instance = next(item[2] for item in active if item[0] == index)
+            start = time.perf_counter()
+            try:
+                outcome = ('partial', instance.partial())
+            except MergeUnavailable as e:
+                outcome = ('unmergeable', str(e))
+            except Exception as e:
+                outcome = ('failed', PluginResult(success=False, message=str(e), error=True))
+            outcomes.append(outcome + (elapsed[index] + time.perf_counter() - start,))
+        return outcomes, probe.profile('shards', frames=reader.frames_read, read=reader.bytes_read)
+    finally:
+        _worker_registry.release_instances([instance for _, _, instance in plugins])
+
+
+def _begin_plugins(context: TestContext, plugins: List[Tuple[int, str, BasePlugin]],
+                   results: Dict[int, PluginResult], elapsed: Dict[int, float]) -> List[Tuple[int, str, BasePlugin]]:
+    """Call begin() on every plugin; returns those that did not fail"""
+    active = []
+    for index, plugin_name, instance in plugins:
+        start = time.perf_counter()
+        try:
+            instance.begin(context)
+            active.append((index, plugin_name, instance))
+        except Exception as e:
+            results[index] = PluginResult(success=False, message=str(e), plugin_name=plugin_name, error=True)
+        elapsed[index] = time.perf_counter() - start
+    return active
+
+
+def _collect_aggregate(instance: BasePlugin, index: int, aggregates: Dict[int, Any]) -> None:
+    """Store instance.partial() for the aggregate cache; plugins that cannot provide one are skipped"""
+    if not instance.is_shardable():
+        return
+    try:
+        aggregates[index] = instance.partial()
+    except Exception:
+        pass
+
+
+def required_fields(instances: Iterable[BasePlugin]) -> Optional[Set[str]]:
+    """Union of the fields the plugin instances read, or None when any of them needs whole frames"""
+    fields: Set[str] = set()
+    for instance in instances:
+        plugin_fields = instance.required_fields()
+        if plugin_fields is None:
+            return None
+        fields.update(plugin_fields)
+    return fields
+
+
+def _feed_frames(reader: FrameReader, active: List[Tuple[int, str, BasePlugin]],
+                 results: Dict[int, PluginResult], elapsed: Dict[int, float]) -> List[Tuple[int, str, BasePlugin]]:
+    """
+    Hand every frame of reader to the active plugins. A plugin that raises gets a
+    failed result and receives no further frames; returns the plugins still active.
+    """
+    for line, entry, error in reader:
+        failed = []
+        tick = time.perf_counter()
+        for item in active:
+            try:
+                if error is None:
+                    item[2].on_frame(entry)
+                else:
+                    item[2].on_malformed_line(line, error)
+            except Exception as e:
+                results[item[0]] = PluginResult(success=False, message=str(e), plugin_name=item[1], error=True)
+                failed.append(item)
+            now = time.perf_counter()
+            elapsed[item[0]] += now - tick
+            tick = now
+        if failed:
+            active = [item for item in active if item not in failed]
+            if not active:
+                break
+    return active
@@ -1,26 +1,141 @@
 # core/post_run_plugin.py
 
+from typing import Any, Dict, Optional, Set, Tuple
+
+from core.frame_reader import FrameReader
+from core.frame_store import ColumnUnavailable, FrameStore
+from core.models import PluginResult, TestContext
 from core.plugin_registry import BasePlugin
-from pathlib import Path
 
 
 class PostRunPlugin(BasePlugin):
     """
-    Base class for all post-run plugins that require scenario_path validation.
+    Base class for all post-run plugins.
+
+    Plugins that implement on_frame()/finalize() are incremental: the registry
+    decodes the recording once and streams every frame to all of them.
+    execute() still works standalone by running the same scan on its own.
     """
 
+    # Config keys that only affect how finalize() judges the consumed statistics
+    # (thresholds, which statistic to compare). Aggregates cached by the registry
+    # are shared across values of these keys; see core.result_cache.AggregateCache.
+    # The first entry is the numeric threshold, held in self.threshold after begin().
+    threshold_keys: Tuple[str, ...] = ()
+    # KPIThreshold operator finalize() applies between judged_statistic() and the threshold
+    threshold_operator: str = "lte"
+
     def __init__(self, config=None):
         super().__init__(config)
-    #     self.scenario_path: Path = None
-    #
-    # def validate_config(self, config):
-    #     required = ['scenario_path']
-    #     missing = [k for k in required if k not in config]
-    #     if missing:
-    #         raise ValueError(f"Missing required config: {', '.join(missing)}")
-    #
-    #     self.scenario_path = Path(self.config['scenario_path'])
-    #     if not self.scenario_path.exists():
-    #         raise FileNotFoundError(f"Data file not found: {self.scenario_path}")
-    #
-    #     return True
+
+    def begin(self, context: TestContext) -> None:
+        """Reset per-scenario state before the first frame"""
+
+    def required_fields(self) -> Optional[Set[str]]:
+        """
+        Dotted paths of the frame fields on_frame() reads (e.g. 'fused_objects.class'),
+        called after begin(). Decoders that parse lazily skip everything else;
+        None means the plugin needs complete frames.
+        """
+        return None
+
+    def on_frame(self, entry: Dict[str, Any]) -> None:
+        """Consume one decoded frame"""
+        raise NotImplementedError("Incremental plugin must implement 'on_frame'")
+
+    def on_malformed_line(self, line: bytes, error: ValueError) -> None:
+        """Handle a line that could not be decoded; fails the plugin by default"""
+        raise error
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        """Evaluate the KPI once all frames have been consumed"""
+        raise NotImplementedError("Incremental plugin must implement 'finalize'")
+
+    def evaluate_columns(self, store: FrameStore, context: TestContext) -> PluginResult:
+        """
+        Evaluate the KPI from the columnar frame store instead of a scan.
+        Called after begin(); raise ColumnUnavailable to fall back to scanning.
+        """
+        raise NotImplementedError("Columnar plugin must implement 'evaluate_columns'")
+
+    def partial(self) -> Any:
+        """
+        Picklable, threshold-independent state of everything consumed so far: one shard
+        of the recording (see core.sharded_reader) or, for the aggregate cache, all of it.
+        Raise MergeUnavailable when the state cannot be merged.
+        """
+        raise NotImplementedError("Shardable plugin must implement 'partial'")
+
+    def merge(self, partial: Any) -> None:
+        """
+        Fold the partial() of the next shard, in file order, into this instance.
+        Called after begin(); finalize() follows the last merge.
+        """
+        raise NotImplementedError("Shardable plugin must implement 'merge'")
+
+    def judged_statistic(self) -> Optional[Any]:
+        """
+        The value finalize() compares with the threshold, from the state built by
+        begin() and merge(); None when there is no data to judge. Threshold sweeps
+        check it against many thresholds at once (see core.threshold_sweep).
+        """
+        raise NotImplementedError("Sweepable plugin must implement 'judged_statistic'")
+
+    def is_incremental(self) -> bool:
+        return type(self).on_frame is not PostRunPlugin.on_frame
+
+    def is_shardable(self) -> bool:
+        return type(self).merge is not PostRunPlugin.merge
+
+    def is_columnar(self) -> bool:
+        return type(self).evaluate_columns is not PostRunPlugin.evaluate_columns
+
+    def is_sweepable(self) -> bool:
+        return self.is_shardable() and type(self).judged_statistic is not PostRunPlugin.judged_statistic
+
+    def execute_columns(self, context: TestContext) -> Optional[PluginResult]:
+        """
+        Run the plugin from context.get_frame_store().
+        Returns None when the store cannot reproduce a scan, e.g. the recording
+        has malformed lines this plugin would reject.
+        """
+        try:
+            store = context.get_frame_store()
+        except Exception as e:
+            context.logger.warning(f"Frame store unavailable for {context.data_path}: {e}")
+            return None
+
+        if store.non_object_frames:
+            return None
+        if store.malformed_lines and type(self).on_malformed_line is PostRunPlugin.on_malformed_line:
+            return None
+
+        try:
+            self.begin(context)
+            return self.evaluate_columns(store, context)
+        except ColumnUnavailable:
+            return None
+        except Exception as e:
+            return PluginResult(success=False, message=str(e), error=True)
+
+    def execute(self, context: TestContext) -> PluginResult:
+        if not self.is_incremental():
+            return super().execute(context)
+
+        if context.use_frame_store and self.is_columnar() and not context.follow:
+            result = self.execute_columns(context)
+            if result is not None:
+                return result
+
+        try:
+            self.begin(context)
+            reader = FrameReader(context.data_path, fields=self.required_fields(), backend=context.json_backend,
+                                 follow=context.follow)
+            for line, entry, error in reader:
+                if error is None:
+                    self.on_frame(entry)
+                else:
+                    self.on_malformed_line(line, error)
+            return self.finalize(context)
+        except Exception as e:
+            return PluginResult(success=False, message=str(e), error=True)
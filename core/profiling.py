@@ -0,0 +1,94 @@
+"""
+Profiling of plugin executions
+
+ResourceProbe measures wall time, CPU time, peak RSS growth and bytes read of a
+block of work; PluginRegistry attaches the result to every PluginResult as a
+PluginProfile. With PluginRegistry.profile_dir set (--profile), every plugin is
+additionally run under cProfile and its stats are written to
+<profile_dir>/<scenario>/<position>-<plugin>.pstats, e.g. for
+
+    python -m pstats reports/profiles/fused/0-LatencyKPIPlugin.pstats
+"""
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+from core.models import PluginProfile, PluginResult
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of this process's RSS (the current RSS where no peak is available)"""
+    if resource is None:
+        return psutil.Process().memory_info().rss
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def bytes_read() -> int:
+    """Bytes this process has read through read() calls so far, 0 where unsupported"""
+    try:
+        return psutil.Process().io_counters().read_chars
+    except (AttributeError, psutil.Error):
+        return 0
+
+
+class ResourceProbe:
+    """
+    Started on creation. CPU time is the calling thread's; peak RSS and bytes read
+    are process-wide, so they include other threads running at the same time.
+    """
+
+    def __init__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.peak_rss_start = peak_rss_bytes()
+        self.bytes_start = bytes_read()
+
+    def wall_s(self) -> float:
+        return time.perf_counter() - self.wall_start
+
+    def cpu_s(self) -> float:
+        return time.thread_time() - self.cpu_start
+
+    def peak_rss_delta_mb(self) -> float:
+        return (peak_rss_bytes() - self.peak_rss_start) / MB
+
+    def profile(self, mode: str, frames: Optional[int] = None, read: Optional[int] = None) -> PluginProfile:
+        """Profile of everything since creation; read defaults to the process's bytes read meanwhile"""
+        return PluginProfile(
+            wall_ms=self.wall_s() * 1000,
+            cpu_ms=self.cpu_s() * 1000,
+            peak_rss_delta_mb=self.peak_rss_delta_mb(),
+            frames=frames,
+            bytes_read=bytes_read() - self.bytes_start if read is None else read,
+            mode=mode
+        )
+
+
+def profile_path(profile_dir: Path, scenario_name: str, position: int, plugin_name: str) -> Path:
+    """Where the cProfile stats of the plugin at `position` in the scenario's plugin list go"""
+    safe_scenario = re.sub(r'[^\w.-]+', '_', scenario_name)
+    return Path(profile_dir) / safe_scenario / f"{position}-{plugin_name}.pstats"
+
+
+def slowest_cells(results: Dict[str, List[PluginResult]], top: int = 10) -> List[Tuple[str, PluginResult]]:
+    """The `top` (scenario name, result) pairs with the highest profiled wall time"""
+    cells = [
+        (scenario_name, result)
+        for scenario_name, scenario_results in results.items()
+        for result in scenario_results
+        if result.profile is not None
+    ]
+    cells.sort(key=lambda cell: cell[1].profile.wall_ms, reverse=True)
+    return cells[:top]
@@ -0,0 +1,173 @@
+"""
+Content-addressed cache of plugin results
+
+A result is keyed on the plugin's source code, its configuration and the
+content hash of the recording, so changing any of them is a cache miss while
+re-running an unchanged scenario/plugin/config combination is a file read.
+Entries are PluginResult.to_dict() JSON files under cache_dir/entries; when the
+entries outgrow max_bytes the least recently used ones are deleted.
+AggregateCache keeps the threshold-independent statistics behind those results.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, Optional
+
+from core.frame_store import atomic_write_json, content_digest
+from core.models import PluginResult
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+logger = logging.getLogger("ResultCache")
+
+
+class ResultCache:
+    """PluginResults on disk, looked up by key() and evicted least-recently-used by size"""
+
+    subdir = "entries"
+    suffix = ".json"
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @property
+    def entries_dir(self) -> Path:
+        return self.cache_dir / self.subdir
+
+    def key(self, plugin_name: str, source_digest: str, config: Dict[str, Any], data_path: Path) -> str:
+        """Cache key of a plugin run; raises OSError when the recording cannot be read"""
+        payload = json.dumps({
+            "version": CACHE_VERSION,
+            "plugin": plugin_name,
+            "source": source_digest,
+            "config": config,
+            "data": content_digest(data_path, self.cache_dir),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.entries_dir / f"{key}{self.suffix}"
+        try:
+            value = self._load(path)
+            _touch(path)
+        except (OSError, ValueError, TypeError, EOFError, pickle.UnpicklingError):
+            return None
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        path = self.entries_dir / f"{key}{self.suffix}"
+        try:
+            self._dump(path, value)
+            _touch(path)
+            self._evict()
+        except (OSError, TypeError, ValueError, AttributeError, pickle.PicklingError) as e:
+            # Values that cannot be serialized are simply not cached
+            logger.warning(f"Could not cache {self.subdir} {key}: {e}")
+
+    def _load(self, path: Path) -> PluginResult:
+        with open(path, "r") as f:
+            return PluginResult.from_dict(json.load(f))
+
+    def _dump(self, path: Path, result: PluginResult) -> None:
+        atomic_write_json(path, result.to_dict())
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.entries_dir):
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # removed by another worker
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+class AggregateCache(ResultCache):
+    """
+    Threshold-independent plugin aggregates (PostRunPlugin.partial() after a full scan),
+    pickled under cache_dir/aggregates. Keys leave out the plugin's threshold_keys, so a
+    threshold change re-judges the cached aggregate instead of scanning the recording.
+    """
+
+    subdir = "aggregates"
+    suffix = ".pkl"
+
+    def _load(self, path: Path) -> Any:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _dump(self, path: Path, aggregate: Any) -> None:
+        data = pickle.dumps(aggregate, protocol=pickle.HIGHEST_PROTOCOL)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _touch(path: Path) -> None:
+    # Explicit nanosecond stamp: filesystem mtimes can be too coarse to order recent uses
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+def source_digest(modules: Iterable[ModuleType], roots: Iterable[Path]) -> str:
+    """
+    sha256 of the source files of `modules` and, transitively, of every module under
+    `roots` they reference (imported modules, classes and functions), so editing a
+    plugin, its base classes or a core helper it uses invalidates its results.
+    """
+    roots = [Path(root).resolve() for root in roots]
+    files: Dict[str, Path] = {}
+    pending = list(modules)
+    seen = set()
+    while pending:
+        module = pending.pop()
+        if id(module) in seen:
+            continue
+        seen.add(id(module))
+
+        module_file = getattr(module, "__file__", None)
+        if not module_file:
+            continue
+        path = Path(module_file).resolve()
+        if not any(root in path.parents for root in roots):
+            continue
+        files[str(path)] = path
+
+        for value in list(vars(module).values()):
+            if isinstance(value, ModuleType):
+                pending.append(value)
+            elif isinstance(value, type) or callable(value):
+                referenced = sys.modules.get(getattr(value, "__module__", None) or "")
+                if referenced is not None:
+                    pending.append(referenced)
+
+    sha = hashlib.sha256()
+    for name in sorted(files):
+        sha.update(name.encode())
+        sha.update(files[name].read_bytes())
+    return sha.hexdigest()
@@ -0,0 +1,96 @@
+"""
+Durable log of a run's results, one JSON line per finished scenario
+
+Every line holds the scenario name, its plugin configuration, its recording
+with the recording's content digest, and the PluginResult.to_dict() of each
+plugin. A line is flushed and fsynced before the orchestrator moves on, so a
+crash loses at most the scenarios still running, and load() skips a line torn
+by the crash. A resumed run reuses the logged results of every scenario whose
+plugin configuration and recording are unchanged, unless one of them is an
+error (a timeout, crash or exception, see PluginResult.error).
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.frame_store import content_digest
+from core.models import PluginResult, ScenarioConfig
+
+logger = logging.getLogger("RunLog")
+
+
+def _jsonable(value: Any) -> Any:
+    """json.dumps fallback for NumPy values and other objects plugins may put in metrics"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class RunLog:
+    def __init__(self, path: Path, digest_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.digest_dir = Path(digest_dir) if digest_dir else self.path.parent  # see content_digest
+
+    def _digest(self, data_path: Path) -> Optional[str]:
+        try:
+            return content_digest(data_path, self.digest_dir)
+        except OSError:
+            return None
+
+    def reset(self) -> None:
+        """Start an empty log"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        open(self.path, "w").close()
+
+    def append(self, scenario: ScenarioConfig, results: List[PluginResult]) -> None:
+        record = {
+            "scenario": scenario.name,
+            "plugins": scenario.plugins,
+            "live": scenario.live,
+            "datapath": str(scenario.datapath),
+            "digest": self._digest(scenario.datapath),
+            "finished": time.time(),
+            "results": [result.to_dict() for result in results],
+        }
+        line = json.dumps(record, default=_jsonable)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Logged records by scenario name; a scenario logged twice keeps its last record"""
+        records = {}
+        try:
+            with open(self.path, "r") as f:
+                for number, line in enumerate(f, 1):
+                    try:
+                        record = json.loads(line)
+                        records[record["scenario"]] = record
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning(f"Skipping unreadable line {number} of {self.path}")
+        except FileNotFoundError:
+            pass
+        return records
+
+    def completed(self, scenarios: List[ScenarioConfig]) -> Dict[str, List[PluginResult]]:
+        """Logged results of the scenarios that finished without errors on the same plugins and recording"""
+        records = self.load()
+        completed = {}
+        for scenario in scenarios:
+            record = records.get(scenario.name)
+            # A round trip through JSON makes the configured plugins comparable with the logged ones
+            configured = json.loads(json.dumps([scenario.plugins, scenario.live], default=_jsonable))
+            if not record or [record["plugins"], record.get("live", {})] != configured:
+                continue
+            results = [PluginResult.from_dict(result) for result in record["results"]]
+            if any(result.error for result in results) or record.get("datapath") != str(scenario.datapath):
+                continue
+            digest = self._digest(scenario.datapath)
+            if digest is not None and record.get("digest") == digest:
+                completed[scenario.name] = results
+        return completed
@@ -0,0 +1,39 @@
+"""
+Byte-range sharding of JSONL recordings
+
+A large recording is split at newline-aligned byte offsets so that each shard
+can be decoded by its own worker process (FrameReader(path, start, end)).
+Plugins scan a shard from a fresh begin(), hand their partial() state back,
+and the registry merge()s the partials in file order before finalize().
+"""
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+
+class MergeUnavailable(Exception):
+    """Raised by partial()/merge() when shard results cannot reproduce a single scan"""
+
+
+def shard_ranges(data_path: Path, shards: int, min_shard_bytes: int = 1) -> List[Tuple[int, int]]:
+    """
+    Split data_path into at most `shards` (start, end) byte ranges of roughly equal size,
+    each at least min_shard_bytes long. Every boundary is moved forward to the start of
+    the next line, so each line belongs to exactly one range.
+    """
+    size = os.path.getsize(data_path)
+    shards = max(1, min(shards, size // max(min_shard_bytes, 1)))
+
+    boundaries = [0]
+    with open(data_path, 'rb') as f:
+        for i in range(1, shards):
+            offset = size * i // shards
+            if offset <= boundaries[-1]:
+                continue
+            f.seek(offset - 1)
+            f.readline()  # finish the line the nominal offset falls into
+            position = f.tell()
+            if boundaries[-1] < position < size:
+                boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
@@ -0,0 +1,268 @@
+"""
+Streaming statistics for KPI plugins
+
+Plugins feed values one at a time (or as NumPy batches from the frame store)
+and memory stays constant in the number of frames:
+
+    RunningStats       - count, exact left-to-right sum, Welford mean/variance, min, max
+    QuantileHistogram  - HDR-style log-linear histogram for p50/p95/p99 estimates
+    StreamingStats     - both of the above behind one update()/summary() interface,
+                         buffering single values and adding them in NumPy batches
+
+QuantileHistogram buckets a value by its binary exponent and the top
+`precision_bits` bits of its mantissa, so a quantile estimate is within
+2 ** -precision_bits (0.4% at the default 8 bits) of the true value, and the
+bucket of a value is the same whether it was added alone or in a batch.
+"""
+import math
+import re
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from core.kpi_arrays import array_max, sequential_sum, to_array
+
+Number = Union[int, float]
+
+_PERCENTILE = re.compile(r"^p(\d+(?:\.\d+)?)$")
+BUFFER_SIZE = 4096  # values StreamingStats.update() collects before one batch update
+
+
+class RunningStats:
+    """Count, sum, Welford mean/variance, min and max in O(1) memory"""
+
+    def __init__(self):
+        self.count = 0
+        self.total: Number = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[Number] = None
+        self.max: Optional[Number] = None
+
+    def update(self, value: Number) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def update_many(self, values: np.ndarray) -> None:
+        if not len(values):
+            return
+        self.total = sequential_sum(values, start=self.total)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._combine(len(values), batch_mean, batch_m2)
+
+        batch_max, batch_min = array_max(values), values.min().item()
+        if self.max is None or batch_max > self.max:
+            self.max = batch_max
+        if self.min is None or batch_min < self.min:
+            self.min = batch_min
+
+    def merge(self, other: "RunningStats") -> None:
+        if not other.count:
+            return
+        self.total += other.total
+        self._combine(other.count, other.mean, other.m2)
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        # Chan et al. parallel variance update
+        total_count = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total_count
+        self.m2 += m2 + delta * delta * self.count * count / total_count
+        self.count = total_count
+
+    @property
+    def average(self) -> float:
+        """total / count, identical to sum(values) / len(values)"""
+        return self.total / self.count
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileHistogram:
+    """HDR-style log-linear histogram with bounded relative error"""
+
+    def __init__(self, precision_bits: int = 8):
+        self.sub_buckets = 1 << precision_bits
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+
+    def _index(self, magnitude: float) -> int:
+        mantissa, exponent = math.frexp(magnitude)
+        return exponent * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+
+    def _value(self, index: int) -> float:
+        exponent, sub = divmod(index, self.sub_buckets)
+        return math.ldexp(0.5 + (sub + 0.5) / (2 * self.sub_buckets), exponent)
+
+    def update(self, value: Number) -> None:
+        if not math.isfinite(value):
+            return
+        self.count += 1
+        if value > 0:
+            index = self._index(value)
+            self.positive[index] = self.positive.get(index, 0) + 1
+        elif value < 0:
+            index = self._index(-value)
+            self.negative[index] = self.negative.get(index, 0) + 1
+        else:
+            self.zero += 1
+
+    def update_many(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        self.count += len(values)
+        self.zero += int(np.count_nonzero(values == 0))
+        for buckets, magnitudes in ((self.positive, values[values > 0]), (self.negative, -values[values < 0])):
+            if not len(magnitudes):
+                continue
+            mantissa, exponent = np.frexp(magnitudes)
+            indices = exponent.astype(np.int64) * self.sub_buckets + \
+                np.floor((mantissa - 0.5) * 2 * self.sub_buckets).astype(np.int64)
+            for index, count in zip(*np.unique(indices, return_counts=True)):
+                buckets[int(index)] = buckets.get(int(index), 0) + int(count)
+
+    def merge(self, other: "QuantileHistogram") -> None:
+        if other.sub_buckets != self.sub_buckets:
+            raise ValueError("Cannot merge histograms with different precision")
+        self.count += other.count
+        self.zero += other.zero
+        for buckets, other_buckets in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in other_buckets.items():
+                buckets[index] = buckets.get(index, 0) + count
+
+    def _ascending(self):
+        """(bucket value, count) from the smallest to the largest bucket"""
+        for index in sorted(self.negative, reverse=True):
+            yield -self._value(index), self.negative[index]
+        if self.zero:
+            yield 0.0, self.zero
+        for index in sorted(self.positive):
+            yield self._value(index), self.positive[index]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate of the q-quantile, q in [0, 1], interpolated between the values
+        at ranks floor and ceil of q * (count - 1) like np.percentile
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        below = math.floor(rank)
+        above = min(below + 1, self.count - 1)
+        lower = upper = None
+        seen = 0
+        for value, count in self._ascending():
+            seen += count
+            if lower is None and seen > below:
+                lower = value
+            if seen > above:
+                upper = value
+                break
+        return lower + (upper - lower) * (rank - below)
+
+
+class StreamingStats:
+    """
+    RunningStats and QuantileHistogram fed together. update() only appends to a
+    buffer of at most BUFFER_SIZE values, which is added with update_many() when
+    full or when the statistics are read, so per-frame updates cost a list append.
+    """
+
+    def __init__(self, precision_bits: int = 8):
+        self._running = RunningStats()
+        self._histogram = QuantileHistogram(precision_bits)
+        self._pending: List[Number] = []
+
+    def __getstate__(self):
+        # Partials and cached aggregates carry the statistics, never the buffer
+        self._flush()
+        return self.__dict__.copy()
+
+    def _flush(self) -> None:
+        if self._pending:
+            values, self._pending = to_array(self._pending), []
+            self._running.update_many(values)
+            self._histogram.update_many(values)
+
+    @property
+    def running(self) -> RunningStats:
+        self._flush()
+        return self._running
+
+    @property
+    def histogram(self) -> QuantileHistogram:
+        self._flush()
+        return self._histogram
+
+    def update(self, value: Number) -> None:
+        self._pending.append(value)
+        if len(self._pending) >= BUFFER_SIZE:
+            self._flush()
+
+    def update_many(self, values: np.ndarray) -> None:
+        self._flush()
+        self._running.update_many(values)
+        self._histogram.update_many(values)
+
+    def merge(self, other: "StreamingStats") -> None:
+        self.running.merge(other.running)
+        self.histogram.merge(other.histogram)
+
+    @property
+    def count(self) -> int:
+        return self._running.count + len(self._pending)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Histogram estimate clamped to the exact min/max; q = 0 and 1 are exact"""
+        if not self.running.count:
+            return None
+        if q <= 0:
+            return self.running.min
+        if q >= 1:
+            return self.running.max
+        return min(max(self.histogram.quantile(q), self.running.min), self.running.max)
+
+    def statistic(self, name: str) -> Number:
+        """Value of 'max', 'min', 'avg' or a percentile such as 'p95' / 'p99.9'"""
+        if name == "max":
+            return self.running.max
+        if name == "min":
+            return self.running.min
+        if name == "avg":
+            return self.running.average
+        match = _PERCENTILE.match(name)
+        if not match:
+            raise ValueError(f"Unknown statistic: {name}")
+        return self.quantile(float(match.group(1)) / 100)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "max": self.running.max,
+            "avg": self.running.average,
+            "min": self.running.min,
+            "std": self.running.std,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "count": self.running.count,
+        }
@@ -1,62 +1,451 @@
 import yaml
 import logging
+import multiprocessing.util
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
+from core.frame_reader import FollowMode
+from core.live_phase import run_live_phase
 from core.logger_manager import LoggerManager
+from core.module_launcher import ModuleLauncher, ModuleLaunchError
 from core.plugin_registry import PluginRegistry
-from core.models import TestConfiguration, TestContext, PluginResult, PluginPhase, ScenarioConfig
-from dashboards.report_generator import generate_html_report
+from core.result_cache import AggregateCache, ResultCache
+from core.run_log import RunLog
+from core.models import TestConfiguration, TestContext, PluginResult, PluginPhase, ScenarioConfig, SweepSurface
+from core.profiling import slowest_cells
+from core.threshold_sweep import sweep_scenario, validate_sweep
+from dashboards.report_generator import DashboardWriter
+
+# Stages of a pipelined run: SUT replay (modules and live phase), then the post-run plugins
+PIPELINE_STAGES = ("replay", "post_run")
+
+
+class ScenarioTimeout(BaseException):
+    """
+    Raised inside a scenario that exceeded scenario_timeout.
+    Derives from BaseException so plugins catching Exception cannot swallow it.
+    """
+
+
+@contextmanager
+def scenario_deadline(timeout: Optional[float]):
+    """Interrupt the enclosed block with ScenarioTimeout after `timeout` seconds (Unix main thread only)"""
+    if not timeout or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _on_alarm(signum, frame):
+        raise ScenarioTimeout()
+
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def failed_scenario_results(scenario: ScenarioConfig, message: str) -> List[PluginResult]:
+    """
+    One failed PluginResult per configured plugin, so the report keeps every cell.
+    They are errors: a resumed run executes the scenario again.
+    """
+    return [
+        PluginResult(success=False, message=message, plugin_name=plugin_config.get('name'), error=True)
+        for plugin_config in scenario.plugins
+    ]
+
+
+def scenario_context(config: TestConfiguration, scenario: ScenarioConfig, logger: logging.Logger) -> TestContext:
+    # New context contains just the scenario name and mode
+    return TestContext(
+        scenario_name=scenario.name,
+        data_path=scenario.datapath,
+        logger=logger,
+        mode=config.mode,
+        temp_dir=config.temp_dir,
+        use_frame_store=config.use_frame_store,
+        json_backend=config.json_backend,
+        follow=FollowMode.from_config(scenario.follow),
+    )
+
+
+@dataclass
+class ScenarioReplay:
+    """What the replay stage of a scenario hands to its post-run stage"""
+    live_results: List[PluginResult] = field(default_factory=list)
+    results: Optional[List[PluginResult]] = None  # final results when the scenario already ended (abort, timeout)
+    system_modules: List[str] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    elapsed_s: float = 0.0  # counted against scenario_timeout by the post-run stage
+
+
+def replay_scenario(registry: PluginRegistry, config: TestConfiguration, scenario: ScenarioConfig,
+                    logger: logging.Logger, launcher: Optional[ModuleLauncher] = None) -> ScenarioReplay:
+    """Replay stage: launch the SUT modules and run the live phase while the SUT writes the recording"""
+    logger.info(f"Running scenario: {scenario.name}")
+    context = scenario_context(config, scenario, logger)
+    replay = ScenarioReplay()
+    start = time.monotonic()
+
+    try:
+        with scenario_deadline(config.scenario_timeout):
+            # BEFORE RUN PHASE
+            pass
+            # Launch SUT modules
+            if launcher is not None:
+                launches = launcher.ensure(scenario.modules)
+                context.system_modules = list(launches)
+                context.add_metric("module_startup_s", {name: launch.startup_s for name, launch in launches.items()})
+            try:
+                # LIVE PHASE
+                if scenario.live:
+                    logger.info("Executing live plugins")
+                    live = run_live_phase(registry, context, scenario.live)
+                    replay.live_results = live.results
+                    if live.aborted:
+                        # A hard failure while the SUT runs makes the post-run KPIs moot
+                        replay.results = live.results + failed_scenario_results(
+                            scenario, f"Skipped: {live.abort_reason}")
+            finally:
+                # Stopping SUT modules; warm ones stay up for the next scenario
+                if launcher is not None:
+                    launcher.release(context.system_modules)
+    except ScenarioTimeout:
+        logger.error(f"Scenario {scenario.name} timed out after {config.scenario_timeout}s")
+        replay.results = failed_scenario_results(scenario, f"Scenario timed out after {config.scenario_timeout}s")
+    except ModuleLaunchError as e:
+        logger.error(f"Scenario {scenario.name} could not start its SUT modules: {e}")
+        replay.results = failed_scenario_results(scenario, f"SUT modules failed to start: {e}")
+
+    replay.system_modules = context.system_modules
+    replay.metrics = context.metrics
+    replay.elapsed_s = time.monotonic() - start
+    return replay
+
+
+def evaluate_scenario(registry: PluginRegistry, config: TestConfiguration, scenario: ScenarioConfig,
+                      logger: logging.Logger, replay: ScenarioReplay) -> List[PluginResult]:
+    """Post-run stage: evaluate the recorded scenario within what is left of scenario_timeout"""
+    if replay.results is not None:
+        return replay.results
+    context = scenario_context(config, scenario, logger)
+    context.system_modules = replay.system_modules
+    context.metrics.update(replay.metrics)
+    timeout = config.scenario_timeout
+
+    try:
+        if timeout and replay.elapsed_s >= timeout:
+            raise ScenarioTimeout()
+        with scenario_deadline(timeout - replay.elapsed_s if timeout else None):
+            # POST RUN PHASE
+            logger.info("Executing post_run plugins")
+            scenario_results = replay.live_results + registry.execute_phase_plugins(
+                PluginPhase.POST_RUN, context, scenario.plugins, scenario.concurrency
+            )
+    except ScenarioTimeout:
+        logger.error(f"Scenario {scenario.name} timed out after {timeout}s")
+        return failed_scenario_results(scenario, f"Scenario timed out after {timeout}s")
+
+    logger.info(f"Scenario {scenario.name} completed")
+    return scenario_results
+
+
+def execute_scenario(registry: PluginRegistry, config: TestConfiguration, scenario: ScenarioConfig,
+                     logger: logging.Logger, launcher: Optional[ModuleLauncher] = None) -> List[PluginResult]:
+    replay = replay_scenario(registry, config, scenario, logger, launcher)
+    return evaluate_scenario(registry, config, scenario, logger, replay)
+
+
+def pipeline_limits(pipeline: Dict[str, Any]) -> Dict[str, int]:
+    """Concurrency of each stage of the `pipeline` section; raises ValueError for unknown stages or bad limits"""
+    if not isinstance(pipeline, dict):
+        raise ValueError(f"Pipeline must map stages to concurrency limits: {pipeline}")
+    unknown = set(pipeline) - set(PIPELINE_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown pipeline stages: {', '.join(sorted(unknown))} "
+                         f"(expected {', '.join(PIPELINE_STAGES)})")
+    limits = {stage: pipeline.get(stage, 1) for stage in PIPELINE_STAGES}
+    for stage, limit in limits.items():
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError(f"Concurrency of pipeline stage {stage} must be a positive integer: {limit}")
+    return limits
+
+
+# Per-process registry of a scenario worker, built once by _init_worker
+_worker_registry: Optional[PluginRegistry] = None
+
+
+def _init_worker(plugins_dir: Path, result_cache: Optional[ResultCache],
+                 aggregate_cache: Optional[AggregateCache], profile_dir: Optional[Path] = None) -> None:
+    global _worker_registry
+    _worker_registry = PluginRegistry(plugins_dir)
+    _worker_registry.discover_plugins()
+    _worker_registry.result_cache = result_cache
+    _worker_registry.aggregate_cache = aggregate_cache
+    _worker_registry.profile_dir = profile_dir
+    # Plugin instances live as long as the worker; tear them down when it exits
+    multiprocessing.util.Finalize(_worker_registry, _worker_registry.teardown_plugins, exitpriority=10)
+
+
+def _execute_scenario_in_worker(config: TestConfiguration, scenario: ScenarioConfig) -> List[PluginResult]:
+    return execute_scenario(_worker_registry, config, scenario, LoggerManager.get_logger("TestOrchestrator"))
+
+
+def _evaluate_scenario_in_worker(config: TestConfiguration, scenario: ScenarioConfig,
+                                 replay: ScenarioReplay) -> List[PluginResult]:
+    return evaluate_scenario(_worker_registry, config, scenario, LoggerManager.get_logger("TestOrchestrator"), replay)
 
 
 class TestOrchestrator:
-    def __init__(self, config_path: str):
+    def __init__(self, config_path: str, workers: int = 1, plugins_dir: Path = None, use_cache: bool = True,
+                 profile: bool = False, resume: bool = False):
         with open(config_path, 'r') as f:
             raw_config = yaml.safe_load(f)
 
         self.config = TestConfiguration.from_dict(raw_config)
         self.logger = LoggerManager.get_logger("TestOrchestrator")
-        self.plugin_registry = PluginRegistry()
+        self.plugin_registry = PluginRegistry(plugins_dir)
         self.plugin_registry.discover_plugins()
+        if profile:
+            # Profiling needs the plugins to actually run, so the caches are skipped
+            self.plugin_registry.profile_dir = Path("reports/profiles")
+        elif use_cache:
+            cache_dir = self.config.temp_dir / "result_cache"
+            max_bytes = int(self.config.result_cache_size_mb * 1024 * 1024)
+            self.plugin_registry.result_cache = ResultCache(cache_dir, max_bytes)
+            self.plugin_registry.aggregate_cache = AggregateCache(cache_dir, max_bytes)
+        if self.config.sweep:
+            validate_sweep(self.plugin_registry, self.config.sweep)
+        for scenario in self.config.scenarios:
+            FollowMode.from_config(scenario.follow)  # raises ValueError for unknown settings
+        # Modules are started by the first scenario needing them and reused while healthy
+        self.launcher = ModuleLauncher.from_config(self.config.sut_modules) if self.config.sut_modules else None
+        # Scenario pipelining: the SUT replays the next scenarios while earlier ones are evaluated
+        self.pipeline = pipeline_limits(self.config.pipeline) if self.config.pipeline else None
+        self.workers = max(1, workers)
+        self.resume = resume
+        # Recording digests are shared with the result cache, so each recording is hashed once
+        self.run_log = RunLog(Path("reports/run_log.jsonl"), self.config.temp_dir / "result_cache")
+        self.output_path = Path("reports/dashboards/regression_dashboard.html")
         self.results = {}
+        self.sweeps: Dict[str, List[SweepSurface]] = {}
 
     def run(self):
         self.logger.info(f"Starting test: {self.config.name}")
+        dashboard = DashboardWriter(self.output_path, [scenario.name for scenario in self.config.scenarios])
+        completed: Dict[str, List[PluginResult]] = {}
+        if self.resume:
+            completed = self.run_log.completed(self.config.scenarios)
+            for scenario_name, results in completed.items():
+                self.logger.info(f"Resuming: scenario {scenario_name} already has results")
+                dashboard.add(scenario_name, results)
+        else:
+            self.run_log.reset()
+        pending = [scenario for scenario in self.config.scenarios if scenario.name not in completed]
+        last_write = None
+
+        def on_complete(scenario: ScenarioConfig, results: List[PluginResult]):
+            # Logged before anything else, so a crash right after still keeps this scenario
+            nonlocal last_write
+            self.run_log.append(scenario, results)
+            completed[scenario.name] = results
+            dashboard.add(scenario.name, results)
+            if last_write is None or time.monotonic() - last_write >= self.config.dashboard_interval:
+                dashboard.write()
+                last_write = time.monotonic()
+
+        try:
+            if self.pipeline is not None:
+                self._run_pipelined(pending, on_complete)
+            elif self.workers > 1 and len(pending) > 1 and self.launcher is None:
+                self._run_parallel(pending, on_complete)
+            else:
+                if self.workers > 1 and self.launcher is not None:
+                    self.logger.warning("Scenarios share the SUT modules, running them one at a time")
+                for scenario in pending:
+                    on_complete(scenario, execute_scenario(self.plugin_registry, self.config, scenario, self.logger,
+                                                           self.launcher))
+
+            # Results are stored in configuration order regardless of completion order
+            self.results = {scenario.name: completed[scenario.name] for scenario in self.config.scenarios}
+
+            self.logger.info("All test scenarios completed.")
+            self._log_slowest()
+            if self.config.sweep:
+                self._run_sweep()
+        finally:
+            if self.launcher is not None:
+                self.launcher.shutdown()
+                self._log_module_startup()
+            # setup() ran once per plugin config for the whole run; release what it loaded
+            self.plugin_registry.teardown_plugins()
+            dashboard.write(self.sweeps)
+
+    def _log_slowest(self, top: int = 5):
+        for scenario_name, result in slowest_cells(self.results, top):
+            profile = result.profile
+            self.logger.info(f"{profile.wall_ms:10.1f} ms wall {profile.cpu_ms:10.1f} ms CPU  "
+                             f"{scenario_name} / {result.plugin_name} ({profile.mode})")
+
+    def _log_module_startup(self):
+        for name, startup in self.launcher.startup_summary().items():
+            self.logger.info(f"Module {name}: {startup['starts']} starts (mean {startup['mean_startup_s']:.2f}s, "
+                             f"max {startup['max_startup_s']:.2f}s), reused {startup['reused']} times")
+
+    def _run_sweep(self):
+        # The scenario runs above stored every aggregate in the cache, so with the cache
+        # enabled the sweep only re-judges them; without it each scenario is scanned once more.
         for scenario in self.config.scenarios:
-            self.logger.info(f"Running scenario: {scenario.name}")
-
-            # New context contains just the scenario name and mode
-            context = TestContext(
-                scenario_name=scenario.name,
-                data_path=scenario.datapath,
-                logger=self.logger,
-                mode=self.config.mode,
-            )
+            self.logger.info(f"Sweeping thresholds of scenario: {scenario.name}")
+            context = scenario_context(self.config, scenario, self.logger)
+            context.follow = None  # the recording is complete by now
+            self.sweeps[scenario.name] = sweep_scenario(self.plugin_registry, context, scenario, self.config.sweep)
 
-            # BEFORE RUN PHASE
-            pass
-            # Launch SUT modules
-            pass
-            # LIVE PHASE
-            pass
-            # Stopping SUT modules
+    def _run_parallel(self, scenarios: List[ScenarioConfig],
+                      on_complete: Optional[Callable[[ScenarioConfig, List[PluginResult]], None]] = None
+                      ) -> List[List[PluginResult]]:
+        """Results in scenario order; on_complete(scenario, results) is called as each scenario finishes"""
+        self.logger.info(f"Running {len(scenarios)} scenarios on {self.workers} worker processes")
+        results: List[Optional[List[PluginResult]]] = [None] * len(scenarios)
+        crashed = []
+        on_complete = on_complete or (lambda scenario, scenario_results: None)
 
-            # POST RUN PHASE
-            self.logger.info("Executing post_run plugins")
-            scenario_results = self.plugin_registry.execute_phase_plugins(
-                PluginPhase.POST_RUN, context, scenario.plugins
-            )
+        with self._worker_pool(self.workers) as pool:
+            futures = {pool.submit(_execute_scenario_in_worker, self.config, scenario): index
+                       for index, scenario in enumerate(scenarios)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    crashed.append(index)
+                    continue
+                except Exception as e:
+                    self.logger.error(f"Scenario {scenarios[index].name} failed in worker: {e}")
+                    results[index] = failed_scenario_results(scenarios[index], f"Scenario worker failed: {e}")
+                on_complete(scenarios[index], results[index])
+
+        # A dying worker breaks the whole pool; retry the affected scenarios one by one
+        # so only the scenario that actually crashes is reported as failed.
+        for index in crashed:
+            with self._worker_pool(1) as pool:
+                try:
+                    results[index] = pool.submit(_execute_scenario_in_worker, self.config, scenarios[index]).result()
+                except Exception as e:
+                    self.logger.error(f"Scenario {scenarios[index].name} crashed its worker: {e}")
+                    results[index] = failed_scenario_results(scenarios[index], f"Scenario worker crashed: {e}")
+            on_complete(scenarios[index], results[index])
+
+        return results
 
-            self.results[scenario.name] = scenario_results
-            self.logger.info(f"Scenario {scenario.name} completed")
+    def _run_pipelined(self, scenarios: List[ScenarioConfig],
+                       on_complete: Callable[[ScenarioConfig, List[PluginResult]], None]) -> List[List[PluginResult]]:
+        """
+        Replay the next scenarios against the SUT while the post-run plugins of the
+        finished ones run on worker processes. Each stage runs at most its pipeline
+        limit of scenarios at once. Results are in scenario order and the same as
+        those of a serial run; on_complete(scenario, results) is called as each one finishes.
+        """
+        replay_limit, post_run_limit = self.pipeline["replay"], self.pipeline["post_run"]
+        if replay_limit > 1 and self.launcher is not None:
+            self.logger.warning("Scenarios share the SUT modules, replaying them one at a time")
+            replay_limit = 1
+        self.logger.info(f"Pipelining {len(scenarios)} scenarios: {replay_limit} replaying and "
+                         f"{post_run_limit} evaluating at once")
+        results: List[Optional[List[PluginResult]]] = [None] * len(scenarios)
+        replays: Dict[int, ScenarioReplay] = {}
+        evaluations = {}
+        crashed = []
 
-        self.logger.info("All test scenarios completed.")
-        output_path = Path("reports/dashboards/regression_dashboard.html")
-        generate_html_report(self.results, output_path)
+        def finish(index: int, scenario_results: List[PluginResult]):
+            results[index] = scenario_results
+            on_complete(scenarios[index], scenario_results)
+
+        def collect(timeout: Optional[float] = 0):
+            """Finish the evaluations done within timeout (None: wait for all of them)"""
+            done, _ = wait(list(evaluations), timeout=timeout)
+            for future in done:
+                index = evaluations.pop(future)
+                try:
+                    finish(index, future.result())
+                except BrokenProcessPool:
+                    crashed.append(index)
+                except Exception as e:
+                    self.logger.error(f"Scenario {scenarios[index].name} failed in worker: {e}")
+                    finish(index, failed_scenario_results(scenarios[index], f"Scenario worker failed: {e}"))
+
+        def evaluate(pool: ProcessPoolExecutor, index: int, replay: ScenarioReplay):
+            replays[index] = replay
+            if replay.results is not None:
+                finish(index, replay.results)  # aborted or timed out while replaying
+            else:
+                try:
+                    evaluations[pool.submit(_evaluate_scenario_in_worker, self.config, scenarios[index], replay)] = index
+                except BrokenProcessPool:
+                    crashed.append(index)
+            collect()
+
+        with self._worker_pool(post_run_limit) as pool:
+            if replay_limit == 1:
+                # Replaying on the main thread keeps scenario_timeout in force during the replay
+                for index, scenario in enumerate(scenarios):
+                    evaluate(pool, index, replay_scenario(self.plugin_registry, self.config, scenario, self.logger,
+                                                          self.launcher))
+            else:
+                with ThreadPoolExecutor(max_workers=replay_limit, thread_name_prefix="Replay") as replayers:
+                    futures = {replayers.submit(replay_scenario, self.plugin_registry, self.config, scenario,
+                                                self.logger, self.launcher): index
+                               for index, scenario in enumerate(scenarios)}
+                    for future in as_completed(futures):
+                        evaluate(pool, futures[future], future.result())
+            collect(None)
+
+        # As in _run_parallel, the evaluations lost with a broken pool are retried one by one
+        for index in crashed:
+            with self._worker_pool(1) as pool:
+                try:
+                    scenario_results = pool.submit(_evaluate_scenario_in_worker, self.config, scenarios[index],
+                                                   replays[index]).result()
+                except Exception as e:
+                    self.logger.error(f"Scenario {scenarios[index].name} crashed its worker: {e}")
+                    scenario_results = failed_scenario_results(scenarios[index], f"Scenario worker crashed: {e}")
+            finish(index, scenario_results)
+
+        return results
+
+    def _worker_pool(self, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.plugin_registry.plugins_dir, self.plugin_registry.result_cache,
+                      self.plugin_registry.aggregate_cache, self.plugin_registry.profile_dir),
+        )
 
 
 if __name__ == "__main__":
-    import sys
-    config_path = sys.argv[1] if len(sys.argv) > 1 else "configs/regression.yaml"
-    config_path = Path(config_path).resolve()
-    orchestrator = TestOrchestrator(str(config_path))
+    import argparse
+    parser = argparse.ArgumentParser(description="Open Loop Testing Framework")
+    parser.add_argument("config", nargs="?", default="configs/regression.yaml",
+                        help="Path to regression YAML configuration")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes running scenarios in parallel")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute every plugin result instead of reusing cached ones")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run every plugin under cProfile and write its stats to reports/profiles")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip scenarios that already have results in reports/run_log.jsonl")
+    args = parser.parse_args()
+
+    config_path = Path(args.config).resolve()
+    orchestrator = TestOrchestrator(str(config_path), workers=args.workers, use_cache=not args.no_cache,
+                                    profile=args.profile, resume=args.resume)
     orchestrator.run()
@@ -0,0 +1,117 @@
+"""
+Threshold sweeps: pass/fail of each KPI over ranges of its thresholds
+
+The `sweep` section of the test YAML lists values for judge-only config keys
+(a plugin's threshold_keys), as a list or as an inclusive start/stop/step range:
+
+    sweep:
+      LatencyKPIPlugin:
+        latency_threshold: {start: 20, stop: 80, step: 5}
+        latency_statistic: [max, p95]
+      DecisionConsistencyScorePlugin:
+        consistency_threshold: [0.8, 0.9, 0.95]
+
+Every scenario running a swept plugin computes the plugin's aggregate (its
+partial() over the recording) once, or takes it from the aggregate cache. Each
+combination of the other swept keys re-judges that aggregate, and all values of
+the threshold itself (threshold_keys[0]) are checked in one vectorized
+KPIThreshold.check, so a sweep costs about as much as a single run.
+"""
+import itertools
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+
+from core.models import KPIThreshold, PluginPhase, ScenarioConfig, SweepSurface, TestContext
+from core.plugin_registry import PluginRegistry
+
+
+def sweep_values(spec: Any) -> List[Any]:
+    """Values of one swept key: a list, a {start, stop, step} range including stop, or a single value"""
+    if isinstance(spec, dict):
+        try:
+            start, stop, step = spec["start"], spec["stop"], spec["step"]
+        except KeyError as e:
+            raise ValueError(f"Sweep range needs start, stop and step: {spec}") from e
+        if step <= 0 or stop < start:
+            raise ValueError(f"Invalid sweep range: {spec}")
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        # Rounding keeps 0.1 + 2 * 0.05 from showing up as 0.20000000000000004
+        return [round(start + i * step, 12) for i in range(count)]
+    if isinstance(spec, (list, tuple)):
+        return list(spec)
+    return [spec]
+
+
+def validate_sweep(registry: PluginRegistry, sweep: Dict[str, Dict[str, Any]],
+                   phase: PluginPhase = PluginPhase.POST_RUN) -> None:
+    """Raise ValueError for unknown or non-sweepable plugins and keys that are not threshold_keys"""
+    for plugin_name, grid in sweep.items():
+        plugin_class = registry.get_plugin_class(phase, plugin_name)
+        if plugin_class is None:
+            raise ValueError(f"Unknown plugin in sweep: {plugin_name}")
+        if not plugin_class().is_sweepable():
+            raise ValueError(f"Plugin cannot be swept: {plugin_name}")
+        for key, spec in (grid or {}).items():
+            if key not in plugin_class.threshold_keys:
+                raise ValueError(f"Cannot sweep {plugin_name}.{key}: sweepable keys are "
+                                 f"{', '.join(plugin_class.threshold_keys)}")
+            if not sweep_values(spec):
+                raise ValueError(f"Empty sweep for {plugin_name}.{key}")
+
+
+def sweep_scenario(registry: PluginRegistry, context: TestContext, scenario: ScenarioConfig,
+                   sweep: Dict[str, Dict[str, Any]]) -> List[SweepSurface]:
+    """Surfaces of every swept plugin of the scenario, in the configured plugin order"""
+    plugin_configs = [plugin_config for plugin_config in scenario.plugins if plugin_config.get('name') in sweep]
+    if not plugin_configs:
+        return []
+
+    aggregates = registry.collect_aggregates(PluginPhase.POST_RUN, context, plugin_configs, scenario.concurrency)
+    surfaces = []
+    for plugin_config, aggregate in zip(plugin_configs, aggregates):
+        surfaces.extend(sweep_plugin(registry, context, plugin_config, sweep[plugin_config['name']] or {}, aggregate))
+    return surfaces
+
+
+def sweep_plugin(registry: PluginRegistry, context: TestContext, plugin_config: Dict[str, Any],
+                 grid: Dict[str, Any], aggregate: Any) -> List[SweepSurface]:
+    """One SweepSurface per combination of the swept keys other than the threshold"""
+    plugin_name = plugin_config.get('name')
+    plugin_class = registry.get_plugin_class(PluginPhase.POST_RUN, plugin_name)
+    threshold_key = plugin_class.threshold_keys[0]
+    setting_keys = [key for key in grid if key != threshold_key]
+
+    surfaces = []
+    for combination in itertools.product(*(sweep_values(grid[key]) for key in setting_keys)):
+        settings = dict(zip(setting_keys, combination))
+        surface = SweepSurface(scenario_name=context.scenario_name, plugin_name=plugin_name,
+                               threshold_key=threshold_key, settings=settings)
+        surfaces.append(surface)
+        instance, error = registry.acquire_instance(PluginPhase.POST_RUN, plugin_name,
+                                                   {**(plugin_config.get('config') or {}), **settings})
+        if error:
+            surface.message = error.message
+            continue
+        try:
+            instance.begin(context)
+            surface.thresholds = sweep_values(grid[threshold_key]) if threshold_key in grid else [instance.threshold]
+            if aggregate is None:
+                surface.message = "No aggregate: the plugin failed on this recording"
+                continue
+            instance.merge(aggregate)
+            surface.statistic = instance.judged_statistic()
+            if surface.statistic is None:
+                # finalize() fails a KPI without data, whatever the threshold
+                surface.passed = [False] * len(surface.thresholds)
+                surface.message = "No data"
+                continue
+            thresholds = np.asarray(surface.thresholds, dtype=np.float64)
+            passed = KPIThreshold(threshold_key, thresholds, instance.threshold_operator).check(surface.statistic)
+            surface.passed = np.broadcast_to(passed, thresholds.shape).tolist()
+        except Exception as e:
+            surface.message = f"Exception in plugin: {str(e)}"
+        finally:
+            registry.release_instances([instance])
+    return surfaces
@@ -1,88 +1,295 @@
-from typing import Dict, List
-from core.models import PluginResult
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from core.models import PluginResult, SweepSurface
+from core.profiling import slowest_cells
+from jinja2 import Environment
+from markupsafe import Markup
+from html import escape
+import math
 import os
 from pathlib import Path
 
-HTML_TEMPLATE = """
+REPORT_PAGE_SIZE = 500  # scenario rows per page of the matrix
+STREAM_BUFFER_EVENTS = 64  # template output chunks joined into one write while streaming the dashboard
+
+# Rows of every page but the first are inert <template> content: the browser parses
+# them without layout, and the pager script only instantiates a page when shown.
+HTML_TEMPLATE = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True).from_string("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <title>Regression Matrix Dashboard</title>
     <style>
-        table {{
+        table {
             border-collapse: collapse;
             width: 100%;
-        }}
-        th, td {{
+        }
+        th, td {
             border: 1px solid #ccc;
             text-align: center;
             padding: 8px;
-        }}
-        .passed {{ background-color: #c8e6c9; }}     /* green */
-        .failed {{ background-color: #ffcdd2; }}     /* red */
-        .warning {{ background-color: #fff9c4; }}    /* yellow */
-        .na {{ background-color: #eeeeee; }}         /* gray */
+        }
+        .passed { background-color: #c8e6c9; }     /* green */
+        .failed { background-color: #ffcdd2; }     /* red */
+        .warning { background-color: #fff9c4; }    /* yellow */
+        .na { background-color: #eeeeee; }         /* gray */
+        .pager { margin: 8px 0; }
     </style>
 </head>
 <body>
     <h2>Regression Matrix Dashboard</h2>
-    <table>
+    {% if completed < scenario_count %}
+    <p>{{ completed }} of {{ scenario_count }} scenarios completed</p>
+    {% endif %}
+    {% if page_count > 1 %}
+    <div class="pager">
+        <button id="previous-page">&laquo;</button>
+        <span id="page-label">Page 1 of {{ page_count }}</span> ({{ completed }} scenarios)
+        <button id="next-page">&raquo;</button>
+    </div>
+    {% endif %}
+    <table id="matrix">
         <thead>
             <tr>
                 <th>Scenario</th>
-                {kpi_headers}
+                {% for kpi in kpis %}
+                <th>{{ kpi }}</th>
+                {% endfor %}
             </tr>
         </thead>
+        {% for page in pages %}
+        {% if not loop.first %}<template class="page">{% endif %}
         <tbody>
-            {rows}
+            {% for row in page %}
+            {{ row }}
+            {% endfor %}
         </tbody>
+        {% if not loop.first %}</template>{% endif %}
+        {% endfor %}
     </table>
+    {{ sweep_tables }}
+    {{ profile_table }}
+    {% if page_count > 1 %}
+    <script>
+        (function () {
+            var table = document.getElementById('matrix');
+            var templates = table.querySelectorAll('template.page');
+            var bodies = [table.tBodies[0]];
+            var current = 0;
+            function show(index) {
+                if (index < 0 || index > templates.length) return;
+                if (!bodies[index]) {
+                    bodies[index] = document.importNode(templates[index - 1].content, true).firstElementChild;
+                }
+                table.replaceChild(bodies[index], bodies[current]);
+                current = index;
+                document.getElementById('page-label').textContent = 'Page ' + (index + 1) + ' of {{ page_count }}';
+            }
+            document.getElementById('previous-page').onclick = function () { show(current - 1); };
+            document.getElementById('next-page').onclick = function () { show(current + 1); };
+        })();
+    </script>
+    {% endif %}
 </body>
 </html>
+""")
+
+
+SWEEP_TABLE_TEMPLATE = """
+    <h3>{scenario_name} / {plugin_name}</h3>
+    <table>
+        <thead>
+            <tr>
+                <th>Settings</th>
+                <th>Statistic</th>
+                {threshold_headers}
+            </tr>
+        </thead>
+        <tbody>
+            {rows}
+        </tbody>
+    </table>
 """
 
 
-def generate_html_report(results: Dict[str, List[PluginResult]], output_path: Path):
-    all_kpis = set()
+def generate_sweep_tables(sweeps: Dict[str, List[SweepSurface]]) -> Markup:
+    """
+    One pass/fail surface table per scenario x KPI, one row per combination of the
+    other swept keys; every value is escaped
+    """
+    tables = []
+    for scenario_name, surfaces in sweeps.items():
+        # group the rows of each plugin, keeping the configured order
+        by_plugin: Dict[str, List[SweepSurface]] = {}
+        for surface in surfaces:
+            by_plugin.setdefault(surface.plugin_name, []).append(surface)
+
+        for plugin_name, plugin_surfaces in by_plugin.items():
+            thresholds = max((s.thresholds for s in plugin_surfaces), key=len)
+            threshold_key = plugin_surfaces[0].threshold_key
+            threshold_headers = ''.join(f'<th>{escape(threshold_key)} {escape(str(t))}</th>' for t in thresholds)
+
+            rows_html = ''
+            for surface in plugin_surfaces:
+                settings = ', '.join(f'{k}={v}' for k, v in surface.settings.items()) or 'configured'
+                statistic = '' if surface.statistic is None else f'{surface.statistic:.4g}'
+                message = escape(surface.message)
+                row_html = f'<tr><td>{escape(settings)}</td><td>{statistic}</td>'
+                if not surface.passed:
+                    row_html += f'<td class="na" colspan="{max(len(thresholds), 1)}" title="{message}">⚪</td>'
+                for passed in surface.passed:
+                    css_class, content = ("passed", "✅") if passed else ("failed", "❌")
+                    row_html += f'<td class="{css_class}" title="{message}">{content}</td>'
+                rows_html += row_html + '</tr>'
+
+            tables.append(SWEEP_TABLE_TEMPLATE.format(
+                scenario_name=escape(scenario_name), plugin_name=escape(plugin_name),
+                threshold_headers=threshold_headers, rows=rows_html
+            ))
+
+    if not tables:
+        return Markup('')
+    return Markup('<h2>Threshold Sweep</h2>' + ''.join(tables))
+
+
+PROFILE_TABLE_TEMPLATE = """
+    <h2>Slowest Plugins</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>Scenario</th>
+                <th>Plugin</th>
+                <th>Wall (ms)</th>
+                <th>CPU (ms)</th>
+                <th>Peak RSS &Delta; (MB)</th>
+                <th>Frames</th>
+                <th>Bytes read</th>
+                <th>Mode</th>
+            </tr>
+        </thead>
+        <tbody>
+            {rows}
+        </tbody>
+    </table>
+"""
 
-    # 1. Collect all KPI-Plugins
-    for plugin_results in results.values():
-        for result in plugin_results:
-            all_kpis.add(result.plugin_name)
 
-    kpi_headers_html = ''.join(f'<th>{kpi}</th>' for kpi in sorted(all_kpis))
+def generate_profile_table(results: Dict[str, List[PluginResult]], top: int = 10) -> Markup:
+    """The scenario x plugin cells with the highest wall time, slowest first; names are escaped"""
     rows_html = ''
+    for scenario_name, result in slowest_cells(results, top):
+        profile = result.profile
+        frames = '' if profile.frames is None else profile.frames
+        rows_html += (f'<tr><td>{escape(scenario_name)}</td><td>{escape(result.plugin_name)}</td>'
+                      f'<td>{profile.wall_ms:.1f}</td><td>{profile.cpu_ms:.1f}</td>'
+                      f'<td>{profile.peak_rss_delta_mb:.1f}</td><td>{frames}</td>'
+                      f'<td>{profile.bytes_read}</td><td>{profile.mode}</td></tr>')
+    if not rows_html:
+        return Markup('')
+    return Markup(PROFILE_TABLE_TEMPLATE.format(rows=rows_html))
+
+
+def matrix_cell(result: Optional[PluginResult]) -> Tuple[str, str, str]:
+    """(css class, symbol, tooltip) of one scenario x KPI cell"""
+    if result is None:
+        return "na", "⚪", "Not applicable"
+    if not result.success:
+        return "failed", "❌", result.message
+    if "warning" in result.message.lower():
+        return "warning", "⚠️", result.message
+    return "passed", "✅", result.message
+
+
+def matrix_row(scenario_name: str, plugin_results_list: List[PluginResult], kpis: List[str]) -> Markup:
+    """Escaped <tr> of one scenario with a cell per KPI column"""
+    # convert list to dictionary: plugin_name → PluginResult
+    plugin_results = {r.plugin_name: r for r in plugin_results_list}
+    # Cells are formatted here rather than in the template: a template loop per cell is several times slower
+    cells = ''.join(
+        f'<td class="{css_class}" title="{escape(tooltip)}">{content}</td>'
+        for css_class, content, tooltip in map(matrix_cell, map(plugin_results.get, kpis))
+    )
+    return Markup(f'<tr><td>{escape(scenario_name)}</td>{cells}</tr>')
+
+
+def _paginate(rows: Iterable[Markup], page_size: int) -> Iterator[List[Markup]]:
+    page = []
+    for row in rows:
+        page.append(row)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def _write_dashboard(output_path: Path, kpis: List[str], rows: Iterable[Markup], completed: int,
+                     scenario_count: int, results: Dict[str, List[PluginResult]],
+                     sweeps: Optional[Dict[str, List[SweepSurface]]], page_size: int) -> None:
+    """Stream the dashboard to a temporary file that then replaces output_path"""
+    stream = HTML_TEMPLATE.stream(
+        kpis=kpis,
+        pages=_paginate(rows, page_size) if completed else iter([[]]),
+        page_count=max(1, math.ceil(completed / page_size)),
+        completed=completed,
+        scenario_count=scenario_count,
+        sweep_tables=generate_sweep_tables(sweeps or {}),
+        profile_table=generate_profile_table(results),
+    )
+    stream.enable_buffering(STREAM_BUFFER_EVENTS)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # A browser reloading the dashboard mid-write sees the previous version, not half of the new one
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        stream.dump(f)
+    os.replace(tmp_path, output_path)
+
+
+def generate_html_report(results: Dict[str, List[PluginResult]], output_path: Path,
+                         sweeps: Optional[Dict[str, List[SweepSurface]]] = None,
+                         page_size: int = REPORT_PAGE_SIZE):
+    """
+    Stream the dashboard to output_path row by row, so the document is never held
+    in memory; the matrix is split into pages of page_size scenarios.
+    """
+    kpis = sorted({result.plugin_name for plugin_results in results.values() for result in plugin_results})
+    rows = (matrix_row(scenario_name, plugin_results, kpis) for scenario_name, plugin_results in results.items())
+    _write_dashboard(output_path, kpis, rows, len(results), len(results), results, sweeps, page_size)
+
+
+class DashboardWriter:
+    """
+    Dashboard of a run in progress: add() each scenario as it finishes and write()
+    whenever the file should be refreshed. A scenario's row is formatted once and
+    reused by later writes, unless a later scenario brings a new KPI column.
+    Rows follow scenario_names (the configured order), whatever the completion order.
+    """
+
+    def __init__(self, output_path: Path, scenario_names: List[str], page_size: int = REPORT_PAGE_SIZE):
+        self.output_path = Path(output_path)
+        self.scenario_names = scenario_names
+        self.page_size = page_size
+        self.results: Dict[str, List[PluginResult]] = {}
+        self._kpis: List[str] = []
+        self._rows: Dict[str, Markup] = {}
+
+    def add(self, scenario_name: str, results: List[PluginResult]) -> None:
+        self.results[scenario_name] = results
+        self._rows.pop(scenario_name, None)
+        kpis = sorted(set(self._kpis).union(result.plugin_name for result in results))
+        if kpis != self._kpis:
+            self._kpis = kpis
+            self._rows.clear()  # every row needs the new column
+
+    def _row(self, scenario_name: str) -> Markup:
+        row = self._rows.get(scenario_name)
+        if row is None:
+            row = self._rows[scenario_name] = matrix_row(scenario_name, self.results[scenario_name], self._kpis)
+        return row
 
-    # 2. Generate report lines
-    for scenario_name, plugin_results_list in results.items():
-        # convert list to dictionary: plugin_name → PluginResult
-        plugin_results = {r.plugin_name: r for r in plugin_results_list}
-
-        row_html = f'<tr><td>{scenario_name}</td>'
-        for kpi in sorted(all_kpis):
-            result = plugin_results.get(kpi)
-            if result is None:
-                css_class = "na"
-                content = "⚪"
-                tooltip = "Not applicable"
-            else:
-                tooltip = result.message
-                if not result.success:
-                    css_class = "failed"
-                    content = "❌"
-                elif "warning" in result.message.lower():
-                    css_class = "warning"
-                    content = "⚠️"
-                else:
-                    css_class = "passed"
-                    content = "✅"
-            row_html += f'<td class="{css_class}" title="{tooltip}">{content}</td>'
-        row_html += '</tr>'
-        rows_html += row_html
-
-    # 3. construct and save HTML
-    html = HTML_TEMPLATE.format(kpi_headers=kpi_headers_html, rows=rows_html)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w') as f:
-        f.write(html)
+    def write(self, sweeps: Optional[Dict[str, List[SweepSurface]]] = None) -> None:
+        completed = [name for name in self.scenario_names if name in self.results]
+        ordered = {name: self.results[name] for name in completed}
+        _write_dashboard(self.output_path, self._kpis, map(self._row, completed), len(completed),
+                         len(self.scenario_names), ordered, sweeps, self.page_size)
@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from core.live_plugin import LivePlugin
+from core.models import KPIThreshold, PluginResult, TestContext
+from core.streaming_stats import StreamingStats
+
+MB = 1024 * 1024
+
+# One row per sample; t is seconds since the live phase started (start_time in the metrics)
+SAMPLE_DTYPE = np.dtype([
+    ("t", np.float64),
+    ("cpu_percent", np.float32),         # SUT processes, 100 = one core
+    ("rss_mb", np.float32),              # SUT processes
+    ("read_mb_s", np.float32),           # SUT processes
+    ("write_mb_s", np.float32),          # SUT processes
+    ("system_cpu_percent", np.float32),  # whole machine, 100 = all cores
+    ("system_memory_percent", np.float32),
+])
+STATISTIC_COLUMNS = ("cpu_percent", "rss_mb", "read_mb_s", "write_mb_s", "system_cpu_percent", "system_memory_percent")
+
+
+class SampleRing:
+    """Preallocated ring of the last `capacity` samples"""
+
+    def __init__(self, capacity: int):
+        self.samples = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        self.count = 0  # samples taken, including overwritten ones
+
+    def append(self, row: Tuple[float, ...]) -> None:
+        self.samples[self.count % len(self.samples)] = row
+        self.count += 1
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self.count - len(self.samples))
+
+    def ordered(self) -> np.ndarray:
+        """Kept samples, oldest first"""
+        if self.count <= len(self.samples):
+            return self.samples[:self.count].copy()
+        split = self.count % len(self.samples)
+        return np.concatenate([self.samples[split:], self.samples[:split]])
+
+
+class _TrackedProcess:
+    def __init__(self, process: psutil.Process):
+        self.process = process
+        self.label = f"{process.name()}({process.pid})"
+        self.cpu_s = self._cpu_s()
+        self.io = self._io()
+        self.cpu = StreamingStats()
+        self.rss = StreamingStats()
+
+    def _cpu_s(self) -> float:
+        times = self.process.cpu_times()
+        return times.user + times.system
+
+    def _io(self) -> Tuple[int, int]:
+        try:
+            counters = self.process.io_counters()
+            return counters.read_bytes, counters.write_bytes
+        except (AttributeError, psutil.AccessDenied):
+            return 0, 0
+
+    def sample(self, elapsed_s: float) -> Tuple[float, float, int, int]:
+        """(cpu %, rss MB, bytes read, bytes written) since the previous sample"""
+        with self.process.oneshot():
+            cpu_s, io, rss = self._cpu_s(), self._io(), self.process.memory_info().rss / MB
+        cpu_percent = (cpu_s - self.cpu_s) / elapsed_s * 100 if elapsed_s > 0 else 0.0
+        read, written = io[0] - self.io[0], io[1] - self.io[1]
+        self.cpu_s, self.io = cpu_s, io
+        self.cpu.update(cpu_percent)
+        self.rss.update(rss)
+        return cpu_percent, rss, read, written
+
+
+class ResourceMonitorPlugin(LivePlugin):
+    """
+    Samples CPU, RSS and I/O of the SUT processes (and of the whole machine) at
+    sample_hz while the live phase runs. Samples go to a preallocated ring buffer
+    written to output_dir as a NumPy .npy time series. The CPU statistic (p95 by
+    default) of the SUT is judged against cpu_threshold, and its peak RSS against
+    rss_threshold_mb when set.
+
+    The SUT is given as `pids`, process `names` (matched against the name or the
+    command line) and/or docker `containers`, including all their children.
+    It is looked up again every rescan_interval seconds, so modules started after the
+    live phase are picked up. Without any of them, the machine-wide figures are judged.
+
+    Sampling runs on its own thread, at a fixed rate independent of frame traffic,
+    and reads /proc only: one oneshot() per process per sample.
+    """
+
+    def begin(self, context: TestContext) -> None:
+        self.sample_hz = self.config.get("sample_hz", 10)  # samples per second
+        self.capacity = self.config.get("max_samples", 36000)  # ring size: 1 hour at 10 Hz
+        self.cpu_threshold = self.config.get("cpu_threshold", 90.0)  # percent, 100 = one core
+        self.cpu_statistic = self.config.get("cpu_statistic", "p95")  # max, avg, p50, p95, p99, ...
+        self.rss_threshold_mb = self.config.get("rss_threshold_mb")  # None: RSS is reported, not judged
+        self.rescan_interval = self.config.get("rescan_interval", 1.0)  # seconds between SUT process lookups
+        self.output_dir = Path(self.config.get("output_dir", "reports/resources"))  # where the .npy series goes
+        self.pids = list(self.config.get("pids", []))
+        self.names = list(self.config.get("names", []))
+        self.containers = list(self.config.get("containers", []))
+        self.container_pids: Dict[str, int] = {}
+        self.logger = logging.getLogger("ResourceMonitor")
+
+        self.ring = SampleRing(self.capacity)
+        self.stats = {column: StreamingStats() for column in STATISTIC_COLUMNS}
+        self.processes: Dict[int, _TrackedProcess] = {}
+        self.finished: List[_TrackedProcess] = []  # processes that exited during the run
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+
+    @property
+    def system_wide(self) -> bool:
+        return not (self.pids or self.names or self.containers)
+
+    async def monitor(self, context: TestContext) -> None:
+        stop = threading.Event()
+        thread = threading.Thread(target=self._sample_loop, args=(stop,), name="ResourceMonitor", daemon=True)
+        thread.start()
+        try:
+            await asyncio.Event().wait()  # until the live phase ends and cancels us
+        finally:
+            stop.set()
+            thread.join()
+
+    def _sample_loop(self, stop: threading.Event) -> None:
+        interval = 1.0 / self.sample_hz
+        start = time.perf_counter()
+        self.start_time = time.time()
+        psutil.cpu_percent(None)  # the first machine-wide reading only sets the baseline
+        self._rescan()
+        previous = start
+        next_rescan = start + self.rescan_interval
+        ticks = 0
+        while not stop.wait(max(0.0, start + (ticks + 1) * interval - time.perf_counter())):
+            ticks += 1
+            now = time.perf_counter()
+            if now >= next_rescan:
+                self._rescan()
+                next_rescan = now + self.rescan_interval
+            self._sample(now - start, now - previous)
+            previous = now
+
+    def _rescan(self) -> None:
+        """Track every SUT process not tracked yet"""
+        if self.system_wide:
+            return
+        for process in self._sut_processes():
+            if process.pid not in self.processes:
+                try:
+                    self.processes[process.pid] = _TrackedProcess(process)
+                except psutil.Error:
+                    continue
+
+    def _sut_processes(self) -> List[psutil.Process]:
+        roots = []
+        for pid in self.pids + list(self._container_pids().values()):
+            try:
+                roots.append(psutil.Process(pid))
+            except psutil.Error:
+                self.logger.debug(f"Process {pid} not found")
+        if self.names:
+            pattern = re.compile("|".join(re.escape(name) for name in self.names))
+            for process in psutil.process_iter(["name", "cmdline"]):
+                if process.pid == os.getpid():
+                    continue
+                if pattern.search(process.info["name"] or "") or pattern.search(" ".join(process.info["cmdline"] or [])):
+                    roots.append(process)
+        processes = []
+        for root in roots:
+            processes.append(root)
+            try:
+                processes.extend(root.children(recursive=True))
+            except psutil.Error:
+                pass
+        return processes
+
+    def _container_pids(self) -> Dict[str, int]:
+        """Main process of each running container; docker is only asked about containers not resolved yet"""
+        for container in self.containers:
+            if container in self.container_pids:
+                continue
+            try:
+                output = subprocess.run(["docker", "inspect", "--format", "{{.State.Pid}}", container],
+                                        capture_output=True, text=True, check=True, timeout=5).stdout
+                pid = int(output.strip())
+                if pid:  # 0 while the container is not running
+                    self.container_pids[container] = pid
+            except (OSError, ValueError, subprocess.SubprocessError) as e:
+                self.logger.debug(f"Cannot resolve container {container}: {e}")
+        return self.container_pids
+
+    def _sample(self, t: float, elapsed_s: float) -> None:
+        cpu = rss = read = written = 0.0
+        for pid, tracked in list(self.processes.items()):
+            try:
+                process_cpu, process_rss, process_read, process_written = tracked.sample(elapsed_s)
+            except psutil.Error:
+                self.finished.append(self.processes.pop(pid))
+                continue
+            cpu += process_cpu
+            rss += process_rss
+            read += process_read
+            written += process_written
+        system_cpu = psutil.cpu_percent(None)
+        system_memory = psutil.virtual_memory().percent
+        row = (t, cpu, rss, read / MB / elapsed_s, written / MB / elapsed_s, system_cpu, system_memory)
+        with self.lock:
+            self.ring.append(row)
+            for column, value in zip(STATISTIC_COLUMNS, row[1:]):
+                self.stats[column].update(value)
+
+    def _judged(self) -> Tuple[str, str]:
+        """(cpu column, rss column) the thresholds apply to"""
+        if self.system_wide:
+            return "system_cpu_percent", "system_memory_percent"
+        return "cpu_percent", "rss_mb"
+
+    def verdict(self) -> Optional[bool]:
+        cpu_column, rss_column = self._judged()
+        with self.lock:
+            if not self.stats[cpu_column].count:
+                return None
+            cpu = self.stats[cpu_column].statistic(self.cpu_statistic)
+            rss = self.stats[rss_column].running.max
+        passed = KPIThreshold(cpu_column, self.cpu_threshold, "lte").check(cpu)
+        if self.rss_threshold_mb is not None and not self.system_wide:
+            passed = passed and KPIThreshold(rss_column, self.rss_threshold_mb, "lte").check(rss)
+        return passed
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        cpu_column, rss_column = self._judged()
+        if not self.stats[cpu_column].count:
+            return PluginResult(success=False, message="No resource samples taken")
+
+        series_path = self.output_dir / (re.sub(r'[^\w.-]+', '_', context.scenario_name) + ".npy")
+        series_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(series_path, self.ring.ordered())
+
+        cpu = self.stats[cpu_column].statistic(self.cpu_statistic)
+        peak_rss = self.stats[rss_column].running.max
+        success = self.verdict()
+        label = self.cpu_statistic.capitalize() if self.cpu_statistic in ("max", "avg") else self.cpu_statistic.upper()
+        scope = "machine" if self.system_wide else "SUT"
+        message = (f"{label} {scope} CPU {cpu:.1f}% {'within' if success else 'exceeds'} "
+                   f"threshold {self.cpu_threshold}%, peak {'memory' if self.system_wide else 'RSS'} "
+                   f"{peak_rss:.1f}{'%' if self.system_wide else ' MB'}")
+
+        processes = list(self.processes.values()) + self.finished
+        return PluginResult(
+            success=success,
+            message=message,
+            metrics={"resources": {
+                "series": str(series_path),
+                "start_time": self.start_time,
+                "sample_hz": self.sample_hz,
+                "samples": self.ring.count,
+                "dropped": self.ring.dropped,
+                "cpu_threshold": self.cpu_threshold,
+                "cpu_statistic": self.cpu_statistic,
+                "rss_threshold_mb": self.rss_threshold_mb,
+                **{column: self.stats[column].summary() for column in STATISTIC_COLUMNS},
+                "processes": {
+                    tracked.label: {"cpu_p95": tracked.cpu.quantile(0.95), "cpu_max": tracked.cpu.running.max,
+                                    "rss_max_mb": tracked.rss.running.max}
+                    for tracked in processes if tracked.cpu.count
+                },
+            }}
+        )
@@ -1,63 +1,110 @@
-from core.models import PluginResult, TestContext
+import numpy as np
+
+from core.kpi_arrays import count_dropped_frames
+from core.models import KPIThreshold, PluginResult, TestContext
 from core.post_run_plugin import PostRunPlugin
-from pathlib import Path
-import json
+from core.sharded_reader import MergeUnavailable
 
 
 class DataDropRateKPIPlugin(PostRunPlugin):
-    def execute(self, context: TestContext) -> PluginResult:
-        threshold = self.config.get("drop_rate_threshold", 0.005)  # default: 0.5%
-        timestamp_field = self.config.get("timestamp_field", "timestamp")  # default: 'timestamp'
-        expected_interval = self.config.get("expected_interval", 100)  # ms between frames
-        scenario_path = context.data_path  # TODO pass data_path by Scenario object not by contex
-
-        timestamps = []
-        malformed_lines = 0
-
-        try:
-            with open(scenario_path, 'r') as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                        ts = entry.get(timestamp_field)
-                        if ts is not None:
-                            timestamps.append(int(ts))
-                    except json.JSONDecodeError:
-                        malformed_lines += 1
-
-            if not timestamps:
-                return PluginResult(success=False, message="No valid timestamps found")
-
-            timestamps.sort()
-            drops = 0
-            for i in range(1, len(timestamps)):
-                gap = timestamps[i] - timestamps[i - 1]
-                if gap > expected_interval:
-                    missing = (gap // expected_interval) - 1
-                    drops += missing
-
-            total_expected = drops + len(timestamps)
-            drop_rate = (drops + malformed_lines) / total_expected
-
-            success = drop_rate <= threshold
-            message = (
-                f"Data drop rate {drop_rate:.2%} within threshold {threshold:.2%}"
-                if success else
-                f"Data drop rate {drop_rate:.2%} exceeds threshold {threshold:.2%}"
-            )
-
-            return PluginResult(
-                success=success,
-                message=message,
-                metrics={
-                    "data_drop_rate": {
-                        "drops": drops,
-                        "malformed_lines": malformed_lines,
-                        "total_expected": total_expected,
-                        "drop_rate": drop_rate,
-                        "threshold": threshold
-                    }
+    threshold_keys = ("drop_rate_threshold",)
+    threshold_operator = "lte"
+
+    def begin(self, context: TestContext) -> None:
+        self.threshold = self.config.get("drop_rate_threshold", 0.005)  # default: 0.5%
+        self.timestamp_field = self.config.get("timestamp_field", "timestamp")  # default: 'timestamp'
+        self.expected_interval = self.config.get("expected_interval", 100)  # ms between frames
+        self.timestamps = []
+        self.malformed_lines = 0
+        self.merged = None  # partial() state of the shards merged so far
+
+    def required_fields(self):
+        return {self.timestamp_field}
+
+    def on_frame(self, entry) -> None:
+        ts = entry.get(self.timestamp_field)
+        if ts is not None:
+            self.timestamps.append(int(ts))
+
+    def on_malformed_line(self, line: bytes, error: ValueError) -> None:
+        self.malformed_lines += 1
+
+    def evaluate_columns(self, store, context: TestContext) -> PluginResult:
+        # int(ts) truncates towards zero, as does the int64 cast
+        self.malformed_lines = store.malformed_lines
+        timestamps = store.values(self.timestamp_field).astype(np.int64)
+        return self.evaluate(count_dropped_frames(timestamps, self.expected_interval), len(timestamps))
+
+    def partial(self):
+        """Frame count, first/last timestamp and drops of an in-order shard"""
+        if self.merged is not None:
+            return dict(self.merged, malformed_lines=self.malformed_lines)
+        timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        if np.any(np.diff(timestamps) < 0):
+            raise MergeUnavailable("Timestamps out of order within a shard")
+        return {
+            "frames": len(timestamps),
+            "first": timestamps[0].item() if len(timestamps) else None,
+            "last": timestamps[-1].item() if len(timestamps) else None,
+            "drops": count_dropped_frames(timestamps, self.expected_interval),
+            "malformed_lines": self.malformed_lines,
+        }
+
+    def merge(self, partial) -> None:
+        self.malformed_lines += partial["malformed_lines"]
+        if not partial["frames"]:
+            return
+        if self.merged is None:
+            self.merged = dict(partial)
+            return
+        if partial["first"] < self.merged["last"]:
+            raise MergeUnavailable("Shard timestamps overlap")
+        # The gap across the shard boundary is the only one neither shard has seen
+        boundary = np.asarray([self.merged["last"], partial["first"]], dtype=np.int64)
+        self.merged["drops"] += count_dropped_frames(boundary, self.expected_interval) + partial["drops"]
+        self.merged["frames"] += partial["frames"]
+        self.merged["last"] = partial["last"]
+
+    def _drops_and_frames(self):
+        if self.merged is not None:
+            return self.merged["drops"], self.merged["frames"]
+        timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        return count_dropped_frames(timestamps, self.expected_interval), len(timestamps)
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        return self.evaluate(*self._drops_and_frames())
+
+    def judged_statistic(self):
+        drops, frames = self._drops_and_frames()
+        return (drops + self.malformed_lines) / (drops + frames) if frames else None
+
+    def evaluate(self, drops, frames: int) -> PluginResult:
+        threshold = self.threshold
+        malformed_lines = self.malformed_lines
+
+        if not frames:
+            return PluginResult(success=False, message="No valid timestamps found")
+
+        total_expected = drops + frames
+        drop_rate = (drops + malformed_lines) / total_expected
+
+        success = KPIThreshold("data_drop_rate", threshold, self.threshold_operator).check(drop_rate)
+        message = (
+            f"Data drop rate {drop_rate:.2%} within threshold {threshold:.2%}"
+            if success else
+            f"Data drop rate {drop_rate:.2%} exceeds threshold {threshold:.2%}"
+        )
+
+        return PluginResult(
+            success=success,
+            message=message,
+            metrics={
+                "data_drop_rate": {
+                    "drops": drops,
+                    "malformed_lines": malformed_lines,
+                    "total_expected": total_expected,
+                    "drop_rate": drop_rate,
+                    "threshold": threshold
                 }
-            )
-        except Exception as e:
-            return PluginResult(success=False, message=str(e))
+            }
+        )
@@ -1,45 +1,62 @@
-from core.models import PluginResult, TestContext
+from core.models import KPIThreshold, PluginResult, TestContext
 from core.post_run_plugin import PostRunPlugin
-import json
-from pathlib import Path
+from core.streaming_stats import StreamingStats
 
 
 class ErrorRateKPIPlugin(PostRunPlugin):
-    def execute(self, context: TestContext) -> PluginResult:
-        threshold = self.config.get("error_rate_threshold", 0.001)  # default 0.1%
-        error_field = self.config.get("error_rate_field", "error_rate_percent")  # default field
-        scenario_path = context.data_path  # TODO pass data_path by Scenario object not by contex
-
-        error_rates = []
-        try:
-            with open(scenario_path, 'r') as f:
-                for line in f:
-                    entry = json.loads(line)
-                    error_rate = entry.get(error_field)
-                    if error_rate is not None:
-                        error_rates.append(error_rate)
-            if not error_rates:
-                return PluginResult(success=False, message="No error_rate_percent data found")
-
-            max_error_rate = max(error_rates)
-            avg_error_rate = sum(error_rates) / len(error_rates)
-            success = max_error_rate <= threshold
-            message = (
-                f"Max Error rate {max_error_rate:.4%} within threshold {threshold:.4%}"
-                if success else
-                f"Max Error rate {max_error_rate:.4%} exceeds threshold {threshold:.4%}"
-            )
-
-            return PluginResult(
-                success=success,
-                message=message,
-                metrics={
-                    "error_rate": {
-                        "max": max_error_rate,
-                        "avg": avg_error_rate,
-                        "threshold": threshold
-                    }
-                }
-            )
-        except Exception as e:
-            return PluginResult(success=False, message=str(e))
+    threshold_keys = ("error_rate_threshold", "error_rate_statistic")
+    threshold_operator = "lte"
+
+    def begin(self, context: TestContext) -> None:
+        self.threshold = self.config.get("error_rate_threshold", 0.001)  # default 0.1%
+        self.error_field = self.config.get("error_rate_field", "error_rate_percent")  # default field
+        self.statistic = self.config.get("error_rate_statistic", "max")  # max, avg, p50, p95, p99, ...
+        self.stats = StreamingStats()
+
+    def required_fields(self):
+        return {self.error_field}
+
+    def on_frame(self, entry) -> None:
+        error_rate = entry.get(self.error_field)
+        if error_rate is not None:
+            self.stats.update(error_rate)
+
+    def evaluate_columns(self, store, context: TestContext) -> PluginResult:
+        self.stats.update_many(store.values(self.error_field))
+        return self.evaluate()
+
+    def partial(self):
+        return self.stats
+
+    def merge(self, partial) -> None:
+        self.stats.merge(partial)
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        return self.evaluate()
+
+    def judged_statistic(self):
+        return self.stats.statistic(self.statistic) if self.stats.count else None
+
+    def evaluate(self) -> PluginResult:
+        threshold = self.threshold
+        value = self.judged_statistic()
+        if value is None:
+            return PluginResult(success=False, message="No error_rate_percent data found")
+
+        label = self.statistic.capitalize() if self.statistic in ("max", "avg") else self.statistic.upper()
+
+        success = KPIThreshold("error_rate", threshold, self.threshold_operator).check(value)
+        message = (
+            f"{label} Error rate {value:.4%} within threshold {threshold:.4%}"
+            if success else
+            f"{label} Error rate {value:.4%} exceeds threshold {threshold:.4%}"
+        )
+
+        metrics = self.stats.summary()
+        metrics["threshold"] = threshold
+        metrics["statistic"] = self.statistic
+        return PluginResult(
+            success=success,
+            message=message,
+            metrics={"error_rate": metrics}
+        )
@@ -1,47 +1,67 @@
-from core.models import PluginResult, TestContext
+from core.models import KPIThreshold, PluginResult, TestContext
 from core.post_run_plugin import PostRunPlugin
-import json
-from pathlib import Path
+from core.streaming_stats import StreamingStats
 
 
 class LatencyKPIPlugin(PostRunPlugin):
-    def execute(self, context: TestContext) -> PluginResult:
-        threshold = self.config.get("latency_threshold", 50.0)  # default 50 ms
-        latency_field = self.config.get("latency_field", "latency_ms")  # default latency_ms, could be fusion_latency_ms
-        scenario_path = context.data_path  # TODO pass data_path by Scenario object not by contex
-
-        latencies = []
-        try:
-            with open(scenario_path, 'r') as f:
-                for line in f:
-                    entry = json.loads(line)
-                    latency = entry.get(latency_field)
-                    if latency is not None:
-                        latencies.append(latency)
-
-            if not latencies:
-                return PluginResult(success=False, message="No latency data found")
-
-            max_latency = max(latencies)
-            avg_latency = sum(latencies) / len(latencies)
-
-            success = max_latency <= threshold
-            message = (
-                f"Max latency {max_latency:.2f} ms within threshold {threshold} ms"
-                if success else
-                f"Max latency {max_latency:.2f} ms exceeds threshold {threshold} ms"
-            )
-
-            return PluginResult(
-                success=success,
-                message=message,
-                metrics={
-                    latency_field: {
-                        "max": max_latency,
-                        "avg": avg_latency,
-                        "threshold": threshold
-                    }
-                }
-            )
-        except Exception as e:
-            return PluginResult(success=False, message=str(e))
+    """
+    Checks a latency field against a threshold. Latencies are summarized with
+    StreamingStats (constant memory); `latency_statistic` selects which value is
+    compared to the threshold: max (default), avg or a percentile such as p95.
+    """
+    threshold_keys = ("latency_threshold", "latency_statistic")
+    threshold_operator = "lte"
+
+    def begin(self, context: TestContext) -> None:
+        self.threshold = self.config.get("latency_threshold", 50.0)  # default 50 ms
+        self.latency_field = self.config.get("latency_field", "latency_ms")  # default latency_ms, could be fusion_latency_ms
+        self.statistic = self.config.get("latency_statistic", "max")  # max, avg, p50, p95, p99, ...
+        self.stats = StreamingStats()
+
+    def required_fields(self):
+        return {self.latency_field}
+
+    def on_frame(self, entry) -> None:
+        latency = entry.get(self.latency_field)
+        if latency is not None:
+            self.stats.update(latency)
+
+    def evaluate_columns(self, store, context: TestContext) -> PluginResult:
+        self.stats.update_many(store.values(self.latency_field))
+        return self.evaluate()
+
+    def partial(self):
+        return self.stats
+
+    def merge(self, partial) -> None:
+        self.stats.merge(partial)
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        return self.evaluate()
+
+    def judged_statistic(self):
+        return self.stats.statistic(self.statistic) if self.stats.count else None
+
+    def evaluate(self) -> PluginResult:
+        threshold = self.threshold
+        value = self.judged_statistic()
+        if value is None:
+            return PluginResult(success=False, message="No latency data found")
+
+        label = self.statistic.capitalize() if self.statistic in ("max", "avg") else self.statistic.upper()
+
+        success = KPIThreshold(self.latency_field, threshold, self.threshold_operator).check(value)
+        message = (
+            f"{label} latency {value:.2f} ms within threshold {threshold} ms"
+            if success else
+            f"{label} latency {value:.2f} ms exceeds threshold {threshold} ms"
+        )
+
+        metrics = self.stats.summary()
+        metrics["threshold"] = threshold
+        metrics["statistic"] = self.statistic
+        return PluginResult(
+            success=success,
+            message=message,
+            metrics={self.latency_field: metrics}
+        )
@@ -1,45 +1,63 @@
-from core.models import PluginResult, TestContext
+from core.models import KPIThreshold, PluginResult, TestContext
 from core.post_run_plugin import PostRunPlugin
-import json
+from core.streaming_stats import RunningStats
 
 
 class RadarSignalQualityScorePlugin(PostRunPlugin):
-    def execute(self, context: TestContext) -> PluginResult:
-        threshold = self.config.get("min_avg_signal_strength", 0.8)  # Default threshold
-        scenario_path = context.data_path  # TODO pass data_path by Scenario object not by contex
-        signal_strengths = []
-
-        try:
-            with open(scenario_path, "r") as f:
-                for line in f:
-                    entry = json.loads(line)
-                    radar_points = entry.get("points", [])
-
-                    for point in radar_points:
-                        signal = point.get("signal_strength")
-                        if signal is not None:
-                            signal_strengths.append(signal)
-
-            if not signal_strengths:
-                return PluginResult(success=False, message="No signal strength data found.")
-
-            avg_strength = sum(signal_strengths) / len(signal_strengths)
-            success = avg_strength >= threshold
-            message = (
-                f"Avg radar signal strength {avg_strength:.2f} meets threshold {threshold:.2f}"
-                if success else
-                f"Avg radar signal strength {avg_strength:.2f} is below threshold {threshold:.2f}"
-            )
-
-            return PluginResult(
-                success=success,
-                message=message,
-                metrics={
-                    "radar_signal_quality_score": {
-                        "avg": avg_strength,
-                        "threshold": threshold
-                    }
+    threshold_keys = ("min_avg_signal_strength",)
+    threshold_operator = "gte"
+
+    def begin(self, context: TestContext) -> None:
+        self.threshold = self.config.get("min_avg_signal_strength", 0.8)  # Default threshold
+        self.signal_strengths = RunningStats()
+
+    def required_fields(self):
+        return {"points.signal_strength"}
+
+    def on_frame(self, entry) -> None:
+        radar_points = entry.get("points", [])
+
+        for point in radar_points:
+            signal = point.get("signal_strength")
+            if signal is not None:
+                self.signal_strengths.update(signal)
+
+    def evaluate_columns(self, store, context: TestContext) -> PluginResult:
+        self.signal_strengths.update_many(store.values("points.signal_strength"))
+        return self.evaluate()
+
+    def partial(self):
+        return self.signal_strengths
+
+    def merge(self, partial) -> None:
+        self.signal_strengths.merge(partial)
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        return self.evaluate()
+
+    def judged_statistic(self):
+        return self.signal_strengths.average if self.signal_strengths.count else None
+
+    def evaluate(self) -> PluginResult:
+        threshold = self.threshold
+        avg_strength = self.judged_statistic()
+        if avg_strength is None:
+            return PluginResult(success=False, message="No signal strength data found.")
+
+        success = KPIThreshold("radar_signal_quality_score", threshold, self.threshold_operator).check(avg_strength)
+        message = (
+            f"Avg radar signal strength {avg_strength:.2f} meets threshold {threshold:.2f}"
+            if success else
+            f"Avg radar signal strength {avg_strength:.2f} is below threshold {threshold:.2f}"
+        )
+
+        return PluginResult(
+            success=success,
+            message=message,
+            metrics={
+                "radar_signal_quality_score": {
+                    "avg": avg_strength,
+                    "threshold": threshold
                 }
-            )
-        except Exception as e:
-            return PluginResult(success=False, message=str(e))
+            }
+        )
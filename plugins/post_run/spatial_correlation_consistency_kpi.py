@@ -1,8 +1,8 @@
-from core.models import PluginResult, TestContext
+from core.frame_store import ColumnUnavailable
+from core.models import KPIThreshold, PluginResult, TestContext
 from core.post_run_plugin import PostRunPlugin
-import json
-from pathlib import Path
-import math
+from core.streaming_stats import StreamingStats
+import numpy as np
 
 
 class SpatialCorrelationConsistencyPlugin(PostRunPlugin):
@@ -11,88 +11,179 @@ class SpatialCorrelationConsistencyPlugin(PostRunPlugin):
     It calculates centroids of each and compares them via Euclidean distance.
     The score is normalized by the maximum diagonal distance of the camera bounding box.
     The final success is based on the average score vs a configurable threshold (default 0.85).
+
+    Fused objects are buffered and scored in batches of `chunk_size` objects with NumPy
+    (see correlation_scores). Scores are summarized with StreamingStats, so memory and
+    shard partials stay constant in the number of objects; per-object score percentiles
+    (within 2 ** -8 of the exact value) and the minimum are reported next to the average.
     """
-    def execute(self, context: TestContext) -> PluginResult:
-        threshold = self.config.get("spatial_correlation_threshold", 0.85)  # default threshold
-        scenario_path = context.data_path  # TODO pass data_path by Scenario object not by contex
-        correlation_scores = []
-
-        try:
-            with open(scenario_path, 'r') as f:
-                for line in f:
-                    entry = json.loads(line)
-                    fused_objects = entry.get("fused_objects", [])
-
-                    for obj in fused_objects:
-                        camera_bbox = obj.get("camera_bbox_3d")
-                        radar_points = obj.get("radar_points")
-
-                        if not camera_bbox or not radar_points:
-                            continue
-
-                        camera_center = self._calculate_centroid(camera_bbox)
-                        radar_center = self._calculate_centroid(radar_points)
-
-                        distance = self._euclidean_distance(camera_center, radar_center)
-                        max_distance = self._max_expected_distance(camera_bbox)
-                        score = max(0.0, 1.0 - distance / max_distance) if max_distance else 0.0
-                        correlation_scores.append(score)
-
-            if not correlation_scores:
-                return PluginResult(success=False, message="No valid correlation data found")
-
-            avg_score = sum(correlation_scores) / len(correlation_scores)
-            success = avg_score >= threshold
-
-            message = (
-                f"Avg spatial correlation score {avg_score:.2f} meets threshold {threshold:.2f}"
-                if success else
-                f"Avg spatial correlation score {avg_score:.2f} below threshold {threshold:.2f}"
-            )
+    threshold_keys = ("spatial_correlation_threshold",)
+    threshold_operator = "gte"
 
-            return PluginResult(
-                success=success,
-                message=message,
-                metrics={
-                    "spatial_correlation_score": {
-                        "avg": avg_score,
-                        "threshold": threshold
-                    }
-                }
+    def begin(self, context: TestContext) -> None:
+        self.threshold = self.config.get("spatial_correlation_threshold", 0.85)  # default threshold
+        self.chunk_size = self.config.get("chunk_size", 4096)  # fused objects per vectorized batch
+        self.scores = StreamingStats()
+        self._reset_chunk()
+
+    def _reset_chunk(self):
+        self._bbox_points = []
+        self._bbox_counts = []
+        self._radar_points = []
+        self._radar_counts = []
+
+    def required_fields(self):
+        return {"fused_objects.camera_bbox_3d", "fused_objects.radar_points"}
+
+    def on_frame(self, entry) -> None:
+        fused_objects = entry.get("fused_objects", [])
+
+        for obj in fused_objects:
+            camera_bbox = obj.get("camera_bbox_3d")
+            radar_points = obj.get("radar_points")
+
+            if not camera_bbox or not radar_points:
+                continue
+
+            self._bbox_points.extend((p["x"], p["y"], p["z"]) for p in camera_bbox)
+            self._bbox_counts.append(len(camera_bbox))
+            self._radar_points.extend((p["x"], p["y"], p["z"]) for p in radar_points)
+            self._radar_counts.append(len(radar_points))
+
+        if len(self._bbox_counts) >= self.chunk_size:
+            self._flush_chunk()
+
+    def _flush_chunk(self):
+        if self._bbox_counts:
+            self.scores.update_many(correlation_scores(
+                np.asarray(self._bbox_points, dtype=np.float64).reshape(-1, 3),
+                np.asarray(self._bbox_counts, dtype=np.int64),
+                np.asarray(self._radar_points, dtype=np.float64).reshape(-1, 3),
+                np.asarray(self._radar_counts, dtype=np.int64),
+            ))
+        self._reset_chunk()
+
+    def evaluate_columns(self, store, context: TestContext) -> PluginResult:
+        bbox_points, bbox_starts, bbox_counts = _object_points(store, "fused_objects.camera_bbox_3d")
+        radar_points, radar_starts, radar_counts = _object_points(store, "fused_objects.radar_points")
+        selected = np.flatnonzero((bbox_counts > 0) & (radar_counts > 0))
+
+        for start in range(0, len(selected), self.chunk_size):
+            objects = selected[start:start + self.chunk_size]
+            bbox_chunk, bbox_chunk_counts = _gather(bbox_points, bbox_starts[objects], bbox_counts[objects])
+            radar_chunk, radar_chunk_counts = _gather(radar_points, radar_starts[objects], radar_counts[objects])
+            self.scores.update_many(
+                correlation_scores(bbox_chunk, bbox_chunk_counts, radar_chunk, radar_chunk_counts)
             )
+        return self.evaluate()
+
+    def partial(self):
+        self._flush_chunk()
+        return self.scores
+
+    def merge(self, partial) -> None:
+        self.scores.merge(partial)
+
+    def finalize(self, context: TestContext) -> PluginResult:
+        self._flush_chunk()
+        return self.evaluate()
+
+    def judged_statistic(self):
+        self._flush_chunk()
+        return self.scores.running.average if self.scores.count else None
+
+    def evaluate(self) -> PluginResult:
+        threshold = self.threshold
+        if not self.scores.count:
+            return PluginResult(success=False, message="No valid correlation data found")
+
+        avg_score = self.scores.running.average
+        success = KPIThreshold("spatial_correlation_score", threshold, self.threshold_operator).check(avg_score)
 
-        except Exception as e:
-            return PluginResult(success=False, message=str(e))
-
-    @staticmethod
-    def _calculate_centroid(points):
-        if not points:
-            return (0, 0, 0)
-        x = sum(p["x"] for p in points) / len(points)
-        y = sum(p["y"] for p in points) / len(points)
-        z = sum(p["z"] for p in points) / len(points)
-        return (x, y, z)
-
-    @staticmethod
-    def _euclidean_distance(p1, p2):
-        return math.sqrt(
-            (p1[0] - p2[0]) ** 2 +
-            (p1[1] - p2[1]) ** 2 +
-            (p1[2] - p2[2]) ** 2
+        message = (
+            f"Avg spatial correlation score {avg_score:.2f} meets threshold {threshold:.2f}"
+            if success else
+            f"Avg spatial correlation score {avg_score:.2f} below threshold {threshold:.2f}"
         )
 
-    @staticmethod
-    def _max_expected_distance(bbox):
-        # Estimate maximum size of object as the diagonal of the bbox
-        if len(bbox) < 2:
-            return 1.0
-        max_dist = 0
-        for i in range(len(bbox)):
-            for j in range(i + 1, len(bbox)):
-                d = SpatialCorrelationConsistencyPlugin._euclidean_distance(
-                    (bbox[i]["x"], bbox[i]["y"], bbox[i]["z"]),
-                    (bbox[j]["x"], bbox[j]["y"], bbox[j]["z"])
-                )
-                if d > max_dist:
-                    max_dist = d
-        return max_dist or 1.0
+        return PluginResult(
+            success=success,
+            message=message,
+            metrics={
+                "spatial_correlation_score": {
+                    "avg": avg_score,
+                    "threshold": threshold,
+                    "p50": self.scores.quantile(0.50),
+                    "p95": self.scores.quantile(0.95),
+                    "min": self.scores.running.min,
+                    "objects": self.scores.count
+                }
+            }
+        )
+
+
+def correlation_scores(bbox_points: np.ndarray, bbox_counts: np.ndarray,
+                       radar_points: np.ndarray, radar_counts: np.ndarray) -> np.ndarray:
+    """
+    Score a batch of fused objects at once.
+
+    bbox_points / radar_points hold the (x, y, z) points of all objects back to back,
+    bbox_counts / radar_counts how many points belong to each object (all > 0).
+    """
+    camera_centers = _centroids(bbox_points, bbox_counts)
+    radar_centers = _centroids(radar_points, radar_counts)
+
+    delta = camera_centers - radar_centers
+    distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2 + delta[:, 2] ** 2)
+    max_distance = _max_expected_distance(bbox_points, bbox_counts)
+    return np.maximum(0.0, 1.0 - distance / max_distance)
+
+
+def _point_index(counts: np.ndarray, size: int, selected: np.ndarray) -> np.ndarray:
+    """Row indices of the points of the selected objects, shaped (objects, size)"""
+    starts = np.cumsum(counts) - counts
+    return starts[selected][:, None] + np.arange(size)
+
+
+def _centroids(points: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    centers = np.empty((len(counts), 3))
+    for size in np.unique(counts):
+        selected = np.flatnonzero(counts == size)
+        grouped = points[_point_index(counts, size, selected)]  # (objects, size, 3)
+        # Accumulate point by point so the sums match a sequential sum() exactly
+        total = grouped[:, 0].copy()
+        for i in range(1, size):
+            total += grouped[:, i]
+        centers[selected] = total / size
+    return centers
+
+
+def _max_expected_distance(points: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # Estimate maximum size of object as the diagonal of the bbox
+    result = np.ones(len(counts))
+    for size in np.unique(counts):
+        if size < 2:
+            continue
+        selected = np.flatnonzero(counts == size)
+        grouped = points[_point_index(counts, size, selected)]
+        delta = grouped[:, :, None, :] - grouped[:, None, :, :]  # (objects, size, size, 3)
+        distances = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2 + delta[..., 2] ** 2)
+        diagonal = distances.reshape(len(selected), -1).max(axis=1)
+        result[selected] = np.where(diagonal > 0, diagonal, 1.0)
+    return result
+
+
+def _object_points(store, list_name: str):
+    """(points, start row, count) of a per-object point list in the frame store"""
+    offsets = store.offsets(list_name)
+    columns = [f"{list_name}.{axis}" for axis in ("x", "y", "z")]
+    if not all(store.has_column(c) and store.valid(c).all() for c in columns):
+        # Missing coordinates make the scan fail with a KeyError; let it reproduce that
+        raise ColumnUnavailable(list_name)
+    points = np.stack([store.column(c) for c in columns], axis=1).astype(np.float64)
+    return points, np.asarray(offsets[:-1]), np.diff(offsets)
+
+
+def _gather(points: np.ndarray, starts: np.ndarray, counts: np.ndarray):
+    index = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    return points[index], counts
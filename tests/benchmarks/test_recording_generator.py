@@ -0,0 +1,78 @@
+import json
+import pytest
+from pathlib import Path
+from benchmarks.bench_plugins import PLUGINS, regressions
+from benchmarks.recording_generator import ensure_recording, generate_recording, parse_count
+from core.models import PluginPhase
+from core.plugin_registry import PluginRegistry
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+FIXTURES = {"camera": "camera_data_with_kpis.jsonl", "radar": "radar_data_with_kpis.jsonl",
+            "fused": "fused_data_with_kpis.jsonl"}
+
+
+def _keys(value):
+    """Nested key structure of a decoded frame, ignoring list lengths"""
+    if isinstance(value, dict):
+        return {key: _keys(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_keys(value[0])] if value else []
+    return "number" if isinstance(value, (int, float)) else type(value).__name__
+
+
+def test_parse_count():
+    assert [parse_count(text) for text in ["1000", "1K", "10k", "2.5M", "10M"]] == \
+           [1000, 1000, 10000, 2500000, 10000000]
+
+
+@pytest.mark.parametrize("kind", ["camera", "radar", "fused"])
+def test_recordings_match_fixture_schema(tmp_path, kind):
+    path = generate_recording(tmp_path / f"{kind}.jsonl", kind, 50, objects=3)
+    fixture = json.loads((DATA_DIR / FIXTURES[kind]).read_text().splitlines()[0])
+
+    frames = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert len(frames) == 50
+    assert all(len(frame[key]) == 3 for frame in frames for key in ("objects", "fused_objects") if key in frame)
+    assert set(frames[0]) == set(fixture)
+    if kind == "fused":
+        assert _keys(frames[0]["fused_objects"][0]) == _keys(fixture["fused_objects"][0])
+
+
+def test_recordings_are_deterministic(tmp_path):
+    first = generate_recording(tmp_path / "a.jsonl", "fused", 1200, objects=2, seed=7)
+    second = generate_recording(tmp_path / "b.jsonl", "fused", 1200, objects=2, seed=7)
+    other_seed = generate_recording(tmp_path / "c.jsonl", "fused", 1200, objects=2, seed=8)
+
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes() != other_seed.read_bytes()
+    assert ensure_recording(tmp_path, "fused", 1200, objects=2, seed=7).read_bytes() == first.read_bytes()
+
+
+@pytest.mark.parametrize("kind", ["camera", "radar", "fused"])
+def test_benchmark_plugins_judge_generated_recordings(tmp_path, setup_logger, kind):
+    path = generate_recording(tmp_path / f"{kind}.jsonl", kind, 2000, objects=2)
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    context = create_test_context(path, setup_logger)
+
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS[kind])
+
+    for result in results:
+        assert not result.message.startswith("No ") and "Exception" not in result.message, result.message
+        assert result.profile.frames == 2000
+
+
+def test_regressions_compare_frames_per_second():
+    def entry(name, frames_per_s):
+        return {"benchmark": "plugin", "name": name, "kind": "fused", "frames": 1000, "objects": 1,
+                "frames_per_s": frames_per_s}
+
+    baseline = {"results": [entry("A", 1000.0), entry("B", 1000.0)]}
+    current = {"results": [entry("A", 950.0), entry("B", 800.0), entry("C", 1.0)]}
+
+    found = regressions(current, baseline, tolerance=0.1)
+
+    assert len(found) == 1 and found[0].startswith("B fused 1000 frames") and "1000 -> 800" in found[0]
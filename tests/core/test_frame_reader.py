@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+import pytest
+from pathlib import Path
+from core.frame_reader import FollowMode, FrameReader
+from core.frame_sources import open_source
+from core.models import PluginPhase
+from core.plugin_registry import PluginRegistry
+from tests.utils.test_helpers import create_test_context, start_writer
+
+ROOT_DIR = Path(__file__).parents[2]
+RECORDING = ROOT_DIR / "tests" / "plugins" / "post_run" / "fused_data_with_kpis.jsonl"
+END_MARKER = '{"end_of_recording": true}'
+PLUGINS = [
+    {"name": "LatencyKPIPlugin", "config": {"latency_field": "fusion_latency_ms"}},
+    {"name": "DecisionConsistencyScorePlugin"},
+]
+
+
+def test_follow_reads_a_growing_recording_up_to_the_end_marker(tmp_path):
+    target = tmp_path / "growing.jsonl"
+    writer = start_writer(RECORDING, target, chunk_bytes=333, end_marker=END_MARKER)
+
+    frames = [entry for _, entry, error in FrameReader(target, follow=FollowMode(end_marker=END_MARKER))
+              if error is None]
+    writer.join()
+
+    assert frames == [json.loads(line) for line in RECORDING.read_text().splitlines()]
+
+
+def test_follow_ends_when_the_recording_goes_idle(tmp_path):
+    target = tmp_path / "idle.jsonl"
+    target.write_bytes(b'{"a": 1}\n{"a": 2}\n{"a"')  # the writer died mid-line
+
+    start = time.monotonic()
+    reader = FrameReader(target, follow=FollowMode(idle_timeout=0.2, poll_interval=0.01))
+    decoded = [(entry, error is not None) for _, entry, error in reader]
+
+    assert 0.2 <= time.monotonic() - start < 2
+    assert decoded == [({"a": 1}, False), ({"a": 2}, False), (None, True)]
+    assert reader.frames_read == 2
+
+
+def test_missing_recording_fails_the_scan_and_the_live_source(tmp_path):
+    missing = tmp_path / "never_written.jsonl"
+    with pytest.raises(FileNotFoundError, match="did not appear within 0.1s"):
+        list(FrameReader(missing, follow=FollowMode(idle_timeout=0.1, poll_interval=0.01)))
+
+    async def read_source():
+        return [line async for line in open_source({"type": "tail", "idle_timeout": 0.1}, missing)]
+    with pytest.raises(FileNotFoundError, match="did not appear within 0.1s"):
+        asyncio.run(read_source())
+
+
+def test_follow_mode_from_config():
+    assert FollowMode.from_config(None) is None and FollowMode.from_config(False) is None
+    assert FollowMode.from_config(True) == FollowMode()
+    assert FollowMode.from_config({"end_marker": END_MARKER, "idle_timeout": 3}) == \
+           FollowMode(end_marker=END_MARKER, idle_timeout=3)
+    with pytest.raises(ValueError):
+        FollowMode.from_config({"idle": 3})
+
+
+def test_post_run_plugins_follow_the_recording(tmp_path, setup_logger):
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, create_test_context(RECORDING, setup_logger),
+                                              PLUGINS, {"executor": "thread", "max_workers": 2})
+
+    target = tmp_path / "growing.jsonl"
+    writer = start_writer(RECORDING, target, end_marker=END_MARKER)
+    context = create_test_context(target, setup_logger)
+    context.follow = FollowMode(end_marker=END_MARKER)
+    context.use_frame_store = True
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS,
+                                             {"executor": "thread", "max_workers": 2})
+    writer.join()
+
+    assert [(r.success, r.message) for r in results] == [(r.success, r.message) for r in expected]
+    assert all(r.profile.mode == "scan" and r.profile.frames == 90 for r in results)
@@ -0,0 +1,136 @@
+import json
+import shutil
+import pytest
+import numpy as np
+from pathlib import Path
+from core import frame_store
+from core.frame_store import ColumnUnavailable, FrameStore
+from plugins.post_run.latency_kpi import LatencyKPIPlugin
+from tests.utils.test_helpers import create_test_context
+
+DATA_DIR = Path(__file__).parents[1] / "plugins" / "post_run"
+
+
+@pytest.fixture
+def fused_file(tmp_path):
+    path = tmp_path / "fused.jsonl"
+    shutil.copy(DATA_DIR / "fused_data_with_kpis.jsonl", path)
+    return path
+
+
+def test_frame_store_columns_match_recording(fused_file, tmp_path):
+    entries = [json.loads(line) for line in fused_file.read_text().splitlines()]
+    store = FrameStore.open(fused_file, tmp_path / "cache")
+
+    assert store.frame_count == len(entries)
+    assert store.column("timestamp").dtype == np.int64
+    assert store.values("timestamp").tolist() == [e["timestamp"] for e in entries]
+
+    offsets = store.offsets("fused_objects")
+    assert offsets.tolist()[-1] == sum(len(e["fused_objects"]) for e in entries)
+
+    first = entries[0]["fused_objects"][0]
+    bbox_offsets = store.offsets("fused_objects.camera_bbox_3d")
+    xs = store.column("fused_objects.camera_bbox_3d.x")[bbox_offsets[0]:bbox_offsets[1]]
+    assert xs.tolist() == [p["x"] for p in first["camera_bbox_3d"]]
+
+    codes = store.column("fused_objects.source_classes.camera")
+    vocabulary = store.vocabulary("fused_objects.source_classes.camera")
+    assert vocabulary[codes[0]] == first["source_classes"]["camera"]
+
+
+def test_frame_store_is_reused_until_content_changes(fused_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    FrameStore.open(fused_file, cache_dir)
+
+    builds = []
+    original_build = frame_store._build_store
+    monkeypatch.setattr(frame_store, "_build_store", lambda *args: builds.append(args) or original_build(*args))
+
+    store = FrameStore.open(fused_file, cache_dir)
+    assert builds == []
+    assert isinstance(store.column("timestamp"), np.memmap)
+
+    with open(fused_file, "a") as f:
+        f.write(json.dumps({"timestamp": 99999, "fusion_latency_ms": 1, "fused_objects": []}) + "\n")
+    store = FrameStore.open(fused_file, cache_dir)
+    assert len(builds) == 1
+    assert store.values("timestamp")[-1] == 99999
+
+
+def test_frame_store_tracks_missing_and_mixed_values(tmp_path):
+    path = tmp_path / "mixed.jsonl"
+    path.write_text('{"latency_ms": 10, "tag": 1}\n{"tag": "x"}\nnot json\n{"latency_ms": 12.5}\n')
+    store = FrameStore.open(path, tmp_path / "cache")
+
+    assert store.frame_count == 3
+    assert store.malformed_lines == 1
+    assert store.valid("latency_ms").tolist() == [True, False, True]
+    assert store.values("latency_ms").tolist() == [10.0, 12.5]
+    with pytest.raises(ColumnUnavailable):
+        store.values("tag")
+
+
+def test_latency_kpi_from_frame_store_matches_scan(fused_file, tmp_path, setup_logger):
+    config = {"latency_field": "fusion_latency_ms", "latency_threshold": 50}
+    context = create_test_context(fused_file, setup_logger)
+    expected = LatencyKPIPlugin(config).execute(context)
+
+    context = create_test_context(fused_file, setup_logger)
+    context.temp_dir = tmp_path / "cache"
+    context.use_frame_store = True
+    result = LatencyKPIPlugin(config).execute(context)
+
+    assert context._frame_store is not None
+    assert result.success is expected.success
+    assert result.message == expected.message
+    assert result.metrics == expected.metrics
+
+
+def test_frame_store_flags_irregular_lists_and_string_columns(tmp_path):
+    path = tmp_path / "irregular.jsonl"
+    path.write_text('{"points": [{"signal_strength": 0.9}, 3], "label": "a"}\n{"objects": [{"x": 1}]}\n')
+    store = FrameStore.open(path, tmp_path / "cache")
+
+    with pytest.raises(ColumnUnavailable):
+        store.values("points.signal_strength")
+    with pytest.raises(ColumnUnavailable):
+        store.values("label")
+    assert store.values("objects.x").tolist() == [1]
+
+
+def test_frame_store_build_spills_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(frame_store, "_SPILL_ROWS", 4)
+    entries = []
+    for i in range(23):
+        entry = {"timestamp": i * 100, "label": "abc"[i % 3], "objects": [{"x": i + k * 0.5} for k in range(i % 4)]}
+        if i % 5 == 0:
+            entry["latency_ms"] = i
+        if i == 17:
+            entry["latency_ms"] = 17.5
+        entries.append(entry)
+    path = tmp_path / "long.jsonl"
+    path.write_text("".join(json.dumps(e) + "\n" for e in entries))
+    store = FrameStore.open(path, tmp_path / "cache")
+
+    assert store.frame_count == 23
+    assert store.column("timestamp").dtype == np.int64
+    assert store.values("timestamp").tolist() == [e["timestamp"] for e in entries]
+    labels = store.column("label")
+    assert [store.vocabulary("label")[c] for c in labels] == [e["label"] for e in entries]
+    assert store.column("latency_ms").dtype == np.float64
+    assert store.values("latency_ms").tolist() == [e["latency_ms"] for e in entries if "latency_ms" in e]
+    offsets = store.offsets("objects")
+    assert np.diff(offsets).tolist() == [len(e["objects"]) for e in entries]
+    assert store.values("objects.x").tolist() == [o["x"] for e in entries for o in e["objects"]]
+
+
+def test_frame_store_keeps_booleans_apart_from_numbers(tmp_path):
+    path = tmp_path / "flags.jsonl"
+    path.write_text('{"valid": true, "flag": 1}\n{"valid": false, "flag": true}\n{}\n')
+    store = FrameStore.open(path, tmp_path / "cache")
+
+    assert store.column("valid").dtype == np.bool_
+    assert store.values("valid").tolist() == [True, False]
+    with pytest.raises(ColumnUnavailable):
+        store.values("flag")
@@ -0,0 +1,123 @@
+import os
+import time
+import pytest
+from core.isolated_pool import IsolatedWorkerPool
+from core.models import PluginPhase
+from core.plugin_registry import PluginRegistry
+from core.result_cache import ResultCache
+from core.test_orchestrator import ScenarioTimeout, scenario_deadline
+from pathlib import Path
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+MISBEHAVING_PLUGIN = '''
+import os
+import time
+from core.models import PluginResult
+from core.plugin_registry import BasePlugin
+
+
+class MisbehavingKPIPlugin(BasePlugin):
+    def execute(self, context):
+        mode = self.config.get("mode")
+        if mode == "sleep":
+            time.sleep(self.config.get("seconds", 30))
+        elif mode == "allocate":
+            hog = b"x" * (400 * 1024 * 1024)
+            time.sleep(30)
+        elif mode == "exit":
+            os._exit(3)
+        return PluginResult(success=True, message=str(os.getpid()))
+'''
+
+
+def _sleep(seconds):
+    import time
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "plugins" / "post_run").mkdir(parents=True)
+    (tmp_path / "plugins" / "post_run" / "misbehaving_kpi.py").write_text(MISBEHAVING_PLUGIN)
+    registry = PluginRegistry(tmp_path / "plugins", use_entry_points=False)
+    registry.discover_plugins()
+    yield registry
+    registry.teardown_plugins()
+
+
+def test_pool_reuses_workers_and_recycles_after_timeout():
+    pool = IsolatedWorkerPool(max_workers=1)
+    try:
+        first = pool.run(_sleep, 0)
+        assert first.status == "ok"
+        assert pool.run(_sleep, 0).value == first.value
+
+        slow = pool.run(_sleep, 5, timeout=0.2)
+        assert slow.status == "timeout"
+        assert 0.2 <= slow.elapsed_s < 2
+
+        fresh = pool.run(_sleep, 0)
+        assert fresh.status == "ok" and fresh.value != first.value
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.parametrize("mode, reason, message", [
+    ("sleep", "timeout", "exceeded timeout of 0.5s"),
+    ("allocate", "memory", "exceeded memory limit of 250 MB"),
+    ("exit", "crashed", "exited with code 3"),
+])
+def test_breach_fails_only_that_plugin(registry, setup_logger, mode, reason, message):
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    plugins = [
+        {"name": "MisbehavingKPIPlugin", "config": {}},
+        {"name": "MisbehavingKPIPlugin", "config": {"mode": mode}},
+        {"name": "MisbehavingKPIPlugin", "config": {}},
+    ]
+    concurrency = {"executor": "isolated", "timeout": 0.5, "max_rss_mb": 250}
+
+    before, breached, after = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins, concurrency)
+
+    assert before.success and after.success
+    assert after.message != before.message  # the breaching worker was replaced
+    assert not breached.success and message in breached.message
+    isolation = breached.metrics["isolation"]
+    assert isolation["reason"] == reason
+    assert isolation["elapsed_s"] < 10
+    if reason == "memory":
+        assert isolation["peak_rss_mb"] > 250
+
+
+def test_execute_plugin_isolation_does_not_cache_breaches(registry, setup_logger, tmp_path):
+    registry.result_cache = ResultCache(tmp_path / "cache")
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    config = {"mode": "sleep"}
+
+    assert not registry.execute_plugin(PluginPhase.POST_RUN, "MisbehavingKPIPlugin", context, config,
+                                       isolation={"timeout": 0.2}).success
+    assert registry.result_cache.get(registry._result_cache_key(
+        PluginPhase.POST_RUN, {"name": "MisbehavingKPIPlugin", "config": config}, context)) is None
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_scenario_deadline_does_not_wait_for_a_hung_plugin(registry, setup_logger, executor):
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    plugins = [
+        {"name": "MisbehavingKPIPlugin", "config": {"mode": "sleep", "seconds": 3}},
+        {"name": "MisbehavingKPIPlugin", "config": {}},
+    ]
+    start = time.monotonic()
+    with pytest.raises(ScenarioTimeout):
+        with scenario_deadline(0.3):
+            registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins,
+                                           {"executor": executor, "max_workers": 2})
+    assert time.monotonic() - start < 2
+
+    # The worker of the abandoned plugin was killed, the pool serves the next scenario
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins[1:] * 2,
+                                             {"executor": executor, "max_workers": 2})
+    assert all(r.success for r in results)
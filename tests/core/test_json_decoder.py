@@ -0,0 +1,85 @@
+import json
+import pytest
+from pathlib import Path
+from core import json_decoder, plugin_registry
+from core.frame_reader import FrameReader
+from core.json_decoder import create_decoder, field_trie
+from core.models import PluginPhase
+from core.plugin_registry import PluginRegistry
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+LINES = [
+    b'{"latency_ms": 12.5, "points": [{"x": 1, "signal_strength": 0.9}]}\n',
+    b'{"big": 123456789012345678901234567890, "nan": NaN, "s": "\\ud800"}\n',
+    b'[1, 2, 3]\n',
+]
+MALFORMED = [b'{"latency_ms": \n', b'\n', b'not json\n']
+
+
+@pytest.mark.parametrize("backend", json_decoder.available_backends())
+def test_backends_decode_like_stdlib(backend):
+    decoder = create_decoder(backend)
+    for line in LINES:
+        expected = json.loads(line)
+        actual = decoder.decode(line)
+        assert json.dumps(actual, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+    for line in MALFORMED:
+        with pytest.raises(ValueError) as expected:
+            json.loads(line)
+        with pytest.raises(ValueError) as actual:
+            decoder.decode(line)
+        assert str(actual.value) == str(expected.value)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_decoder("ujson")
+
+
+@pytest.mark.skipif(json_decoder.simdjson is not None, reason="simdjson is installed")
+def test_missing_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_decoder("simdjson")
+
+
+def test_field_trie():
+    assert field_trie({"a.b", "a.c", "d"}) == {"a": {"b": {}, "c": {}}, "d": {}}
+    assert field_trie({"a.b", "a"}) == {"a": {}}
+
+
+def test_simdjson_projection():
+    pytest.importorskip("simdjson")
+    decoder = create_decoder("simdjson", {"latency_ms", "fused_objects.class"})
+    line = b'{"latency_ms": 3, "points": [1, 2], "fused_objects": [{"class": "car", "x": 1}, {"y": 2}]}'
+    assert decoder.decode(line) == {"latency_ms": 3, "fused_objects": [{"class": "car"}, {}]}
+
+
+def test_shared_scan_projects_required_fields(setup_logger, monkeypatch):
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    plugins = [
+        {"name": "LatencyKPIPlugin", "config": {"latency_field": "fusion_latency_ms"}},
+        {"name": "FusionRedundancyScorePlugin"},
+    ]
+    expected = [(r.success, r.message, r.metrics)
+                for r in registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins)]
+
+    readers = []
+
+    class RecordingFrameReader(FrameReader):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            readers.append(kwargs.get("fields"))
+
+    monkeypatch.setattr(plugin_registry, "FrameReader", RecordingFrameReader)
+    for backend in json_decoder.available_backends():
+        context.json_backend = backend
+        results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins)
+        assert [(r.success, r.message, r.metrics) for r in results] == expected
+
+    assert readers[0] == {"fusion_latency_ms", "fused_objects.source_classes"}
@@ -0,0 +1,57 @@
+import random
+import pytest
+import numpy as np
+from core.kpi_arrays import array_max, array_mean, count_dropped_frames, sequential_sum, to_array
+
+
+def legacy_drops(timestamps, expected_interval):
+    timestamps = sorted(timestamps)
+    drops = 0
+    for i in range(1, len(timestamps)):
+        gap = timestamps[i] - timestamps[i - 1]
+        if gap > expected_interval:
+            drops += (gap // expected_interval) - 1
+    return drops
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_reductions_match_builtins(seed):
+    rng = random.Random(seed)
+    floats = [rng.uniform(0, 200) for _ in range(rng.randint(1, 5000))]
+    ints = [rng.randint(0, 10 ** 6) for _ in range(rng.randint(1, 5000))]
+
+    for values in (floats, ints, ints + floats):
+        array = to_array(values)
+        assert array_max(array) == max(values)
+        assert sequential_sum(array) == sum(values)
+        assert array_mean(array) == sum(values) / len(values)
+
+
+def test_sequential_sum_spans_chunks(monkeypatch):
+    from core import kpi_arrays
+    monkeypatch.setattr(kpi_arrays, "_SUM_CHUNK", 7)
+    values = [0.1 * i for i in range(100)]
+    assert sequential_sum(to_array(values)) == sum(values)
+
+
+@pytest.mark.parametrize("expected_interval", [10, 100, 33.3])
+def test_count_dropped_frames_matches_loop(expected_interval):
+    rng = random.Random(expected_interval)
+    timestamps = [1000 + 10 * i + rng.choice([0, 0, 0, 25, 300]) for i in range(2000)]
+    rng.shuffle(timestamps)
+
+    expected = legacy_drops(timestamps, expected_interval)
+    actual = count_dropped_frames(np.asarray(timestamps, dtype=np.int64), expected_interval)
+    assert actual == expected
+    assert type(actual) is type(expected)
+
+
+def test_count_dropped_frames_without_gaps():
+    assert count_dropped_frames(np.asarray([1000], dtype=np.int64), 100) == 0
+    assert count_dropped_frames(np.asarray([1000, 1100, 1200], dtype=np.int64), 100.0) == 0
+
+
+def test_sequential_sum_continues_from_start():
+    values = [0.1 * i for i in range(100)]
+    assert sequential_sum(to_array(values[50:]), start=sum(values[:50])) == sum(values)
+    assert sequential_sum(to_array([1, 2, 3]), start=4) == 10
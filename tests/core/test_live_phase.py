@@ -0,0 +1,181 @@
+import json
+import socket
+import threading
+import time
+import pytest
+import yaml
+from pathlib import Path
+from core.frame_sources import LineBuffer, open_source
+from core.live_phase import run_live_phase
+from core.models import PluginPhase
+from core.plugin_registry import PluginRegistry
+from core.test_orchestrator import TestOrchestrator
+from tests.utils.test_helpers import create_test_context, start_writer
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+END_MARKER = '{"end_of_recording": true}'
+LATENCY = {"name": "LatencyKPIPlugin", "config": {"latency_threshold": 50, "latency_field": "fusion_latency_ms"}}
+
+
+@pytest.fixture
+def registry():
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    yield registry
+    registry.teardown_plugins()
+
+
+def spiking_recording(path, frames=300, spike_at=50):
+    with open(path, "w") as f:
+        for i in range(frames):
+            f.write(json.dumps({"timestamp": i * 100, "fusion_latency_ms": 80.0 if i >= spike_at else 10.0}) + "\n")
+    return path
+
+
+def test_line_buffer_keeps_partial_lines():
+    buffer = LineBuffer()
+
+    assert buffer.feed(b'{"a": 1}\n{"a"') == [b'{"a": 1}\n']
+    assert buffer.feed(b': 2}\n\n{"a": 3') == [b'{"a": 2}\n', b'\n']
+    assert buffer.flush() == [b'{"a": 3']
+
+
+def test_tailed_recording_matches_post_run(tmp_path, setup_logger, registry):
+    recording = DATA_DIR / "fused_data_with_kpis.jsonl"
+    target = tmp_path / "live.jsonl"
+    writer = start_writer(recording, target, end_marker=END_MARKER)
+    context = create_test_context(target, setup_logger)
+
+    outcome = run_live_phase(registry, context, {
+        "source": {"type": "tail", "end_marker": END_MARKER, "idle_timeout": 5},
+        "queue_size": 4,
+        "rolling_interval": 0,
+        "plugins": [LATENCY, {"name": "DecisionConsistencyScorePlugin"}],
+    })
+    writer.join()
+
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, create_test_context(recording, setup_logger),
+                                              [LATENCY, {"name": "DecisionConsistencyScorePlugin"}])
+    assert not outcome.aborted and outcome.frames == 90
+    assert [r.plugin_name for r in outcome.results] == ["LatencyKPIPlugin (live)", "DecisionConsistencyScorePlugin (live)"]
+    assert [(r.success, r.message) for r in outcome.results] == [(r.success, r.message) for r in expected]
+    assert outcome.results[0].metrics["live"]["rolling"][0][2] is True
+    assert outcome.results[0].profile.mode == "live" and outcome.results[0].profile.frames == 90
+
+
+def test_hard_failure_aborts_the_feed(tmp_path, setup_logger, registry):
+    context = create_test_context(spiking_recording(tmp_path / "spike.jsonl"), setup_logger)
+
+    outcome = run_live_phase(registry, context, {
+        "source": {"type": "replay"},
+        "rolling_interval": 0,
+        "plugins": [{**LATENCY, "abort_on_failure": True}],
+    })
+
+    assert outcome.aborted_by == "LatencyKPIPlugin"
+    assert outcome.frames == 51
+    result, = outcome.results
+    assert not result.success and "exceeds threshold" in result.message
+    assert [change[2] for change in result.metrics["live"]["rolling"]] == [True, False]
+
+
+BREACHING_MONITOR = '''
+import asyncio
+from core.live_plugin import LivePlugin
+from core.models import PluginResult
+
+
+class BreachingMonitorPlugin(LivePlugin):
+    def begin(self, context):
+        self.breached = False
+
+    async def monitor(self, context):
+        await asyncio.sleep(0.2)
+        self.breached = True
+
+    def verdict(self):
+        return not self.breached
+
+    def finalize(self, context):
+        return PluginResult(success=not self.breached, message="breached" if self.breached else "ok")
+'''
+
+
+def test_monitor_breach_aborts_while_the_source_is_idle(tmp_path, setup_logger):
+    (tmp_path / "plugins" / "live").mkdir(parents=True)
+    (tmp_path / "plugins" / "live" / "breaching_monitor.py").write_text(BREACHING_MONITOR)
+    registry = PluginRegistry(tmp_path / "plugins", use_entry_points=False)
+    registry.discover_plugins()
+    stalled = tmp_path / "stalled.jsonl"
+    stalled.write_text(json.dumps({"timestamp": 0, "fusion_latency_ms": 10.0}) + "\n")
+    context = create_test_context(stalled, setup_logger)
+
+    start = time.monotonic()
+    outcome = run_live_phase(registry, context, {
+        "source": {"type": "tail", "idle_timeout": 5},
+        "rolling_interval": 0.05,
+        "plugins": [{"name": "BreachingMonitorPlugin", "abort_on_failure": True}],
+    })
+
+    assert outcome.aborted_by == "BreachingMonitorPlugin" and outcome.frames == 1
+    assert time.monotonic() - start < 2  # long before the source's idle_timeout
+    assert outcome.results[0].message == "breached"
+
+
+def test_socket_source(setup_logger, registry):
+    lines = (DATA_DIR / "fused_data_with_kpis.jsonl").read_bytes()
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        connection, _ = server.accept()
+        with connection:
+            connection.sendall(lines)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    context = create_test_context(DATA_DIR / "unused.jsonl", setup_logger)
+
+    outcome = run_live_phase(registry, context, {
+        "source": {"type": "socket", "address": f"127.0.0.1:{server.getsockname()[1]}"},
+        "plugins": [LATENCY],
+    })
+    thread.join()
+    server.close()
+
+    assert outcome.frames == 90 and outcome.results[0].message.startswith("Max latency 119.00 ms")
+
+
+def test_unknown_source_and_plugin_fail_their_cells(setup_logger, registry):
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+
+    outcome = run_live_phase(registry, context, {
+        "source": {"type": "carrier-pigeon"},
+        "plugins": [{"name": "NoSuchPlugin"}, LATENCY],
+    })
+
+    missing, latency = outcome.results
+    assert missing.plugin_name == "NoSuchPlugin (live)" and not missing.success
+    assert not latency.success and "Unknown live source type: carrier-pigeon" in latency.message
+    with pytest.raises(ValueError):
+        open_source({"type": "socket"}, context.data_path)
+
+
+def test_aborted_scenario_skips_post_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({"name": "live", "mode": "HIL", "scenarios": [{
+        "name": "spike",
+        "datapath": str(spiking_recording(tmp_path / "spike.jsonl")),
+        "live": {"source": {"type": "replay"}, "rolling_interval": 0,
+                 "plugins": [{**LATENCY, "abort_on_failure": True, "min_frames": 100}]},
+        "plugins": [{"name": "DataDropRateKPIPlugin"}],
+    }]}))
+
+    orchestrator = TestOrchestrator(str(config_path), plugins_dir=ROOT_DIR / "plugins", use_cache=False)
+    orchestrator.run()
+
+    live, post_run = orchestrator.results["spike"]
+    assert live.plugin_name == "LatencyKPIPlugin (live)" and live.metrics["live"]["frames"] == 100
+    assert post_run.plugin_name == "DataDropRateKPIPlugin" and not post_run.success
+    assert post_run.message == "Skipped: Live phase aborted by LatencyKPIPlugin after 100 frames"
@@ -0,0 +1,124 @@
+import socket
+import sys
+import time
+import pytest
+import yaml
+from pathlib import Path
+from core.module_launcher import ModuleLauncher, ModuleLaunchError, ModuleSpec
+from core.test_orchestrator import TestOrchestrator
+
+ROOT_DIR = Path(__file__).parents[2]
+
+# A fake SUT module: announces readiness after `delay` seconds, then idles
+FAKE_MODULE = """
+import sys, time
+time.sleep(float(sys.argv[1]))
+print("module ready", flush=True)
+time.sleep(60)
+"""
+
+
+def fake_module(name, delay=0.3, **spec):
+    return {"name": name, "backend": "process", "command": [sys.executable, "-c", FAKE_MODULE, str(delay)],
+            "ready": {"log": "module ready"}, "ready_timeout": 10, "poll_interval": 0.02, **spec}
+
+
+@pytest.fixture
+def launcher_factory(tmp_path):
+    launchers = []
+
+    def create(*modules):
+        launcher = ModuleLauncher.from_config(list(modules), log_dir=tmp_path / "modules")
+        launchers.append(launcher)
+        return launcher
+
+    yield create
+    for launcher in launchers:
+        launcher.shutdown()
+
+
+def test_modules_start_concurrently_and_report_startup(launcher_factory):
+    launcher = launcher_factory(fake_module("a", 0.5), fake_module("b", 0.5), fake_module("c", 0.5))
+
+    start = time.perf_counter()
+    launches = launcher.ensure()
+    elapsed = time.perf_counter() - start
+
+    assert list(launches) == ["a", "b", "c"]
+    assert elapsed < 1.2  # serial startup would take 1.5 s
+    assert all(0.5 <= launch.startup_s < 1.2 and not launch.reused for launch in launches.values())
+
+
+def test_warm_modules_are_reused_and_dead_ones_restarted(launcher_factory):
+    launcher = launcher_factory(fake_module("warm", 0.1), fake_module("cold", 0.1, reuse=False))
+    launcher.ensure()
+    warm_pid = launcher.running["warm"].process.pid
+    launcher.release(["warm", "cold"])
+    assert list(launcher.running) == ["warm"]
+
+    launches = launcher.ensure()
+
+    assert launches["warm"].reused and launches["warm"].startup_s == 0
+    assert not launches["cold"].reused
+    assert launcher.running["warm"].process.pid == warm_pid
+
+    launcher.running["warm"].process.kill()
+    launcher.running["warm"].process.wait()
+    assert not launcher.ensure(["warm"])["warm"].reused
+    summary = launcher.startup_summary()["warm"]
+    assert summary["starts"] == 2 and summary["reused"] == 1 and 0.1 <= summary["mean_startup_s"] <= summary["max_startup_s"]
+
+
+def test_failed_probes_name_the_module(launcher_factory, tmp_path):
+    server = socket.create_server(("127.0.0.1", 0))
+    launcher = launcher_factory(
+        fake_module("crashes", 0, command=[sys.executable, "-c", "raise SystemExit(1)"]),
+        fake_module("slow", 5, ready_timeout=0.3),
+        fake_module("listening", 0, ready={"port": server.getsockname()[1], "host": "127.0.0.1"}),
+        fake_module("touches", 0, command=[sys.executable, "-c", f"open({str(tmp_path / 'ready')!r}, 'w')"],
+                    ready={"file": str(tmp_path / "ready")}),
+    )
+
+    with pytest.raises(ModuleLaunchError) as error:
+        launcher.ensure()
+    server.close()
+
+    assert "Module crashes exited before it was ready" in str(error.value)
+    assert "Module slow not ready after 0.3s" in str(error.value)
+    assert sorted(launcher.running) == ["listening", "touches"]
+
+
+def test_invalid_specs_are_rejected():
+    assert ModuleSpec.from_config("fusion_node") == ModuleSpec(name="fusion_node")
+    for spec in [{"name": "a", "backend": "ssh"}, {"name": "a", "backend": "process"},
+                 {"name": "a", "ready": {"http": "/health"}}, {"name": "a", "image": "x"}]:
+        with pytest.raises(ValueError):
+            ModuleSpec.from_config(spec)
+    with pytest.raises(ValueError):
+        ModuleLauncher.from_config(["a", "a"])
+
+
+def test_orchestrator_keeps_modules_warm_across_scenarios(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_path = str(ROOT_DIR / "tests" / "plugins" / "post_run" / "camera_passing.jsonl")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "name": "modules", "mode": "HIL",
+        "sut_modules": [fake_module("sensor", 0.1), fake_module("broken", 0, command=[sys.executable, "-c", ""])],
+        "scenarios": [
+            {"name": f"scenario_{i}", "datapath": data_path, "modules": ["sensor"],
+             "plugins": [{"name": "LatencyKPIPlugin"}]}
+            for i in range(3)
+        ] + [{"name": "needs_broken", "datapath": data_path, "modules": ["sensor", "broken"],
+              "plugins": [{"name": "LatencyKPIPlugin"}]}],
+    }))
+
+    orchestrator = TestOrchestrator(str(config_path), plugins_dir=ROOT_DIR / "plugins", use_cache=False)
+    orchestrator.run()
+
+    assert all(orchestrator.results[f"scenario_{i}"][0].success for i in range(3))
+    broken, = orchestrator.results["needs_broken"]
+    assert not broken.success and broken.message.startswith("SUT modules failed to start: Module broken exited")
+    assert orchestrator.launcher.startup_summary()["sensor"]["starts"] == 1
+    assert orchestrator.launcher.startup_summary()["sensor"]["reused"] == 2
+    assert orchestrator.launcher.running == {}
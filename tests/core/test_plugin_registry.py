@@ -0,0 +1,340 @@
+import os
+import shutil
+import sys
+import pytest
+from pathlib import Path
+from core import plugin_registry
+from core.frame_reader import FrameReader
+from core.models import PluginPhase, PluginResult
+from core.plugin_registry import PluginRegistry
+from core.post_run_plugin import PostRunPlugin
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+FUSED_PLUGINS = [
+    {"name": "DataAlignmentJitterKPIPlugin", "config": {"data_alignment_jitter_threshold": 5}},
+    {"name": "DecisionConsistencyScorePlugin", "config": {"consistency_threshold": 0.95}},
+    {"name": "LatencyKPIPlugin", "config": {"latency_threshold": 50, "latency_field": "fusion_latency_ms"}},
+    {"name": "FusionRedundancyScorePlugin", "config": {}},
+    {"name": "SpatialCorrelationConsistencyPlugin", "config": {"spatial_correlation_threshold": 0.9}},
+]
+
+
+class CountingFrameReader(FrameReader):
+    scans = 0
+
+    def __iter__(self):
+        CountingFrameReader.scans += 1
+        return super().__iter__()
+
+
+class ExplodingPlugin(PostRunPlugin):
+    def on_frame(self, entry):
+        raise RuntimeError("boom")
+
+    def finalize(self, context):
+        return PluginResult(success=True, message="unreachable")
+
+
+@pytest.fixture
+def registry():
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    return registry
+
+
+def test_shared_scan_matches_standalone_execute(registry, setup_logger, monkeypatch):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    expected = [registry.execute_plugin(PluginPhase.POST_RUN, p["name"], context, p["config"]) for p in FUSED_PLUGINS]
+
+    CountingFrameReader.scans = 0
+    monkeypatch.setattr(plugin_registry, "FrameReader", CountingFrameReader)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    assert CountingFrameReader.scans == 1
+    assert [r.plugin_name for r in results] == [p["name"] for p in FUSED_PLUGINS]
+    for result, reference in zip(results, expected):
+        assert result.success is reference.success
+        assert result.message == reference.message
+        assert result.metrics == reference.metrics
+
+
+def test_shared_scan_isolates_failing_plugin(registry, setup_logger):
+    info = plugin_registry.PluginInfo("exploding", Path(__file__), PluginPhase.POST_RUN)
+    info.plugin_class = ExplodingPlugin
+    info.loaded = True
+    registry.plugins[PluginPhase.POST_RUN]["ExplodingPlugin"] = info
+
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, [
+        {"name": "ExplodingPlugin"},
+        {"name": "LatencyKPIPlugin"},
+        {"name": "MissingPlugin"},
+    ])
+
+    assert results[0].success is False and results[0].message == "boom"
+    assert results[1].success is True and results[1].plugin_name == "LatencyKPIPlugin"
+    assert results[2].success is False and "not found" in results[2].message
+
+
+def test_shared_scan_missing_recording_fails_every_plugin(registry, setup_logger):
+    context = create_test_context(DATA_DIR / "does_not_exist.jsonl", setup_logger)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    assert len(results) == len(FUSED_PLUGINS)
+    assert all(not r.success for r in results)
+
+
+def test_shared_scan_fills_duration(registry, setup_logger):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    assert all(r.duration_ms > 0 for r in results)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_concurrent_execution_keeps_config_order(registry, setup_logger, executor):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS + [{"name": "MissingPlugin"}],
+                                             concurrency={"executor": executor, "max_workers": 3})
+
+    assert [r.plugin_name for r in results] == [p["name"] for p in FUSED_PLUGINS] + ["MissingPlugin"]
+    for result, reference in zip(results, expected):
+        assert result.success is reference.success
+        assert result.metrics == reference.metrics
+        assert result.duration_ms > 0
+    assert not results[-1].success
+
+
+def test_unknown_executor_is_rejected(registry, setup_logger):
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    with pytest.raises(ValueError):
+        registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS,
+                                       concurrency={"executor": "gpu", "max_workers": 2})
+
+
+def test_discovery_imports_only_used_plugins(tmp_path, setup_logger):
+    shutil.copytree(ROOT_DIR / "plugins" / "post_run", tmp_path / "plugins" / "post_run")
+    registry = PluginRegistry(tmp_path / "plugins")
+    registry.discover_plugins()
+
+    plugins = registry.plugins[PluginPhase.POST_RUN]
+    assert set(plugins) >= {p["name"] for p in FUSED_PLUGINS}
+    assert not any(info.loaded for info in plugins.values())
+
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    registry.execute_phase_plugins(PluginPhase.POST_RUN, context, [{"name": "LatencyKPIPlugin"}])
+    assert [name for name, info in plugins.items() if info.loaded] == ["LatencyKPIPlugin"]
+
+
+def test_plugin_index_is_reused_until_a_file_changes(tmp_path, monkeypatch):
+    shutil.copytree(ROOT_DIR / "plugins" / "post_run", tmp_path / "plugins" / "post_run")
+    PluginRegistry(tmp_path / "plugins").discover_plugins()
+
+    parsed = []
+    scan = plugin_registry.scan_plugin_classes
+    monkeypatch.setattr(plugin_registry, "scan_plugin_classes", lambda source: parsed.append(source) or scan(source))
+    registry = PluginRegistry(tmp_path / "plugins")
+    registry.discover_plugins()
+    assert parsed == []
+    assert "LatencyKPIPlugin" in registry.plugins[PluginPhase.POST_RUN]
+
+    latency = tmp_path / "plugins" / "post_run" / "latency_kpi.py"
+    latency.write_text(latency.read_text().replace("class LatencyKPIPlugin", "class FastLatencyKPIPlugin"))
+    os.utime(latency, ns=(1, 1))
+    registry = PluginRegistry(tmp_path / "plugins")
+    registry.discover_plugins()
+    assert len(parsed) == 1
+    assert "FastLatencyKPIPlugin" in registry.plugins[PluginPhase.POST_RUN]
+    assert registry.get_plugin_class(PluginPhase.POST_RUN, "FastLatencyKPIPlugin").__name__ == "FastLatencyKPIPlugin"
+
+
+def test_scan_plugin_classes_skips_helpers():
+    source = (
+        "from core.post_run_plugin import PostRunPlugin\n"
+        "class Helper:\n    pass\n"
+        "class _Base(PostRunPlugin):\n    pass\n"
+        "class SpeedKPI(_Base):\n    pass\n"
+        "def before_run(context):\n    pass\n"
+    )
+    assert plugin_registry.scan_plugin_classes(source) == ["SpeedKPI", "_Base"]
+
+
+ENTRY_POINT_PLUGIN = '''
+from core.models import PluginResult
+from core.post_run_plugin import PostRunPlugin
+
+
+class SpeedKPIPlugin(PostRunPlugin):
+    def execute(self, context):
+        return PluginResult(success=True, message="fast enough")
+'''
+
+
+@pytest.fixture
+def installed_kpi_package(tmp_path, monkeypatch):
+    """A distribution providing SpeedKPIPlugin through an oltf.post_run entry point"""
+    site = tmp_path / "site"
+    (site / "speed_kpis").mkdir(parents=True)
+    (site / "speed_kpis" / "__init__.py").write_text("")
+    (site / "speed_kpis" / "speed.py").write_text(ENTRY_POINT_PLUGIN)
+    dist_info = site / "speed_kpis-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: speed-kpis\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text("[oltf.post_run]\nSpeedKPIPlugin = speed_kpis.speed:SpeedKPIPlugin\n")
+    monkeypatch.syspath_prepend(str(site))
+    yield site
+    for module in ("speed_kpis", "speed_kpis.speed"):
+        sys.modules.pop(module, None)
+
+
+def entry_point_registry(tmp_path):
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.manifest_path = tmp_path / "manifest.json"
+    registry.discover_plugins()
+    return registry
+
+
+def test_entry_point_plugins_are_imported_on_first_use(tmp_path, installed_kpi_package, setup_logger):
+    registry = entry_point_registry(tmp_path)
+
+    assert "SpeedKPIPlugin" in registry.plugins[PluginPhase.POST_RUN]
+    assert "speed_kpis.speed" not in sys.modules
+
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, [
+        {"name": "SpeedKPIPlugin"}, {"name": "LatencyKPIPlugin"}
+    ])
+    assert [(r.plugin_name, r.success, r.message) for r in results][0] == ("SpeedKPIPlugin", True, "fast enough")
+    assert results[1].success
+
+
+def test_entry_point_manifest_is_cached_until_packages_change(tmp_path, installed_kpi_package, monkeypatch):
+    entry_point_registry(tmp_path)
+
+    def no_metadata_scan(**kwargs):
+        raise AssertionError("manifest should come from the cache")
+
+    monkeypatch.setattr(plugin_registry.importlib.metadata, "entry_points", no_metadata_scan)
+    assert "SpeedKPIPlugin" in entry_point_registry(tmp_path).plugins[PluginPhase.POST_RUN]
+
+    # Uninstalling changes the site directory, which invalidates the manifest
+    monkeypatch.undo()
+    monkeypatch.syspath_prepend(str(installed_kpi_package))
+    shutil.rmtree(installed_kpi_package / "speed_kpis-1.0.dist-info")
+    os.utime(installed_kpi_package, ns=(1, 1))
+    assert "SpeedKPIPlugin" not in entry_point_registry(tmp_path).plugins[PluginPhase.POST_RUN]
+
+
+LIFECYCLE_PLUGINS = '''
+from core.models import PluginResult
+from core.post_run_plugin import PostRunPlugin
+
+
+class ReferenceKPIPlugin(PostRunPlugin):
+    setups = 0
+    teardowns = 0
+
+    def setup(self):
+        type(self).setups += 1
+        if self.config.get("reference") is None:
+            raise RuntimeError("no reference data")
+        self.reference = self.config["reference"]
+
+    def teardown(self):
+        type(self).teardowns += 1
+
+    def begin(self, context):
+        self.frames = 0
+
+    def on_frame(self, entry):
+        self.frames += 1
+
+    def finalize(self, context):
+        return PluginResult(success=True, message=f"{self.reference}:{self.frames}")
+'''
+
+
+def test_instances_are_set_up_once_per_config_and_torn_down(tmp_path, setup_logger):
+    (tmp_path / "plugins" / "post_run").mkdir(parents=True)
+    (tmp_path / "plugins" / "post_run" / "reference_kpi.py").write_text(LIFECYCLE_PLUGINS)
+    registry = PluginRegistry(tmp_path / "plugins", use_entry_points=False)
+    registry.discover_plugins()
+    plugin_class = registry.get_plugin_class(PluginPhase.POST_RUN, "ReferenceKPIPlugin")
+    plugins = [
+        {"name": "ReferenceKPIPlugin", "config": {"reference": 1}},
+        {"name": "ReferenceKPIPlugin", "config": {"reference": 1}},  # same config, needs its own instance
+        {"name": "ReferenceKPIPlugin", "config": {"reference": 2}},
+        {"name": "ReferenceKPIPlugin", "config": {}},
+    ]
+
+    for data_file in ["camera_passing.jsonl", "camera_failing.jsonl", "fused_data_with_kpis.jsonl"]:
+        context = create_test_context(DATA_DIR / data_file, setup_logger)
+        frames = len((DATA_DIR / data_file).read_text().splitlines())
+        results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins)
+        assert [r.message for r in results[:3]] == [f"1:{frames}", f"1:{frames}", f"2:{frames}"]
+        assert not results[3].success and "setup failed" in results[3].message
+
+    # 3 pooled instances set up once each; the failing config is retried per scenario
+    assert plugin_class.setups == 3 + 3
+    registry.teardown_plugins()
+    assert plugin_class.teardowns == 3
+
+
+WORKER_SETUP_PLUGIN = '''
+import os
+from core.models import PluginResult
+from core.post_run_plugin import PostRunPlugin
+
+
+class WorkerSetupKPIPlugin(PostRunPlugin):
+    def setup(self):
+        with open(self.config["setup_log"], "a") as f:
+            f.write(f"{os.getpid()}\\n")
+
+    def begin(self, context):
+        self.frames = 0
+
+    def on_frame(self, entry):
+        self.frames += 1
+
+    def partial(self):
+        return self.frames
+
+    def merge(self, partial):
+        self.frames += partial
+
+    def finalize(self, context):
+        return PluginResult(success=True, message=str(self.frames))
+'''
+
+
+@pytest.mark.parametrize("concurrency", [
+    {"executor": "process", "max_workers": 2},
+    {"shards": 2, "min_shard_bytes": 1},
+])
+def test_worker_processes_keep_set_up_instances_across_scenarios(tmp_path, setup_logger, concurrency):
+    (tmp_path / "plugins" / "post_run").mkdir(parents=True)
+    (tmp_path / "plugins" / "post_run" / "worker_setup_kpi.py").write_text(WORKER_SETUP_PLUGIN)
+    registry = PluginRegistry(tmp_path / "plugins", use_entry_points=False)
+    registry.discover_plugins()
+    setup_log = tmp_path / "setups.log"
+    plugins = [{"name": "WorkerSetupKPIPlugin", "config": {"setup_log": str(setup_log), "id": i}} for i in range(2)]
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    frames = len((DATA_DIR / "camera_passing.jsonl").read_text().splitlines())
+
+    try:
+        for _ in range(3):
+            results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins, concurrency)
+            assert [r.message for r in results] == [str(frames)] * 2
+    finally:
+        registry.teardown_plugins()
+
+    # Each of the 2 workers sets up each config at most once for the run, not once per scenario
+    worker_setups = [pid for pid in setup_log.read_text().split() if pid != str(os.getpid())]
+    assert 2 <= len(worker_setups) <= 4
+    assert len(set(worker_setups)) <= 2
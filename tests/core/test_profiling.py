@@ -0,0 +1,100 @@
+import psutil
+import pstats
+import pytest
+from pathlib import Path
+from core.models import PluginPhase, PluginProfile, PluginResult
+from core.plugin_registry import PluginRegistry
+from core.profiling import ResourceProbe, peak_rss_bytes, slowest_cells
+from core.result_cache import ResultCache
+from dashboards.report_generator import generate_profile_table
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+DATA_FILE = DATA_DIR / "fused_data_with_kpis.jsonl"
+
+FUSED_PLUGINS = [
+    {"name": "LatencyKPIPlugin", "config": {"latency_field": "fusion_latency_ms"}},
+    {"name": "DecisionConsistencyScorePlugin", "config": {}},
+    {"name": "SpatialCorrelationConsistencyPlugin", "config": {}},
+]
+
+
+@pytest.fixture
+def registry():
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    return registry
+
+
+def test_shared_scan_profiles_every_plugin(registry, setup_logger):
+    context = create_test_context(DATA_FILE, setup_logger)
+
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    frames = len(DATA_FILE.read_text().splitlines())
+    for result in results:
+        assert result.profile.mode == "scan"
+        assert result.profile.frames == frames
+        assert result.profile.bytes_read == DATA_FILE.stat().st_size
+        assert result.profile.wall_ms == result.duration_ms > 0
+        assert 0 <= result.profile.cpu_ms <= result.profile.wall_ms * 1.5
+
+
+def test_cached_results_are_profiled_as_cache_hits(registry, setup_logger, tmp_path):
+    registry.result_cache = ResultCache(tmp_path / "cache")
+    context = create_test_context(DATA_FILE, setup_logger)
+
+    registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+    cached = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    assert [result.profile.mode for result in cached] == ["result_cache"] * len(FUSED_PLUGINS)
+    assert all(result.profile.frames == 0 for result in cached)
+
+
+def test_profile_dir_writes_pstats_per_plugin(registry, setup_logger, tmp_path):
+    context = create_test_context(DATA_FILE, setup_logger)
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS)
+
+    registry.profile_dir = tmp_path / "profiles"
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, FUSED_PLUGINS,
+                                             {"executor": "thread", "max_workers": 2})
+
+    assert [(r.success, r.message) for r in results] == [(r.success, r.message) for r in expected]
+    for position, plugin_config in enumerate(FUSED_PLUGINS):
+        stats_path = tmp_path / "profiles" / "fused_data_with_kpis" / f"{position}-{plugin_config['name']}.pstats"
+        functions = {function for _, _, function in pstats.Stats(str(stats_path)).stats}
+        assert "on_frame" in functions
+
+
+def test_resource_probe_measures_cpu_and_memory():
+    # the peak only grows once the process exceeds its previous high-water mark
+    headroom = peak_rss_bytes() - psutil.Process().memory_info().rss
+    probe = ResourceProbe()
+    hog = b"x" * (headroom + 64 * 1024 * 1024)
+    sum(range(200000))
+
+    profile = probe.profile("execute", frames=3)
+
+    assert profile.cpu_ms > 0 and profile.wall_ms >= profile.cpu_ms * 0.5
+    assert profile.peak_rss_delta_mb >= 32
+    assert profile.frames == 3
+    del hog
+
+
+def test_profile_round_trips_and_slowest_cells_are_ranked():
+    def result(name, wall_ms):
+        return PluginResult(success=True, message="", plugin_name=name,
+                            profile=PluginProfile(wall_ms=wall_ms, frames=10, mode="scan"))
+
+    restored = PluginResult.from_dict(result("A", 1.5).to_dict())
+    assert restored.profile == PluginProfile(wall_ms=1.5, frames=10, mode="scan")
+
+    results = {"s1": [result("A", 1.0), result("B", 30.0)],
+               "s2": [result("A", 20.0), PluginResult(success=False, message="Plugin not found", plugin_name="C")]}
+    assert [(s, r.plugin_name) for s, r in slowest_cells(results, 2)] == [("s1", "B"), ("s2", "A")]
+    html = generate_profile_table(results)
+    assert html.index("<td>B</td>") < html.index("<td>A</td>")
+
+    results["s<3>"] = [result("A&B", 40.0)]
+    assert "<td>s&lt;3&gt;</td><td>A&amp;B</td>" in generate_profile_table(results)
@@ -0,0 +1,184 @@
+import shutil
+import pytest
+from pathlib import Path
+from core import plugin_registry
+from core.models import PluginPhase, PluginResult
+from core.plugin_registry import PluginRegistry
+from core.result_cache import AggregateCache, ResultCache
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+PLUGINS = [
+    {"name": "LatencyKPIPlugin", "config": {"latency_threshold": 50}},
+    {"name": "DataDropRateKPIPlugin", "config": {}},
+]
+
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    target = tmp_path / "plugins"
+    shutil.copytree(ROOT_DIR / "plugins" / "post_run", target / "post_run")
+    return target
+
+
+def cached_registry(plugins_dir, cache_dir, max_bytes=10 ** 9):
+    registry = PluginRegistry(plugins_dir)
+    registry.discover_plugins()
+    registry.result_cache = ResultCache(cache_dir, max_bytes)
+    return registry
+
+
+def executed_plugins(registry, monkeypatch):
+    """Record which plugins actually run instead of being answered from the cache"""
+    executed = []
+    original = registry._execute_phase_plugins
+
+    def recording(phase, context, plugin_configs, concurrency=None):
+        executed.extend(p["name"] for p in plugin_configs)
+        return original(phase, context, plugin_configs, concurrency)
+
+    monkeypatch.setattr(registry, "_execute_phase_plugins", recording)
+    return executed
+
+
+def summarize(results):
+    return [(r.plugin_name, r.success, r.message, r.metrics) for r in results]
+
+
+def test_unchanged_run_is_served_from_cache(tmp_path, plugins_dir, setup_logger, monkeypatch):
+    registry = cached_registry(plugins_dir, tmp_path / "cache")
+    context = create_test_context(DATA_DIR / "camera_failing.jsonl", setup_logger)
+    first = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+
+    executed = executed_plugins(registry, monkeypatch)
+    second = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+
+    assert executed == []
+    assert summarize(second) == summarize(first)
+
+    changed = [{"name": "LatencyKPIPlugin", "config": {"latency_threshold": 80}}, PLUGINS[1]]
+    third = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, changed)
+    assert executed == ["LatencyKPIPlugin"]
+    assert third[0].success is True and summarize(third[1:]) == summarize(first[1:])
+
+
+def test_execute_plugin_uses_cache(tmp_path, plugins_dir, setup_logger, monkeypatch):
+    registry = cached_registry(plugins_dir, tmp_path / "cache")
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    first = registry.execute_plugin(PluginPhase.POST_RUN, "LatencyKPIPlugin", context, {})
+
+    monkeypatch.setattr(registry, "_execute_plugin_uncached", pytest.fail)
+    second = registry.execute_plugin(PluginPhase.POST_RUN, "LatencyKPIPlugin", context, {})
+    assert summarize([second]) == summarize([first])
+
+
+def test_data_and_source_changes_invalidate(tmp_path, plugins_dir, setup_logger, monkeypatch):
+    data_file = tmp_path / "recording.jsonl"
+    shutil.copy(DATA_DIR / "camera_passing.jsonl", data_file)
+    context = create_test_context(data_file, setup_logger)
+    cached_registry(plugins_dir, tmp_path / "cache").execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+
+    with open(data_file, "a") as f:
+        f.write('{"timestamp": 999999, "latency_ms": 99.0}\n')
+    registry = cached_registry(plugins_dir, tmp_path / "cache")
+    executed = executed_plugins(registry, monkeypatch)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+    assert executed == ["LatencyKPIPlugin", "DataDropRateKPIPlugin"]
+    assert results[0].metrics["latency_ms"]["max"] == 99.0
+
+    latency_source = plugins_dir / "post_run" / "latency_kpi.py"
+    latency_source.write_text(latency_source.read_text() + "\n# edited\n")
+    registry = cached_registry(plugins_dir, tmp_path / "cache")
+    executed = executed_plugins(registry, monkeypatch)
+    registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+    assert executed == ["LatencyKPIPlugin"]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=1000)
+    result = PluginResult(success=True, message="x" * 300, plugin_name="P")
+    for key in ("a", "b", "c"):
+        cache.put(key, result)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+    cache.put("d", result)  # "b" was just read, so "c" is the oldest now
+    assert cache.get("c") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
+
+
+def test_missing_recording_is_not_cached(tmp_path, plugins_dir, setup_logger):
+    registry = cached_registry(plugins_dir, tmp_path / "cache")
+    context = create_test_context(tmp_path / "missing.jsonl", setup_logger)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+    assert not any(r.success for r in results)
+    assert not (tmp_path / "cache" / "entries").exists()
+
+
+def test_exception_results_are_not_cached(tmp_path, plugins_dir, setup_logger, monkeypatch):
+    registry = cached_registry(plugins_dir, tmp_path / "cache")
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    plugin_class = registry.get_plugin_class(PluginPhase.POST_RUN, "LatencyKPIPlugin")
+
+    def flaky_begin(self, context):
+        raise OSError("transient read error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(plugin_class, "begin", flaky_begin)
+        failed = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+    assert failed[0].error and "transient read error" in failed[0].message
+
+    executed = executed_plugins(registry, monkeypatch)
+    retried = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, PLUGINS)
+    assert executed == ["LatencyKPIPlugin"]
+    assert retried[0].success is True and not retried[0].error
+
+
+RETHRESHOLDED = [
+    ("LatencyKPIPlugin", {"latency_field": "fusion_latency_ms"}, {"latency_threshold": 10, "latency_statistic": "p95"}),
+    ("DataAlignmentJitterKPIPlugin", {}, {"data_alignment_jitter_threshold": 2}),
+    ("DecisionConsistencyScorePlugin", {}, {"consistency_threshold": 0.1}),
+    ("FusionRedundancyScorePlugin", {}, {"min_redundancy_score": 0.99}),
+    ("SpatialCorrelationConsistencyPlugin", {}, {"spatial_correlation_threshold": 0.1}),
+    ("DataDropRateKPIPlugin", {"expected_interval": 50}, {"drop_rate_threshold": 0.9}),
+]
+
+
+def aggregate_registry(plugins_dir, cache_dir):
+    registry = PluginRegistry(plugins_dir)
+    registry.discover_plugins()
+    registry.aggregate_cache = AggregateCache(cache_dir)
+    return registry
+
+
+@pytest.mark.parametrize("plugin_name, config, thresholds", RETHRESHOLDED)
+def test_threshold_change_rejudges_cached_aggregate(tmp_path, plugins_dir, setup_logger, monkeypatch,
+                                                    plugin_name, config, thresholds):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    registry = aggregate_registry(plugins_dir, tmp_path / "cache")
+    registry.execute_phase_plugins(PluginPhase.POST_RUN, context, [{"name": plugin_name, "config": config}])
+
+    changed = [{"name": plugin_name, "config": {**config, **thresholds}}]
+    expected = PluginRegistry(plugins_dir)
+    expected.discover_plugins()
+    expected = expected.execute_phase_plugins(PluginPhase.POST_RUN, context, changed)
+
+    monkeypatch.setattr(plugin_registry, "FrameReader", None)  # any scan would fail
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, changed)
+    assert summarize(results) == summarize(expected)
+
+
+def test_non_threshold_change_rescans(tmp_path, plugins_dir, setup_logger, monkeypatch):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    registry = aggregate_registry(plugins_dir, tmp_path / "cache")
+    registry.execute_phase_plugins(PluginPhase.POST_RUN, context, [{"name": "LatencyKPIPlugin"}])
+
+    scans = []
+    original = registry._execute_shared_scan
+    monkeypatch.setattr(registry, "_execute_shared_scan", lambda *args: scans.append(1) or original(*args))
+    result = registry.execute_phase_plugins(
+        PluginPhase.POST_RUN, context, [{"name": "LatencyKPIPlugin", "config": {"latency_field": "fusion_latency_ms"}}])[0]
+    assert scans == [1]
+    assert "fusion_latency_ms" in result.metrics
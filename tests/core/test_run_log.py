@@ -0,0 +1,103 @@
+import re
+import pytest
+import yaml
+from pathlib import Path
+import core.test_orchestrator as test_orchestrator
+from core.models import PluginResult, ScenarioConfig
+from core.run_log import RunLog
+from core.test_orchestrator import TestOrchestrator
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+DASHBOARD = Path("reports") / "dashboards" / "regression_dashboard.html"
+
+
+def scenario_config(name, threshold=50, datapath=DATA_DIR / "camera_passing.jsonl"):
+    return ScenarioConfig(name=name, datapath=datapath,
+                          plugins=[{"name": "LatencyKPIPlugin", "config": {"latency_threshold": threshold}}])
+
+
+def write_config(tmp_path, names):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"name": "resumable", "mode": "SIL", "scenarios": [
+        {"name": name, "datapath": str(DATA_DIR / "camera_passing.jsonl"), "plugins": [{"name": "LatencyKPIPlugin"}]}
+        for name in names
+    ]}))
+    return str(path)
+
+
+def test_completed_reuses_logged_results_of_unchanged_scenarios(tmp_path):
+    run_log = RunLog(tmp_path / "run_log.jsonl")
+    run_log.reset()
+    result = PluginResult(success=True, message="ok", metrics={"avg": 1.5}, plugin_name="LatencyKPIPlugin")
+    run_log.append(scenario_config("a"), [result])
+    run_log.append(scenario_config("b"), [result])
+    with open(run_log.path, "a") as f:
+        f.write('{"scenario": "c", "plugi')  # torn by a crash
+
+    completed = run_log.completed([scenario_config("a"), scenario_config("b", threshold=10), scenario_config("c")])
+
+    assert list(completed) == ["a"]
+    assert completed["a"][0].to_dict() == result.to_dict()
+
+
+def test_completed_requires_the_same_recording_and_no_errors(tmp_path):
+    recording = tmp_path / "recording.jsonl"
+    recording.write_text((DATA_DIR / "camera_passing.jsonl").read_text())
+    run_log = RunLog(tmp_path / "run_log.jsonl")
+    run_log.reset()
+    result = PluginResult(success=True, message="ok", plugin_name="LatencyKPIPlugin")
+    run_log.append(scenario_config("same", datapath=recording), [result])
+    run_log.append(scenario_config("moved", datapath=recording), [result])
+    run_log.append(scenario_config("timed_out", datapath=recording),
+                   test_orchestrator.failed_scenario_results(scenario_config("timed_out"), "Scenario timed out"))
+    scenarios = [scenario_config("same", datapath=recording),
+                 scenario_config("moved", datapath=DATA_DIR / "camera_passing.jsonl"),
+                 scenario_config("timed_out", datapath=recording)]
+
+    assert list(run_log.completed(scenarios)) == ["same"]
+
+    with open(recording, "a") as f:
+        f.write('{"timestamp": 99999}\n')  # re-recorded in place
+    assert run_log.completed(scenarios) == {}
+
+
+def test_resume_skips_logged_scenarios(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    plugins_dir = ROOT_DIR / "plugins"
+    TestOrchestrator(write_config(tmp_path, ["first", "second"]), plugins_dir=plugins_dir).run()
+
+    executed = []
+    execute_scenario = test_orchestrator.execute_scenario
+
+    def counting(registry, config, scenario, *args):
+        executed.append(scenario.name)
+        return execute_scenario(registry, config, scenario, *args)
+
+    monkeypatch.setattr(test_orchestrator, "execute_scenario", counting)
+    orchestrator = TestOrchestrator(write_config(tmp_path, ["first", "third", "second"]), plugins_dir=plugins_dir,
+                                    resume=True)
+    orchestrator.run()
+
+    assert executed == ["third"]
+    assert list(orchestrator.results) == ["first", "third", "second"]
+    assert all(r.success for results in orchestrator.results.values() for r in results)
+    assert len(re.findall(r"<tr><td>(first|second|third)</td><td class", DASHBOARD.read_text())) == 3
+
+
+def test_interrupted_run_keeps_finished_scenarios(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    execute_scenario = test_orchestrator.execute_scenario
+
+    def interrupted(registry, config, scenario, *args):
+        if scenario.name == "second":
+            raise KeyboardInterrupt
+        return execute_scenario(registry, config, scenario, *args)
+
+    monkeypatch.setattr(test_orchestrator, "execute_scenario", interrupted)
+    config_path = write_config(tmp_path, ["first", "second"])
+    with pytest.raises(KeyboardInterrupt):
+        TestOrchestrator(config_path, plugins_dir=ROOT_DIR / "plugins").run()
+
+    assert list(RunLog(Path("reports") / "run_log.jsonl").load()) == ["first"]
+    assert "1 of 2 scenarios completed" in DASHBOARD.read_text()
@@ -0,0 +1,91 @@
+import shutil
+import pytest
+import yaml
+from pathlib import Path
+from core.test_orchestrator import TestOrchestrator
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+MISBEHAVING_PLUGINS = '''
+import os
+import time
+from core.models import PluginResult
+from core.post_run_plugin import PostRunPlugin
+
+
+class SleepyKPIPlugin(PostRunPlugin):
+    def execute(self, context):
+        time.sleep(self.config.get("sleep_s", 0))
+        return PluginResult(success=True, message="slept")
+
+
+class CrashingKPIPlugin(PostRunPlugin):
+    def execute(self, context):
+        os._exit(3)
+'''
+
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    target = tmp_path / "plugins"
+    shutil.copytree(ROOT_DIR / "plugins" / "post_run", target / "post_run")
+    (target / "post_run" / "sleepy_kpi.py").write_text(MISBEHAVING_PLUGINS.replace("class CrashingKPIPlugin", "class _Unused"))
+    (target / "post_run" / "crashing_kpi.py").write_text(MISBEHAVING_PLUGINS.replace("class SleepyKPIPlugin", "class _Unused"))
+    return target
+
+
+def write_config(tmp_path, scenarios, **extra):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"name": "parallel", "mode": "SIL", "scenarios": scenarios, **extra}))
+    return str(path)
+
+
+def scenario(name, data_file, *plugins):
+    return {"name": name, "datapath": str(DATA_DIR / data_file), "plugins": list(plugins)}
+
+
+def summarize(results):
+    return {name: [(r.plugin_name, r.success, r.message, r.metrics) for r in rs] for name, rs in results.items()}
+
+
+def test_parallel_run_matches_serial_run_in_config_order(tmp_path, plugins_dir, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scenarios = [
+        scenario(f"scenario_{i}", data_file,
+                 {"name": "LatencyKPIPlugin", "config": {"latency_field": field}},
+                 {"name": "DataDropRateKPIPlugin", "config": {"expected_interval": 100}})
+        for i, (data_file, field) in enumerate([
+            ("camera_passing.jsonl", "latency_ms"),
+            ("fused_data_with_kpis.jsonl", "fusion_latency_ms"),
+            ("radar_data_with_kpis.jsonl", "latency_ms"),
+            ("camera_failing.jsonl", "latency_ms"),
+        ])
+    ]
+    config_path = write_config(tmp_path, scenarios)
+
+    serial = TestOrchestrator(config_path, plugins_dir=plugins_dir)
+    serial.run()
+    parallel = TestOrchestrator(config_path, workers=3, plugins_dir=plugins_dir, use_cache=False)
+    parallel.run()
+
+    assert list(parallel.results) == [s["name"] for s in scenarios]
+    assert summarize(parallel.results) == summarize(serial.results)
+    assert (tmp_path / "reports" / "dashboards" / "regression_dashboard.html").exists()
+
+
+def test_timeout_and_crash_stay_in_their_scenario(tmp_path, plugins_dir, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_path = write_config(tmp_path, [
+        scenario("hangs", "camera_passing.jsonl", {"name": "SleepyKPIPlugin", "config": {"sleep_s": 30}}),
+        scenario("crashes", "camera_passing.jsonl", {"name": "CrashingKPIPlugin"}),
+        scenario("healthy", "camera_passing.jsonl", {"name": "LatencyKPIPlugin"}, {"name": "SleepyKPIPlugin"}),
+    ], scenario_timeout=1)
+
+    orchestrator = TestOrchestrator(config_path, workers=2, plugins_dir=plugins_dir)
+    orchestrator.run()
+
+    hangs, crashes, healthy = orchestrator.results.values()
+    assert not hangs[0].success and "timed out" in hangs[0].message
+    assert not crashes[0].success and crashes[0].plugin_name == "CrashingKPIPlugin"
+    assert [r.success for r in healthy] == [True, True]
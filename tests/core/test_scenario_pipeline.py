@@ -0,0 +1,103 @@
+import shutil
+import time
+import pytest
+import yaml
+from pathlib import Path
+from core.test_orchestrator import TestOrchestrator, pipeline_limits
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+SLEEPY_PLUGIN = '''
+import time
+from core.models import PluginResult
+from core.post_run_plugin import PostRunPlugin
+
+
+class SleepyKPIPlugin(PostRunPlugin):
+    def execute(self, context):
+        time.sleep(self.config.get("sleep_s", 0))
+        return PluginResult(success=True, message="slept")
+'''
+
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    target = tmp_path / "plugins"
+    shutil.copytree(ROOT_DIR / "plugins", target, ignore=shutil.ignore_patterns("__pycache__"))
+    (target / "post_run" / "sleepy_kpi.py").write_text(SLEEPY_PLUGIN)
+    return target
+
+
+def write_config(tmp_path, scenarios, **extra):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"name": "pipelined", "mode": "SIL", "scenarios": scenarios, **extra}))
+    return str(path)
+
+
+def live_scenario(name, data_file, field, frames_per_s=None, *plugins):
+    return {
+        "name": name,
+        "datapath": str(DATA_DIR / data_file),
+        "live": {"source": {"type": "replay", "frames_per_s": frames_per_s},
+                 "plugins": [{"name": "LatencyKPIPlugin", "config": {"latency_field": field}}]},
+        "plugins": [{"name": "LatencyKPIPlugin", "config": {"latency_field": field}},
+                    {"name": "DataDropRateKPIPlugin", "config": {"expected_interval": 100}}, *plugins],
+    }
+
+
+def summarize(results):
+    def timeless(metrics):
+        # Rolling verdicts carry the seconds into the live phase at which they changed
+        live = metrics.get("live")
+        if live is None:
+            return metrics
+        return {**metrics, "live": {**live, "rolling": [(frames, verdict) for frames, _, verdict in live["rolling"]]}}
+    return {name: [(r.plugin_name, r.success, r.message, timeless(r.metrics)) for r in rs]
+            for name, rs in results.items()}
+
+
+def test_pipelined_run_matches_serial_run_in_config_order(tmp_path, plugins_dir, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    scenarios = [
+        live_scenario("fused", "fused_data_with_kpis.jsonl", "fusion_latency_ms"),
+        live_scenario("radar", "radar_data_with_kpis.jsonl", "latency_ms"),
+        live_scenario("camera_failing", "camera_failing.jsonl", "latency_ms"),
+        live_scenario("camera", "camera_data_with_kpis.jsonl", "latency_ms"),
+    ]
+
+    serial = TestOrchestrator(write_config(tmp_path, scenarios), plugins_dir=plugins_dir, use_cache=False)
+    serial.run()
+    pipelined = TestOrchestrator(write_config(tmp_path, scenarios, pipeline={"replay": 2, "post_run": 2}),
+                                 plugins_dir=plugins_dir, use_cache=False)
+    pipelined.run()
+
+    assert list(pipelined.results) == [s["name"] for s in scenarios]
+    assert summarize(pipelined.results) == summarize(serial.results)
+    assert pipelined.results["fused"][0].plugin_name == "LatencyKPIPlugin (live)"
+
+
+def test_replay_overlaps_post_run_of_previous_scenario(tmp_path, plugins_dir, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Each scenario replays its 90 frames for ~0.6s, then its post-run plugins sleep 0.6s:
+    # serially that is at least 4.8s, pipelined about 3s
+    sleepy = {"name": "SleepyKPIPlugin", "config": {"sleep_s": 0.6}}
+    scenarios = [live_scenario(f"scenario_{i}", "fused_data_with_kpis.jsonl", "fusion_latency_ms", 150, sleepy)
+                 for i in range(4)]
+    orchestrator = TestOrchestrator(write_config(tmp_path, scenarios, pipeline={"replay": 1, "post_run": 1}),
+                                    plugins_dir=plugins_dir, use_cache=False)
+
+    start = time.monotonic()
+    orchestrator.run()
+    elapsed = time.monotonic() - start
+
+    assert [results[-1].message for results in orchestrator.results.values()] == ["slept"] * 4
+    assert elapsed < 4.4
+
+
+def test_pipeline_limits_are_validated():
+    assert pipeline_limits({"post_run": 3}) == {"replay": 1, "post_run": 3}
+    with pytest.raises(ValueError, match="Unknown pipeline stages: evaluate"):
+        pipeline_limits({"evaluate": 2})
+    with pytest.raises(ValueError, match="positive integer"):
+        pipeline_limits({"replay": 0})
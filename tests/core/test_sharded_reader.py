@@ -0,0 +1,86 @@
+import json
+import pytest
+from pathlib import Path
+from core.frame_reader import FrameReader
+from core.models import PluginPhase
+from core.plugin_registry import PluginRegistry
+from core.sharded_reader import shard_ranges
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+SHARDS = {"shards": 3, "min_shard_bytes": 1}
+
+
+@pytest.fixture
+def registry():
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    return registry
+
+
+def write_recording(path, timestamps):
+    with open(path, "w") as f:
+        for i, ts in enumerate(timestamps):
+            f.write(json.dumps({"timestamp": ts, "latency_ms": 30 + i % 7}) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("shards", [1, 2, 3, 7, 50])
+def test_shard_ranges_cover_every_line_once(shards):
+    data_file = DATA_DIR / "fused_data_with_kpis.jsonl"
+    ranges = shard_ranges(data_file, shards)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == data_file.stat().st_size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+    lines = [line for start, end in ranges for line, _, _ in FrameReader(data_file, start, end)]
+    assert lines == data_file.read_bytes().splitlines(keepends=True)
+
+
+def test_shard_ranges_respect_min_shard_bytes():
+    data_file = DATA_DIR / "fused_data_with_kpis.jsonl"
+    assert shard_ranges(data_file, 8, min_shard_bytes=10 ** 9) == [(0, data_file.stat().st_size)]
+
+
+def test_sharded_scan_matches_serial_scan(registry, setup_logger):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    plugins = [{"name": name} for name in sorted(registry.plugins[PluginPhase.POST_RUN])]
+
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins, SHARDS)
+
+    for result, reference in zip(results, expected):
+        assert result.plugin_name == reference.plugin_name
+        assert result.success is reference.success
+        assert result.message == reference.message
+        # Sums of shard partials may differ from one left-to-right sum in the last bits
+        assert result.metrics.keys() == reference.metrics.keys()
+        for name, metrics in result.metrics.items():
+            assert metrics == pytest.approx(reference.metrics[name], rel=1e-12)
+
+
+def test_drop_rate_counts_gaps_across_shard_boundaries(registry, setup_logger, tmp_path):
+    timestamps = [100 * i for i in range(60) if i not in (20, 21, 40)]
+    context = create_test_context(write_recording(tmp_path / "gaps.jsonl", timestamps), setup_logger)
+    plugins = [{"name": "DataDropRateKPIPlugin"}]
+
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins)[0]
+    for shards in (2, 3, 4, 9):
+        result = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins,
+                                                {"shards": shards, "min_shard_bytes": 1})[0]
+        assert result.metrics == expected.metrics
+        assert result.metrics["data_drop_rate"]["drops"] == 3
+
+
+def test_out_of_order_shards_fall_back_to_serial_scan(registry, setup_logger, tmp_path):
+    timestamps = [100 * i for i in range(30, 60)] + [100 * i for i in range(30)]
+    context = create_test_context(write_recording(tmp_path / "unordered.jsonl", timestamps), setup_logger)
+    plugins = [{"name": "DataDropRateKPIPlugin"}, {"name": "LatencyKPIPlugin"}]
+
+    expected = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins)
+    results = registry.execute_phase_plugins(PluginPhase.POST_RUN, context, plugins, SHARDS)
+
+    assert results[0].metrics == expected[0].metrics
+    assert results[0].metrics["data_drop_rate"]["drops"] == 0
+    assert results[1].metrics["latency_ms"]["max"] == expected[1].metrics["latency_ms"]["max"]
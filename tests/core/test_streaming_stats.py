@@ -0,0 +1,133 @@
+import random
+import statistics
+import time
+import pytest
+import numpy as np
+from core.streaming_stats import QuantileHistogram, RunningStats, StreamingStats
+
+
+def random_values(seed):
+    rng = random.Random(seed)
+    values = [rng.lognormvariate(3, 1) for _ in range(rng.randint(1, 5000))]
+    values += [rng.randint(-50, 50) for _ in range(rng.randint(0, 500))]
+    rng.shuffle(values)
+    return values
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_running_stats_match_builtins(seed):
+    values = random_values(seed)
+    stats = RunningStats()
+    for value in values:
+        stats.update(value)
+
+    assert stats.count == len(values)
+    assert stats.max == max(values)
+    assert stats.min == min(values)
+    assert stats.average == sum(values) / len(values)
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_update_matches_streaming(seed):
+    values = random_values(seed)
+    streamed, batched = StreamingStats(), StreamingStats()
+    for value in values:
+        streamed.update(value)
+    batched.update_many(np.asarray(values[:100], dtype=np.float64))
+    batched.update_many(np.asarray(values[100:], dtype=np.float64))
+
+    assert batched.running.max == streamed.running.max
+    assert batched.running.average == streamed.running.average
+    assert batched.running.std == pytest.approx(streamed.running.std)
+    assert batched.histogram.positive == streamed.histogram.positive
+    assert batched.histogram.negative == streamed.histogram.negative
+    assert batched.histogram.zero == streamed.histogram.zero
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quantiles_within_relative_error(seed):
+    values = random_values(seed)
+    stats = StreamingStats()
+    for value in values:
+        stats.update(value)
+
+    for q in (0.0, 0.5, 0.95, 0.99, 1.0):
+        expected = np.percentile(values, q * 100)
+        assert stats.quantile(q) == pytest.approx(expected, rel=2 ** -8, abs=1e-12)
+    assert stats.quantile(0.0) == min(values)
+    assert stats.quantile(1.0) == max(values)
+
+
+def test_merge_matches_single_pass():
+    values = random_values(42)
+    single, left, right = StreamingStats(), StreamingStats(), StreamingStats()
+    for i, value in enumerate(values):
+        single.update(value)
+        (left if i % 2 else right).update(value)
+    left.merge(right)
+
+    assert left.count == single.count
+    assert left.running.max == single.running.max
+    assert left.running.average == pytest.approx(single.running.average)
+    assert left.running.variance == pytest.approx(single.running.variance)
+    assert left.summary()["p95"] == single.summary()["p95"]
+
+
+def test_histogram_memory_is_bounded():
+    histogram = QuantileHistogram()
+    histogram.update_many(np.random.default_rng(0).uniform(30.0, 70.0, 200_000))
+    assert histogram.count == 200_000
+    assert len(histogram.positive) <= 2 * histogram.sub_buckets
+
+
+def test_statistic_names():
+    stats = StreamingStats()
+    assert stats.quantile(0.5) is None
+    for value in (10, 20, 30, 40):
+        stats.update(value)
+
+    assert stats.statistic("max") == 40
+    assert stats.statistic("min") == 10
+    assert stats.statistic("avg") == 25
+    assert stats.statistic("p50") == pytest.approx(25, rel=2 ** -8)
+    with pytest.raises(ValueError):
+        stats.statistic("median")
+
+
+@pytest.mark.parametrize("values", [
+    [58.8, 60.2],
+    [10.0, 20.0, 30.0, 40.0, 45.0],
+    [1.0] * 99 + [1000.0],
+    np.random.default_rng(1).lognormal(3, 2, 37).tolist(),
+])
+def test_percentiles_match_numpy(values):
+    stats = StreamingStats()
+    for value in values:
+        stats.update(value)
+
+    for name in ("p50", "p95", "p99"):
+        expected = np.percentile(values, float(name[1:]))
+        assert stats.statistic(name) == pytest.approx(expected, rel=2 ** -8), name
+
+
+def test_buffered_updates_are_cheaper_than_welford():
+    # The shared scan calls update() once per frame and plugin; it must not cost
+    # more than the per-value Welford update it replaced
+    values = np.random.default_rng(0).normal(40.0, 5.0, 300_000).tolist()
+    start = time.perf_counter()
+    welford = RunningStats()
+    for value in values:
+        welford.update(value)
+    welford_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = StreamingStats()
+    for value in values:
+        stats.update(value)
+    summary = stats.summary()
+    buffered_s = time.perf_counter() - start
+
+    assert summary["count"] == len(values) and summary["max"] == max(values)
+    assert summary["avg"] == sum(values) / len(values)
+    assert buffered_s < welford_s
@@ -0,0 +1,128 @@
+import shutil
+import pytest
+import yaml
+from pathlib import Path
+from core import plugin_registry
+from core.models import PluginPhase, ScenarioConfig
+from core.plugin_registry import PluginRegistry
+from core.test_orchestrator import TestOrchestrator
+from core.threshold_sweep import sweep_scenario, sweep_values, validate_sweep
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[2]
+DATA_DIR = ROOT_DIR / "tests" / "plugins" / "post_run"
+
+FUSED_PLUGINS = [
+    {"name": "LatencyKPIPlugin", "config": {"latency_field": "fusion_latency_ms"}},
+    {"name": "DecisionConsistencyScorePlugin", "config": {}},
+    {"name": "FusionRedundancyScorePlugin", "config": {}},
+    {"name": "SpatialCorrelationConsistencyPlugin", "config": {}},
+    {"name": "DataDropRateKPIPlugin", "config": {"expected_interval": 100}},
+]
+
+SWEEP = {
+    "LatencyKPIPlugin": {"latency_threshold": {"start": 60, "stop": 120, "step": 20},
+                         "latency_statistic": ["max", "avg", "p95"]},
+    "DecisionConsistencyScorePlugin": {"consistency_threshold": [0.9, 0.953125, 0.96]},
+    "FusionRedundancyScorePlugin": {"min_redundancy_score": {"start": 0.1, "stop": 0.9, "step": 0.2}},
+    "SpatialCorrelationConsistencyPlugin": {},
+    "DataDropRateKPIPlugin": {"drop_rate_threshold": [0.0, 0.5, 1.0]},
+}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    target = tmp_path / "plugins"
+    shutil.copytree(ROOT_DIR / "plugins" / "post_run", target / "post_run")
+    registry = PluginRegistry(target)
+    registry.discover_plugins()
+    return registry
+
+
+def test_sweep_values():
+    assert sweep_values([1, 2, 5]) == [1, 2, 5]
+    assert sweep_values(0.5) == [0.5]
+    assert sweep_values({"start": 10, "stop": 30, "step": 10}) == [10, 20, 30]
+    assert sweep_values({"start": 0.1, "stop": 0.3, "step": 0.05}) == [0.1, 0.15, 0.2, 0.25, 0.3]
+    with pytest.raises(ValueError):
+        sweep_values({"start": 1, "stop": 0, "step": 1})
+    with pytest.raises(ValueError):
+        sweep_values({"start": 0, "stop": 1})
+
+
+def test_sweep_matches_individual_runs(registry, setup_logger):
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    scenario = ScenarioConfig(name=context.scenario_name, datapath=context.data_path, plugins=FUSED_PLUGINS)
+    surfaces = sweep_scenario(registry, context, scenario, SWEEP)
+
+    assert [s.plugin_name for s in surfaces] == ["LatencyKPIPlugin"] * 3 + [p["name"] for p in FUSED_PLUGINS[1:]]
+    for surface in surfaces:
+        plugin_config = next(p for p in FUSED_PLUGINS if p["name"] == surface.plugin_name)
+        assert len(surface.passed) == len(surface.thresholds)
+        for threshold, passed in zip(surface.thresholds, surface.passed):
+            config = {**plugin_config["config"], **surface.settings, surface.threshold_key: threshold}
+            result = registry.execute_plugin(PluginPhase.POST_RUN, surface.plugin_name, context, config)
+            assert passed == result.success, (surface.plugin_name, surface.settings, threshold)
+    # a surface with both outcomes, so the comparison above is not vacuous
+    assert surfaces[1].passed == [False, True, True, True]  # avg 64.5 ms
+    assert surfaces[0].passed == [False, False, False, True]  # max 119 ms
+
+
+def test_sweep_scans_each_recording_once(registry, setup_logger, monkeypatch):
+    scans = []
+
+    class CountingReader(plugin_registry.FrameReader):
+        def __init__(self, *args, **kwargs):
+            scans.append(args[0])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(plugin_registry, "FrameReader", CountingReader)
+    context = create_test_context(DATA_DIR / "fused_data_with_kpis.jsonl", setup_logger)
+    scenario = ScenarioConfig(name=context.scenario_name, datapath=context.data_path, plugins=FUSED_PLUGINS)
+    sweep = {"LatencyKPIPlugin": {"latency_threshold": {"start": 0, "stop": 200, "step": 0.5},
+                                  "latency_statistic": ["max", "p50", "p99"]}}
+
+    surfaces = sweep_scenario(registry, context, scenario, sweep)
+
+    assert scans == [context.data_path]
+    assert [len(s.passed) for s in surfaces] == [401] * 3
+
+
+def test_sweep_without_data_fails_every_threshold(registry, setup_logger):
+    context = create_test_context(DATA_DIR / "camera_passing.jsonl", setup_logger)
+    plugins = [{"name": "LatencyKPIPlugin", "config": {"latency_field": "missing_ms"}}]
+    scenario = ScenarioConfig(name="missing", datapath=context.data_path, plugins=plugins)
+
+    surface, = sweep_scenario(registry, context, scenario, {"LatencyKPIPlugin": {"latency_threshold": [1, 1000]}})
+
+    assert surface.passed == [False, False]
+    assert surface.statistic is None
+
+
+def test_validate_sweep_rejects_keys_outside_threshold_keys(registry):
+    validate_sweep(registry, SWEEP)
+    with pytest.raises(ValueError, match="latency_field"):
+        validate_sweep(registry, {"LatencyKPIPlugin": {"latency_field": ["a", "b"]}})
+    with pytest.raises(ValueError, match="Unknown plugin"):
+        validate_sweep(registry, {"NoSuchPlugin": {}})
+
+
+def test_orchestrator_reports_sweep_surfaces(tmp_path, registry, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "name": "sweep",
+        "mode": "SIL",
+        "temp_dir": str(tmp_path / "tmp"),
+        "scenarios": [{"name": "fused", "datapath": str(DATA_DIR / "fused_data_with_kpis.jsonl"),
+                       "plugins": FUSED_PLUGINS[:2]}],
+        "sweep": {"DecisionConsistencyScorePlugin": {"consistency_threshold": [0.9, 0.99]}},
+    }))
+
+    orchestrator = TestOrchestrator(str(config_path), plugins_dir=registry.plugins_dir)
+    orchestrator.run()
+
+    surface, = orchestrator.sweeps["fused"]
+    assert surface.passed == [True, False]
+    html = (tmp_path / "reports" / "dashboards" / "regression_dashboard.html").read_text()
+    assert "Threshold Sweep" in html and "consistency_threshold 0.99" in html
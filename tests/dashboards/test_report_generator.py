@@ -0,0 +1,85 @@
+import re
+import pytest
+from core.models import PluginProfile, PluginResult, SweepSurface
+from dashboards.report_generator import DashboardWriter, generate_html_report, generate_sweep_tables
+
+
+def _results(scenarios, kpis):
+    return {
+        f"scenario {i}": [
+            PluginResult(success=j != 1, message=f"value {i}/{j} <raw>", plugin_name=f"Kpi{j}Plugin")
+            for j in reversed(range(kpis))
+        ]
+        for i in range(scenarios)
+    }
+
+
+def test_matrix_columns_are_sorted_and_cells_escaped(tmp_path):
+    results = _results(2, 3)
+    results["scenario 1"] = results["scenario 1"][:2]  # Kpi0Plugin missing
+    output_path = tmp_path / "report.html"
+
+    generate_html_report(results, output_path)
+
+    html = output_path.read_text()
+    assert re.findall(r"<th>(Kpi\d)Plugin</th>", html) == ["Kpi0", "Kpi1", "Kpi2"]
+    first_row, second_row = re.findall(r"<tr><td>scenario.*?</tr>", html)
+    assert re.findall(r'class="(\w+)"', first_row) == ["passed", "failed", "passed"]
+    assert re.findall(r'class="(\w+)"', second_row) == ["na", "failed", "passed"]
+    assert 'title="value 0/0 &lt;raw&gt;"' in first_row
+    assert "<raw>" not in html
+    assert "<template" not in html and "page-label" not in html
+
+
+def test_large_matrix_is_paginated(tmp_path):
+    output_path = tmp_path / "report.html"
+
+    generate_html_report(_results(12, 4), output_path, page_size=5)
+
+    html = output_path.read_text()
+    pages = re.split(r'<template class="page">', html)
+    assert len(pages) == 3  # one visible page, two inert ones
+    assert [len(re.findall(r"<tr><td>scenario", page)) for page in pages] == [5, 5, 2]
+    assert "Page 1 of 3" in html
+    assert html.count("</template>") == 2
+
+
+@pytest.mark.parametrize("page_size, pages", [(1, 7), (3, 3), (7, 1), (500, 1)])
+def test_dashboard_writer_pages_follow_page_size(tmp_path, page_size, pages):
+    output_path = tmp_path / "report.html"
+    writer = DashboardWriter(output_path, [f"scenario {i}" for i in range(7)], page_size=page_size)
+    for name, results in _results(7, 2).items():
+        writer.add(name, results)
+    writer.write()
+
+    html = output_path.read_text()
+    assert html.count('<template class="page">') == pages - 1
+    assert len(re.findall(r"<tr><td>scenario", html)) == 7
+
+
+def test_sweep_tables_are_escaped():
+    surface = SweepSurface(scenario_name="a<b", plugin_name="Kpi&Plugin", threshold_key="limit",
+                           settings={"mode": '"strict"'}, thresholds=[1, 2], passed=[],
+                           message='Exception: <tag attr="x">')
+
+    html = generate_sweep_tables({"a<b": [surface]})
+
+    assert "<h3>a&lt;b / Kpi&amp;Plugin</h3>" in html
+    assert "<td>mode=&quot;strict&quot;</td>" in html
+    assert 'title="Exception: &lt;tag attr=&quot;x&quot;&gt;"' in html
+    assert "<tag" not in html
+
+
+def test_dashboard_escapes_sweep_and_profile_tables(tmp_path):
+    results = {"s<1>": [PluginResult(success=True, message="ok", plugin_name="<b>Kpi</b>",
+                                     profile=PluginProfile(wall_ms=5.0, mode="scan"))]}
+    sweeps = {"s<1>": [SweepSurface(scenario_name="s<1>", plugin_name="<b>Kpi</b>", threshold_key="limit",
+                                    thresholds=[1], passed=[True], message="<script>x</script>")]}
+    output_path = tmp_path / "report.html"
+
+    generate_html_report(results, output_path, sweeps=sweeps)
+
+    html = output_path.read_text()
+    assert "Threshold Sweep" in html and "Slowest Plugins" in html
+    assert "<b>" not in html and "<script>x" not in html
+    assert "<td>s&lt;1&gt;</td><td>&lt;b&gt;Kpi&lt;/b&gt;</td>" in html
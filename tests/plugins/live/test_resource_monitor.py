@@ -0,0 +1,73 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from core.live_phase import run_live_phase
+from core.plugin_registry import PluginRegistry
+from tests.utils.test_helpers import create_test_context
+
+ROOT_DIR = Path(__file__).parents[3]
+RECORDING = ROOT_DIR / "tests" / "plugins" / "post_run" / "fused_data_with_kpis.jsonl"
+
+
+@pytest.fixture
+def registry():
+    registry = PluginRegistry(ROOT_DIR / "plugins")
+    registry.discover_plugins()
+    yield registry
+    registry.teardown_plugins()
+
+
+@pytest.fixture
+def busy_sut():
+    process = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def monitor(registry, tmp_path, setup_logger, **config):
+    """Live phase of about 0.6 s (the fixture replayed at 150 frames/s) with only the monitor"""
+    context = create_test_context(RECORDING, setup_logger)
+    outcome = run_live_phase(registry, context, {
+        "source": {"type": "replay", "frames_per_s": 150},
+        "plugins": [{"name": "ResourceMonitorPlugin",
+                     "config": {"sample_hz": 50, "output_dir": str(tmp_path), **config}}],
+    })
+    return outcome.results[0]
+
+
+def test_busy_sut_exceeds_cpu_threshold(registry, tmp_path, setup_logger, busy_sut):
+    result = monitor(registry, tmp_path, setup_logger, pids=[busy_sut.pid], cpu_threshold=5)
+
+    resources = result.metrics["resources"]
+    assert not result.success and "SUT CPU" in result.message and "exceeds threshold 5%" in result.message
+    assert resources["samples"] >= 15 and resources["dropped"] == 0
+    assert resources["cpu_percent"]["p95"] > 10
+    label, = resources["processes"]
+    assert label.endswith(f"({busy_sut.pid})") and resources["processes"][label]["cpu_max"] > 10
+
+    series = np.load(resources["series"])
+    assert len(series) == resources["samples"]
+    assert np.all(np.diff(series["t"]) > 0)
+    assert series["rss_mb"].max() > 1
+
+
+def test_machine_wide_figures_without_sut(registry, tmp_path, setup_logger):
+    result = monitor(registry, tmp_path, setup_logger, cpu_threshold=100, cpu_statistic="max")
+
+    assert result.success and "machine CPU" in result.message
+    assert result.metrics["resources"]["processes"] == {}
+    assert result.metrics["resources"]["cpu_percent"]["max"] == 0
+
+
+def test_ring_keeps_the_latest_samples(registry, tmp_path, setup_logger, busy_sut):
+    result = monitor(registry, tmp_path, setup_logger, names=["while True: pass"], max_samples=8, cpu_threshold=1000)
+
+    resources = result.metrics["resources"]
+    series = np.load(resources["series"])
+    assert result.success
+    assert len(series) == 8 and resources["dropped"] == resources["samples"] - 8
+    assert [label.endswith(f"({busy_sut.pid})") for label in resources["processes"]] == [True]
+    assert np.all(np.diff(series["t"]) > 0)
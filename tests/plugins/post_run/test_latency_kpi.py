@@ -24,4 +24,21 @@ def test_latency_kpi(filename, expected_success, expected_max, setup_logger):
     if expected_success:
         assert result.metrics["latency_ms"]["max"] <= expected_max
     else:
-        assert result.metrics["latency_ms"]["max"] > expected_max
\ No newline at end of file
+        assert result.metrics["latency_ms"]["max"] > expected_max
+
+@pytest.mark.parametrize("statistic, expected_success", [
+    ("max", False),
+    ("p50", True),
+    ("avg", True),
+])
+def test_latency_kpi_statistic(statistic, expected_success, setup_logger):
+    data_file = Path(__file__).parent / "camera_data_with_kpis.jsonl"
+    context: TestContext = create_test_context(data_file, setup_logger)
+
+    plugin = LatencyKPIPlugin(config={"latency_statistic": statistic})
+    result: PluginResult = plugin.execute(context)
+
+    metrics = result.metrics["latency_ms"]
+    assert result.success is expected_success
+    assert metrics["statistic"] == statistic
+    assert metrics["min"] <= metrics["p50"] <= metrics["p95"] <= metrics["p99"] <= metrics["max"]
@@ -1,3 +1,8 @@
+import json
+import math
+import pickle
+import random
+import statistics
 import pytest
 from pathlib import Path
 from core.models import PluginResult
@@ -25,4 +30,77 @@ def test_spatial_correlation_consistency_kpi(filename, expected_success, expecte
     if expected_success:
         assert result.metrics["spatial_correlation_score"]["avg"] >= expected_threshold
     else:
-        assert result.metrics["spatial_correlation_score"]["avg"] < expected_threshold
\ No newline at end of file
+        assert result.metrics["spatial_correlation_score"]["avg"] < expected_threshold
+
+def legacy_score(obj):
+    def centroid(points):
+        return tuple(sum(p[axis] for p in points) / len(points) for axis in ("x", "y", "z"))
+
+    def distance(p1, p2):
+        return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2 + (p1[2] - p2[2]) ** 2)
+
+    bbox = obj["camera_bbox_3d"]
+    max_distance = 1.0
+    if len(bbox) >= 2:
+        max_distance = max(distance(centroid([a]), centroid([b])) for a in bbox for b in bbox) or 1.0
+    d = distance(centroid(bbox), centroid(obj["radar_points"]))
+    return max(0.0, 1.0 - d / max_distance)
+
+
+def random_recording(path, seed):
+    rng = random.Random(seed)
+    point = lambda: {"x": rng.uniform(-50, 50), "y": rng.choice([0, rng.uniform(-5, 5)]), "z": rng.uniform(0, 3)}
+    objects = []
+    with open(path, "w") as f:
+        for frame in range(200):
+            fused = []
+            for _ in range(rng.randint(0, 4)):
+                obj = {"class": "car"}
+                if rng.random() > 0.1:
+                    corner = point()
+                    obj["camera_bbox_3d"] = [dict(corner) if rng.random() < 0.05 else point()
+                                             for _ in range(rng.choice([1, 4, 8]))]
+                if rng.random() > 0.1:
+                    obj["radar_points"] = [point() for _ in range(rng.randint(1, 6))]
+                if obj.get("camera_bbox_3d") and obj.get("radar_points"):
+                    objects.append(obj)
+                fused.append(obj)
+            f.write(json.dumps({"timestamp": frame, "fused_objects": fused}) + "\n")
+    return [legacy_score(obj) for obj in objects]
+
+
+@pytest.mark.parametrize("use_frame_store", [False, True])
+def test_spatial_correlation_matches_scalar_formula(tmp_path, setup_logger, use_frame_store):
+    data_file = tmp_path / "random_fused.jsonl"
+    expected_scores = random_recording(data_file, seed=7)
+    context = create_test_context(data_file, setup_logger)
+    context.temp_dir = tmp_path / "cache"
+    context.use_frame_store = use_frame_store
+
+    plugin = SpatialCorrelationConsistencyPlugin(config={"spatial_correlation_threshold": 0.0, "chunk_size": 16})
+    result = plugin.execute(context)
+
+    metrics = result.metrics["spatial_correlation_score"]
+    assert metrics["avg"] == sum(expected_scores) / len(expected_scores)
+    assert metrics["objects"] == len(expected_scores)
+    assert metrics["min"] == min(expected_scores)
+    assert metrics["p50"] == pytest.approx(statistics.median(expected_scores), rel=2 ** -8)
+    assert metrics["min"] <= metrics["p50"] <= metrics["p95"] <= 1.0
+
+
+def test_partial_stays_bounded(tmp_path, setup_logger):
+    data_file = tmp_path / "random_fused.jsonl"
+    random_recording(data_file, seed=3)
+    frames = [json.loads(line) for line in data_file.read_text().splitlines()]
+    plugin = SpatialCorrelationConsistencyPlugin(config={"chunk_size": 16})
+    plugin.begin(create_test_context(data_file, setup_logger))
+
+    for frame in frames:
+        plugin.on_frame(frame)
+    once = len(pickle.dumps(plugin.partial()))
+    for _ in range(9):
+        for frame in frames:
+            plugin.on_frame(frame)
+    tenfold = len(pickle.dumps(plugin.partial()))
+
+    assert tenfold < 1.5 * once
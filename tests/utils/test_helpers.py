@@ -1,5 +1,8 @@
 import logging
+import threading
+import time
 from pathlib import Path
+from typing import Optional
 from core.models import TestContext, TestMode
 
 
@@ -9,4 +12,27 @@ def create_test_context(scenario_file: Path, logger: logging.Logger) -> TestCont
         data_path=scenario_file,
         logger=logger,
         mode=TestMode.SIL
-    )
\ No newline at end of file
+    )
+
+
+def write_recording(source: Path, target: Path, chunk_bytes: int = 700, delay_s: float = 0.002,
+                    end_marker: Optional[str] = None) -> None:
+    """
+    Stand-in for a SUT recorder: copies source to target in small flushed chunks,
+    so readers see lines cut in half, then appends end_marker as a last line.
+    """
+    data = Path(source).read_bytes()
+    with open(target, "wb") as f:
+        for offset in range(0, len(data), chunk_bytes):
+            f.write(data[offset:offset + chunk_bytes])
+            f.flush()
+            time.sleep(delay_s)
+        if end_marker is not None:
+            f.write(end_marker.encode() + b"\n")
+
+
+def start_writer(*args, **kwargs) -> threading.Thread:
+    """Run write_recording on a background thread"""
+    thread = threading.Thread(target=write_recording, args=args, kwargs=kwargs, daemon=True)
+    thread.start()
+    return thread